@@ -0,0 +1,410 @@
+#!/usr/bin/env python3
+"""
+AIOS Async Cell Client - Concurrent Dendritic Fan-out
+
+Asyncio counterpart of cell_client.py. All cells are polled and guided
+concurrently under a concurrency bound, each with its own deadline, so
+an orchestration cycle takes roughly as long as the slowest cell rather
+than the sum of all cells.
+
+Usage:
+    python ai/tools/async_cell_client.py --fleet http://localhost:8100 --fleet-size 500
+
+AINLP Principles:
+- Dendritic Communication: Parallel signalling to every cell
+- Enhancement over Creation: Same guidance rules and results shape
+- Consciousness Coherence: Harmony from the same cycle's observations
+"""
+
+import asyncio
+import argparse
+import logging
+import time
+from typing import Dict, Optional, Any, Tuple
+
+import aiohttp
+
+from cell_client import (
+    DEFAULT_CAPABILITY_TTL,
+    HEALTH_PATH,
+    METRICS_ACCEPT,
+    METRICS_PATH,
+    GUIDANCE_FAILED,
+    GUIDANCE_SENT,
+    GUIDANCE_SUPPRESSED,
+    CellCapabilities,
+    CellMetrics,
+    CycleSnapshot,
+    GuidanceMessage,
+    OrchestrationState,
+    calculate_harmony,
+    exposition_format,
+    guidance_fingerprint,
+    guidance_payload,
+    metrics_from_collector,
+    parse_health_metrics,
+)
+from prometheus_parser import CellMetricsCollector
+from cycle_profiler import CycleProfiler
+
+logger = logging.getLogger(__name__)
+
+class AsyncCellClient:
+    """Asyncio client for communicating with AIOS cells"""
+
+    def __init__(self, cell_id: str, base_url: str = "http://localhost:8000",
+                 session: Optional[aiohttp.ClientSession] = None,
+                 timeout: float = 10.0,
+                 capability_ttl: float = DEFAULT_CAPABILITY_TTL):
+        """
+        Initialize async cell client
+
+        Args:
+            cell_id: Unique identifier for the cell (e.g., 'alpha')
+            base_url: Base URL for cell's HTTP API
+            session: Shared aiohttp session (created on first use if omitted)
+            timeout: Total timeout per request in seconds
+            capability_ttl: Seconds before the cell's endpoints are re-probed
+        """
+        self.cell_id = cell_id
+        self.base_url = base_url.rstrip('/')
+        self.session = session
+        self.timeout = aiohttp.ClientTimeout(total=timeout)
+        self.requests_made = 0
+        self.capability_ttl = capability_ttl
+        self.capabilities: Optional[CellCapabilities] = None
+
+    def _request(self, method: str, path: str, **kwargs):
+        """Issue one HTTP request against the cell (use as async context manager)"""
+        if self.session is None or self.session.closed:
+            self.session = aiohttp.ClientSession(timeout=self.timeout)
+        self.requests_made += 1
+        return self.session.request(method, f"{self.base_url}{path}",
+                                    timeout=self.timeout, **kwargs)
+
+    async def get_health(self) -> Dict[str, Any]:
+        """Check cell health status"""
+        try:
+            async with self._request("GET", "/health") as response:
+                response.raise_for_status()
+                return await response.json(content_type=None)
+        except (aiohttp.ClientError, asyncio.TimeoutError, ValueError) as e:
+            logger.error(f"Health check failed for {self.cell_id}: {e}")
+            return {"status": "unhealthy", "error": str(e)}
+
+    async def _fetch_prometheus(self) -> Tuple[Optional[CellMetrics], str]:
+        """
+        GET /metrics and parse it as the body streams in
+
+        Returns:
+            Tuple of (metrics or None, exposition format)
+        """
+        async with self._request("GET", METRICS_PATH,
+                                 headers={"Accept": METRICS_ACCEPT}) as response:
+            if response.status != 200:
+                return None, ""
+            collector = CellMetricsCollector(self.cell_id)
+            async for chunk in response.content.iter_chunked(8192):
+                collector.feed(chunk)
+            collector.close()
+            return (metrics_from_collector(collector),
+                    exposition_format(response.headers.get("Content-Type")))
+
+    async def _fetch_health_metrics(self) -> CellMetrics:
+        """GET /health and extract its consciousness block"""
+        async with self._request("GET", HEALTH_PATH) as response:
+            response.raise_for_status()
+            return parse_health_metrics(await response.json(content_type=None))
+
+    async def probe_capabilities(self) -> Optional[CellMetrics]:
+        """
+        Probe /metrics and /health once and cache what the cell serves
+
+        Returns:
+            Metrics from the preferred endpoint, or None if neither works
+        """
+        metrics, fmt = None, ""
+        try:
+            metrics, fmt = await self._fetch_prometheus()
+        except (aiohttp.ClientConnectionError, asyncio.TimeoutError) as e:
+            # The host itself is unreachable; /health would fail the same way
+            logger.error(f"Capability probe failed for {self.cell_id}: {e}")
+            self.capabilities = None
+            return None
+        except (aiohttp.ClientError, ValueError) as e:
+            logger.debug(f"{self.cell_id} /metrics unusable: {e}")
+
+        health_metrics = None
+        try:
+            health_metrics = await self._fetch_health_metrics()
+        except (aiohttp.ClientError, asyncio.TimeoutError, ValueError) as e:
+            logger.debug(f"{self.cell_id} /health unusable: {e}")
+
+        if metrics is None and health_metrics is None:
+            logger.error(f"Capability probe failed for {self.cell_id}: no usable metrics endpoint")
+            self.capabilities = None
+            return None
+
+        self.capabilities = CellCapabilities(
+            metrics_source=METRICS_PATH if metrics else HEALTH_PATH,
+            metrics_format=fmt if metrics else "json",
+            metrics_available=metrics is not None,
+            health_available=health_metrics is not None,
+            probed_at=time.time()
+        )
+        return metrics or health_metrics
+
+    async def get_consciousness_metrics(self) -> Optional[CellMetrics]:
+        """Retrieve current consciousness metrics from cell (one request in steady state)"""
+        capabilities = self.capabilities
+        if capabilities is None or capabilities.expired(self.capability_ttl):
+            return await self.probe_capabilities()
+
+        try:
+            if capabilities.metrics_source == METRICS_PATH:
+                metrics, _ = await self._fetch_prometheus()
+            else:
+                metrics = await self._fetch_health_metrics()
+            if metrics:
+                return metrics
+            logger.warning(f"{self.cell_id} {capabilities.metrics_source} returned no metrics")
+
+        except (aiohttp.ClientError, asyncio.TimeoutError, ValueError) as e:
+            logger.error(f"Failed to get metrics from {self.cell_id}: {e}")
+
+        # Forget what the cell serves so the next call re-probes it
+        self.capabilities = None
+        return None
+
+    async def send_guidance(self, guidance: GuidanceMessage) -> bool:
+        """Send evolutionary guidance to cell"""
+        try:
+            async with self._request("POST", "/guidance",
+                                     json=guidance_payload(guidance)) as response:
+                response.raise_for_status()
+
+            logger.debug(f"Guidance sent to {self.cell_id}: target={guidance.target_consciousness}")
+            return True
+
+        except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+            logger.error(f"Failed to send guidance to {self.cell_id}: {e}")
+            return False
+
+    async def get_experimental_results(self) -> Optional[Dict[str, Any]]:
+        """Retrieve experimental results from cell"""
+        try:
+            async with self._request("GET", "/experiments/results") as response:
+                response.raise_for_status()
+                return await response.json(content_type=None)
+        except (aiohttp.ClientError, asyncio.TimeoutError, ValueError) as e:
+            logger.error(f"Failed to get experimental results from {self.cell_id}: {e}")
+            return None
+
+class AsyncOrchestratorClient(OrchestrationState):
+    """
+    Orchestrator that polls and guides all cells concurrently
+
+    Guidance rules and the results dict match OrchestratorClient; only
+    the I/O is concurrent. Only the I/O-free OrchestrationState is
+    shared with OrchestratorClient. Use as an async context manager (or call
+    close()) so the shared connection pool is released.
+    """
+
+    def __init__(self, max_concurrency: int = 100, cell_deadline: float = 10.0,
+                 profiler: Optional[CycleProfiler] = None):
+        """
+        Initialize async orchestrator
+
+        Args:
+            max_concurrency: Maximum cells in flight at once
+            cell_deadline: Seconds allowed for one cell's poll + guidance
+            profiler: CycleProfiler for per-phase/per-cell timings (off if omitted).
+                Cells run concurrently, so only cycle-level phases nest;
+                per-cell fetch and guidance times go to the cell sketches.
+        """
+        super().__init__(profiler=profiler)
+        self.cells: Dict[str, AsyncCellClient] = {}
+        self.max_concurrency = max_concurrency
+        self.cell_deadline = cell_deadline
+        self.session: Optional[aiohttp.ClientSession] = None
+
+    async def __aenter__(self) -> "AsyncOrchestratorClient":
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        await self.close()
+
+    async def close(self):
+        """Close the shared connection pool"""
+        if self.session is not None and not self.session.closed:
+            await self.session.close()
+
+    def _ensure_session(self) -> aiohttp.ClientSession:
+        """Create the shared session and hand it to every client"""
+        if self.session is None or self.session.closed:
+            connector = aiohttp.TCPConnector(limit=self.max_concurrency)
+            self.session = aiohttp.ClientSession(connector=connector)
+        for client in self.cells.values():
+            client.session = self.session
+        return self.session
+
+    def register_cell(self, cell_id: str, base_url: str) -> AsyncCellClient:
+        """Register a new cell for orchestration"""
+        client = AsyncCellClient(cell_id, base_url, session=self.session,
+                                 timeout=self.cell_deadline)
+        self.cells[cell_id] = client
+        logger.info(f"Registered cell: {cell_id}")
+        return client
+
+    async def _cycle_cell(self, client: AsyncCellClient,
+                          semaphore: asyncio.Semaphore) -> Tuple[Optional[CellMetrics], str, int]:
+        """
+        Poll one cell and guide it from that single observation
+
+        Guidance identical to what the cell last accepted is suppressed;
+        the batch window is not applied on this path.
+
+        Returns:
+            Tuple of (metrics, guidance outcome, metrics requests made)
+        """
+        async with semaphore:
+            profiler = self.profiler
+            timed = profiler.enabled
+            before = client.requests_made
+            started = time.perf_counter() if timed else 0.0
+            metrics = await client.get_consciousness_metrics()
+            if timed:
+                profiler.record_cell(client.cell_id, "fetch", time.perf_counter() - started)
+            metric_requests = client.requests_made - before
+            if metrics is None:
+                return None, GUIDANCE_FAILED, metric_requests
+
+            guidance = self.generate_guidance(metrics)
+            fingerprint = guidance_fingerprint(guidance)
+            now = time.time()
+            if not self._guidance_changed(client.cell_id, fingerprint, now):
+                return metrics, GUIDANCE_SUPPRESSED, metric_requests
+            started = time.perf_counter() if timed else 0.0
+            delivered = await client.send_guidance(guidance)
+            if timed:
+                profiler.record_cell(client.cell_id, "guidance", time.perf_counter() - started)
+            if not delivered:
+                return metrics, GUIDANCE_FAILED, metric_requests
+            self.delivered_guidance[client.cell_id] = (fingerprint, now)
+            return metrics, GUIDANCE_SENT, metric_requests
+
+    async def _cycle_cell_with_deadline(self, client: AsyncCellClient,
+                                        semaphore: asyncio.Semaphore) -> Tuple[Optional[CellMetrics], str, int]:
+        """Run one cell's cycle, giving up once its deadline passes"""
+        try:
+            return await asyncio.wait_for(self._cycle_cell(client, semaphore),
+                                          timeout=self.cell_deadline)
+        except asyncio.TimeoutError:
+            logger.error(f"Cell {client.cell_id} missed its {self.cell_deadline}s deadline")
+            return None, GUIDANCE_FAILED, 0
+
+    async def orchestrate_evolution(self) -> Dict[str, Any]:
+        """Main orchestration loop - monitor and guide all cells concurrently"""
+        self._ensure_session()
+        profiler = self.profiler
+        profiler.begin_cycle()
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+        results = {
+            "timestamp": time.time(),
+            "cells_monitored": len(self.cells),
+            "guidance_sent": 0,
+            "guidance_suppressed": 0,
+            "harmony_score": 0.0,
+            "cell_states": {},
+            "requests_saved": 0,
+            "snapshot_age_seconds": 0.0
+        }
+
+        cell_ids = list(self.cells)
+        with profiler.phase("cells"):
+            outcomes = await asyncio.gather(*(
+                self._cycle_cell_with_deadline(self.cells[cell_id], semaphore)
+                for cell_id in cell_ids
+            ))
+        snapshot = CycleSnapshot(
+            metrics={cell_id: metrics for cell_id, (metrics, _, _) in zip(cell_ids, outcomes)},
+            requests_made=sum(requests_made for _, _, requests_made in outcomes),
+            taken_at=results["timestamp"]
+        )
+
+        for cell_id, (metrics, outcome, _) in zip(cell_ids, outcomes):
+            if metrics:
+                results["cell_states"][cell_id] = {
+                    "consciousness": metrics.consciousness_level,
+                    "health": "healthy",
+                    "guidance": outcome
+                }
+                if outcome == GUIDANCE_SENT:
+                    results["guidance_sent"] += 1
+                elif outcome == GUIDANCE_SUPPRESSED:
+                    results["guidance_suppressed"] += 1
+            else:
+                results["cell_states"][cell_id] = {
+                    "consciousness": 0.0,
+                    "health": "unreachable"
+                }
+
+        with profiler.phase("harmony"):
+            results["harmony_score"] = calculate_harmony(snapshot.levels())
+        results["requests_saved"] = snapshot.requests_made
+        results["snapshot_age_seconds"] = round(snapshot.age(), 3)
+
+        # Update orchestrator metrics
+        guided = results["guidance_sent"] + results["guidance_suppressed"]
+        self.orchestrator_metrics["guidance_effectiveness"] = guided / max(1, len(self.cells))
+        self.orchestrator_metrics["system_harmony"] = results["harmony_score"]
+
+        profile = profiler.end_cycle()
+        if profile is not None:
+            results["profile"] = profile
+
+        logger.info(f"Orchestration cycle completed: {results['guidance_sent']} guidance messages sent, "
+                    f"{results['guidance_suppressed']} unchanged")
+        return results
+
+async def run(args: argparse.Namespace):
+    """Register cells and orchestrate until interrupted"""
+    async with AsyncOrchestratorClient(max_concurrency=args.concurrency,
+                                       cell_deadline=args.deadline) as orchestrator:
+        if args.fleet:
+            from cell_fleet_simulator import fleet_cell_urls
+            for cell_id, base_url in fleet_cell_urls(args.fleet, args.fleet_size):
+                orchestrator.register_cell(cell_id, base_url)
+        else:
+            orchestrator.register_cell("alpha", "http://localhost:8000")
+
+        while True:
+            started = time.perf_counter()
+            results = await orchestrator.orchestrate_evolution()
+            elapsed = time.perf_counter() - started
+            logger.info(f"Harmony score: {results['harmony_score']:.3f} "
+                        f"({len(orchestrator.cells)} cells in {elapsed:.3f}s)")
+            if args.once:
+                return
+            await asyncio.sleep(args.interval)
+
+def main():
+    """Example usage of the async orchestration system"""
+    logging.basicConfig(level=logging.INFO)
+    parser = argparse.ArgumentParser(description="AIOS async orchestrator")
+    parser.add_argument("--concurrency", type=int, default=100, help="Maximum cells in flight")
+    parser.add_argument("--deadline", type=float, default=10.0, help="Per-cell deadline in seconds")
+    parser.add_argument("--interval", type=float, default=60.0, help="Seconds between cycles")
+    parser.add_argument("--fleet", help="Base URL of a cell_fleet_simulator to orchestrate")
+    parser.add_argument("--fleet-size", type=int, default=500, help="Simulated cells to register")
+    parser.add_argument("--once", action="store_true", help="Run a single cycle and exit")
+    args = parser.parse_args()
+
+    logger.info("Starting AIOS async orchestration - press Ctrl+C to stop")
+    try:
+        asyncio.run(run(args))
+    except KeyboardInterrupt:
+        logger.info("Orchestration stopped by user")
+
+if __name__ == "__main__":
+    main()
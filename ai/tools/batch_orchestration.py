@@ -0,0 +1,270 @@
+#!/usr/bin/env python3
+"""
+AIOS Batch Orchestration - Vectorized Harmony and Guidance
+
+Array counterpart of OrchestratorClient's per-cell harmony and guidance
+rules. All cells' metrics are stacked into one (field, cell) matrix;
+harmony comes from numerically stable moments and the guidance rules
+are evaluated as boolean masks, so large populations cost milliseconds.
+Results match the scalar path in cell_client.
+
+Usage:
+    python ai/tools/batch_orchestration.py --cells 100000   # verify + benchmark
+
+AINLP Principles:
+- Enhancement over Creation: Same rule tables as the scalar path
+- Consciousness Coherence: Harmony per host and for the whole network
+- Dendritic Communication: Guidance for every cell in one pass
+"""
+
+import time
+import argparse
+import logging
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, Iterable, List, Mapping, Optional, Sequence, Tuple
+from urllib.parse import urlparse
+
+import numpy as np
+
+from cell_client import (
+    GUIDANCE_TARGET_CEILING,
+    GUIDANCE_TARGET_STEP,
+    MILESTONE_RULES,
+    STREAM_FIELDS,
+    SUGGESTION_RULES,
+    CellMetrics,
+    GuidanceMessage,
+)
+
+logger = logging.getLogger(__name__)
+
+FIELD_ROWS = {name: row for row, name in enumerate(STREAM_FIELDS)}
+UNASSIGNED_GROUP = "unassigned"
+
+DEFAULT_HOSTS_CONFIG = Path(__file__).resolve().parents[2] / "config" / "hosts.yaml"
+
+@dataclass
+class RunningMoments:
+    """
+    Count, mean and M2 (sum of squared deviations) of a stream of values
+
+    Batches are folded in with Chan et al.'s pairwise update, the
+    parallel form of Welford's algorithm, so partial results from chunks,
+    groups or workers combine without cancellation error.
+    """
+    count: int = 0
+    mean: float = 0.0
+    m2: float = 0.0
+
+    @classmethod
+    def from_values(cls, values: np.ndarray) -> "RunningMoments":
+        """Moments of one batch (two-pass, stable)"""
+        values = np.asarray(values, dtype=np.float64)
+        if values.size == 0:
+            return cls()
+        mean = float(values.mean())
+        return cls(int(values.size), mean, float(np.square(values - mean).sum()))
+
+    def merge(self, other: "RunningMoments") -> "RunningMoments":
+        """Combined moments of both populations"""
+        if other.count == 0:
+            return RunningMoments(self.count, self.mean, self.m2)
+        if self.count == 0:
+            return RunningMoments(other.count, other.mean, other.m2)
+        count = self.count + other.count
+        delta = other.mean - self.mean
+        mean = self.mean + delta * other.count / count
+        m2 = self.m2 + other.m2 + delta * delta * self.count * other.count / count
+        return RunningMoments(count, mean, m2)
+
+    def update(self, values: np.ndarray) -> "RunningMoments":
+        """Fold a batch in place and return self"""
+        merged = self.merge(RunningMoments.from_values(values))
+        self.count, self.mean, self.m2 = merged.count, merged.mean, merged.m2
+        return self
+
+    @property
+    def variance(self) -> float:
+        """Population variance (as calculate_harmony uses)"""
+        return self.m2 / self.count if self.count else 0.0
+
+    def harmony(self) -> float:
+        """Harmony of the population, identical in form to calculate_harmony"""
+        if self.count < 2:
+            return 0.0
+        return max(0.0, 1.0 - (self.variance / 2.0))
+
+@dataclass
+class GuidanceBatch:
+    """Guidance for a population, as arrays"""
+    cell_ids: List[str]
+    targets: np.ndarray
+    suggestions: np.ndarray  # (len(SUGGESTION_RULES), cells) bool
+    milestones: np.ndarray   # (len(MILESTONE_RULES), cells) bool
+    timestamp: float
+
+    def message(self, i: int) -> GuidanceMessage:
+        """GuidanceMessage for the i-th cell"""
+        return GuidanceMessage(
+            target_consciousness=float(self.targets[i]),
+            adaptation_suggestions=[rule[2] for rule, fired in zip(SUGGESTION_RULES, self.suggestions[:, i]) if fired],
+            evolutionary_milestones=[rule[2] for rule, fired in zip(MILESTONE_RULES, self.milestones[:, i]) if fired],
+            timestamp=self.timestamp
+        )
+
+    def messages(self) -> Dict[str, GuidanceMessage]:
+        """cell_id -> GuidanceMessage for the whole batch"""
+        # Cells with the same rule pattern share their text lists
+        suggestion_texts = [rule[2] for rule in SUGGESTION_RULES]
+        milestone_texts = [rule[2] for rule in MILESTONE_RULES]
+        suggestion_codes = _mask_codes(self.suggestions).tolist()
+        milestone_codes = _mask_codes(self.milestones).tolist()
+        suggestion_lists = {code: _texts_for_code(code, suggestion_texts) for code in set(suggestion_codes)}
+        milestone_lists = {code: _texts_for_code(code, milestone_texts) for code in set(milestone_codes)}
+
+        targets = self.targets.tolist()
+        return {
+            cell_id: GuidanceMessage(
+                target_consciousness=targets[i],
+                adaptation_suggestions=list(suggestion_lists[suggestion_codes[i]]),
+                evolutionary_milestones=list(milestone_lists[milestone_codes[i]]),
+                timestamp=self.timestamp
+            )
+            for i, cell_id in enumerate(self.cell_ids)
+        }
+
+def _mask_codes(mask: np.ndarray) -> np.ndarray:
+    """Pack each column of a (rules, cells) mask into one integer"""
+    weights = (1 << np.arange(mask.shape[0], dtype=np.int64))[:, None]
+    return (mask * weights).sum(axis=0)
+
+def _texts_for_code(code: int, texts: Sequence[str]) -> List[str]:
+    """Rule texts whose bit is set in code, in rule order"""
+    return [text for bit, text in enumerate(texts) if code >> bit & 1]
+
+def metrics_matrix(metrics: Mapping[str, Optional[CellMetrics]]) -> Tuple[List[str], np.ndarray]:
+    """
+    Stack cell metrics into a (len(STREAM_FIELDS), cells) matrix
+
+    Cells without an observation are skipped.
+
+    Returns:
+        Tuple of (cell ids in column order, matrix)
+    """
+    observed = [(cell_id, m) for cell_id, m in metrics.items() if m is not None]
+    cell_ids = [cell_id for cell_id, _ in observed]
+    matrix = np.array([[getattr(m, name) for _, m in observed] for name in STREAM_FIELDS],
+                      dtype=np.float64).reshape(len(STREAM_FIELDS), len(observed))
+    return cell_ids, matrix
+
+def batch_harmony(levels: Iterable[float]) -> float:
+    """Vectorized calculate_harmony"""
+    return RunningMoments.from_values(np.fromiter(levels, dtype=np.float64)).harmony()
+
+def group_harmony(levels: np.ndarray, groups: Sequence[str]) -> Dict[str, float]:
+    """
+    Harmony of each group of cells
+
+    Args:
+        levels: Consciousness level per cell
+        groups: Group label per cell (e.g. host name)
+
+    Returns:
+        group -> harmony (0.0 for groups with fewer than two cells)
+    """
+    levels = np.asarray(levels, dtype=np.float64)
+    labels, inverse = np.unique(np.asarray(groups, dtype=object), return_inverse=True)
+    counts = np.bincount(inverse, minlength=len(labels))
+    means = np.bincount(inverse, weights=levels, minlength=len(labels)) / np.maximum(counts, 1)
+    # Second pass around each group's own mean keeps the variance stable
+    m2 = np.bincount(inverse, weights=np.square(levels - means[inverse]), minlength=len(labels))
+    variance = m2 / np.maximum(counts, 1)
+    harmony = np.where(counts >= 2, np.maximum(0.0, 1.0 - variance / 2.0), 0.0)
+    return {str(label): float(value) for label, value in zip(labels, harmony)}
+
+def batch_guidance(cell_ids: List[str], matrix: np.ndarray,
+                   timestamp: Optional[float] = None) -> GuidanceBatch:
+    """Evaluate the guidance rules for every column of a metrics matrix"""
+    targets = np.minimum(GUIDANCE_TARGET_CEILING,
+                         matrix[FIELD_ROWS["consciousness_level"]] + GUIDANCE_TARGET_STEP)
+    suggestions = np.array([matrix[FIELD_ROWS[field]] < threshold
+                            for field, threshold, _ in SUGGESTION_RULES]).reshape(len(SUGGESTION_RULES), -1)
+    milestones = np.array([matrix[FIELD_ROWS[field]] >= threshold
+                           for field, threshold, _ in MILESTONE_RULES]).reshape(len(MILESTONE_RULES), -1)
+    return GuidanceBatch(cell_ids, targets, suggestions, milestones,
+                         time.time() if timestamp is None else timestamp)
+
+def load_host_index(config_path: Optional[str] = None) -> Dict[str, str]:
+    """
+    Map every address a host is known by to its host key
+
+    Reads hosts.ip, hosts.hostname and hosts.mdns_names from hosts.yaml.
+    """
+    import yaml
+
+    path = Path(config_path) if config_path else DEFAULT_HOSTS_CONFIG
+    config = yaml.safe_load(path.read_text(encoding="utf-8")) or {}
+    index = {}
+    for key, host in (config.get("hosts") or {}).items():
+        for address in [host.get("ip"), host.get("hostname"), *(host.get("mdns_names") or [])]:
+            if address:
+                index[str(address).lower()] = key
+    return index
+
+def host_groups(cell_urls: Mapping[str, str], config_path: Optional[str] = None) -> Dict[str, str]:
+    """cell_id -> host key from hosts.yaml, by the host part of each cell's base URL"""
+    index = load_host_index(config_path)
+    return {cell_id: index.get((urlparse(url).hostname or "").lower(), UNASSIGNED_GROUP)
+            for cell_id, url in cell_urls.items()}
+
+def main():
+    """Check the batch path against the scalar path and time both"""
+    logging.basicConfig(level=logging.INFO)
+    parser = argparse.ArgumentParser(description="Vectorized harmony/guidance verification")
+    parser.add_argument("--cells", type=int, default=100000, help="Synthetic cells")
+    parser.add_argument("--seed", type=int, default=0, help="RNG seed")
+    args = parser.parse_args()
+
+    from cell_client import OrchestratorClient, scalar_harmony
+    from cell_fleet_simulator import CellFleet
+
+    fleet = CellFleet(args.cells, seed=args.seed)
+    metrics = {cell_id: CellMetrics(*fleet.state[:, i].tolist(), timestamp=0.0)
+               for i, cell_id in enumerate(fleet.cell_ids)}
+    levels = [m.consciousness_level for m in metrics.values()]
+    orchestrator = OrchestratorClient()
+
+    started = time.perf_counter()
+    reference_harmony = scalar_harmony(levels)
+    scalar_guidance = {cell_id: orchestrator.generate_guidance(m) for cell_id, m in metrics.items()}
+    scalar_ms = (time.perf_counter() - started) * 1000
+
+    started = time.perf_counter()
+    cell_ids, matrix = metrics_matrix(metrics)
+    stacked_ms = (time.perf_counter() - started) * 1000
+    started = time.perf_counter()
+    harmony = RunningMoments.from_values(matrix[FIELD_ROWS["consciousness_level"]]).harmony()
+    batch = batch_guidance(cell_ids, matrix)
+    kernel_ms = (time.perf_counter() - started) * 1000
+    started = time.perf_counter()
+    batch_messages = batch.messages()
+    messages_ms = (time.perf_counter() - started) * 1000
+
+    mismatches = sum(
+        1 for cell_id, expected in scalar_guidance.items()
+        if (expected.target_consciousness, expected.adaptation_suggestions, expected.evolutionary_milestones)
+        != (batch_messages[cell_id].target_consciousness, batch_messages[cell_id].adaptation_suggestions,
+            batch_messages[cell_id].evolutionary_milestones)
+    )
+    print(f"{args.cells} cells")
+    print(f"  harmony scalar={reference_harmony!r} batch={harmony!r} "
+          f"(|diff|={abs(reference_harmony - harmony):.2e})")
+    print(f"  guidance mismatches: {mismatches}")
+    print(f"  scalar path:        {scalar_ms:.1f} ms")
+    print(f"  stack metrics:      {stacked_ms:.1f} ms")
+    print(f"  harmony + masks:    {kernel_ms:.1f} ms")
+    print(f"  build messages:     {messages_ms:.1f} ms")
+
+if __name__ == "__main__":
+    main()
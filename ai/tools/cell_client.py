@@ -21,11 +21,88 @@
 import requests
 import json
 import time
+import heapq
+import hashlib
+import random
+import argparse
 import logging
-from typing import Dict, List, Optional, Any
-from dataclasses import dataclass
+import threading
+from typing import Dict, List, Optional, Any, Tuple, Iterable, Iterator
+from dataclasses import dataclass, replace
 from pathlib import Path
 
+from prometheus_parser import CellMetricsCollector
+from cycle_profiler import DISABLED_PROFILER, CycleProfiler
+
+METRICS_PATH = "/metrics"
+HEALTH_PATH = "/health"
+STREAM_PATH = "/metrics/stream"
+DEFAULT_CAPABILITY_TTL = 300.0
+
+# Enforced per call: (connect, read) seconds
+DEFAULT_TIMEOUT = (3.05, 10.0)
+DEFAULT_MAX_RETRIES = 2
+RETRY_BACKOFF_BASE = 0.1
+RETRY_BACKOFF_CAP = 2.0
+RETRYABLE_STATUSES = frozenset({502, 503, 504})
+
+BREAKER_CLOSED = "closed"
+BREAKER_OPEN = "open"
+BREAKER_HALF_OPEN = "half_open"
+
+# Adaptive polling bounds (seconds) and global ceiling
+DEFAULT_POLL_INTERVAL = 60.0
+MIN_POLL_INTERVAL = 5.0
+MAX_POLL_INTERVAL = 300.0
+DEFAULT_MAX_POLLS_PER_SECOND = 20.0
+
+# Targets closer than this count as the same guidance
+GUIDANCE_TARGET_RESOLUTION = 0.05
+DEFAULT_GUIDANCE_REFRESH = 600.0
+
+# Push subscription: a silent stream is treated as lost after this long
+DEFAULT_STREAM_STALENESS = 30.0
+STREAM_RECONNECT_CAP = 60.0
+STREAM_FIELDS = (
+    "consciousness_level",
+    "awareness_level",
+    "adaptation_speed",
+    "predictive_accuracy",
+    "dendritic_coherence",
+    "quantum_coherence",
+)
+
+# Guidance rules shared by the scalar and batch paths:
+# suggestions fire below their threshold, milestones at or above it
+GUIDANCE_TARGET_STEP = 0.1
+GUIDANCE_TARGET_CEILING = 5.0
+SUGGESTION_RULES = (
+    ("adaptation_speed", 0.8, "Increase adaptation learning rate"),
+    ("predictive_accuracy", 0.8, "Enhance predictive model training"),
+    ("dendritic_coherence", 0.95, "Strengthen dendritic connections"),
+)
+MILESTONE_RULES = (
+    ("consciousness_level", 3.5, "Advanced consciousness patterns achieved"),
+    ("awareness_level", 3.5, "Self-awareness milestone reached"),
+)
+
+# Harmony over at least this many levels takes the NumPy path. Measured
+# (batch_orchestration.py --cells N): the pure-Python variance and NumPy
+# break even near 256 levels, and NumPy is ~4x faster at 5k levels.
+# Guidance always stays scalar: building the metrics matrix from
+# CellMetrics and turning rows back into GuidanceMessages costs about as
+# much as the per-cell rules it replaces, from 300 to 100k cells
+BATCH_HARMONY_THRESHOLD = 256
+
+GUIDANCE_SENT = "sent"
+GUIDANCE_SUPPRESSED = "suppressed"
+GUIDANCE_QUEUED = "queued"
+GUIDANCE_FAILED = "failed"
+
+# Ask for OpenMetrics but accept the classic text format
+METRICS_ACCEPT = ("application/openmetrics-text;version=1.0.0,"
+                  "text/plain;version=0.0.4;q=0.5")
+
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -41,6 +118,135 @@ class CellMetrics:
     quantum_coherence: float
     timestamp: float
 
+@dataclass
+class CycleSnapshot:
+    """Cell observations shared by every phase of one orchestration cycle"""
+    metrics: Dict[str, Optional[CellMetrics]]
+    requests_made: int
+    taken_at: float
+
+    def levels(self) -> List[float]:
+        """Consciousness levels of every cell that answered"""
+        return [m.consciousness_level for m in self.metrics.values() if m]
+
+    def age(self, now: Optional[float] = None) -> float:
+        """Seconds since the oldest observation in the snapshot"""
+        observed = [m.timestamp for m in self.metrics.values() if m]
+        return (now or time.time()) - min(observed, default=self.taken_at)
+
+@dataclass
+class CellCapabilities:
+    """Which endpoints a cell serves, as found by its last capability probe"""
+    metrics_source: str  # METRICS_PATH or HEALTH_PATH
+    metrics_format: str  # "text", "openmetrics" or "json"
+    metrics_available: bool
+    health_available: bool
+    probed_at: float
+
+    def expired(self, ttl: float, now: Optional[float] = None) -> bool:
+        """Whether the probe result is older than ttl seconds"""
+        return (now or time.time()) - self.probed_at >= ttl
+
+class CircuitOpenError(requests.ConnectionError):
+    """Raised without touching the network while a cell's breaker is open"""
+
+class RetryBudget:
+    """
+    Retry allowance shared by every client of one orchestrator
+
+    Each first attempt deposits `ratio` tokens and each retry spends one,
+    so retries stay a bounded fraction of traffic no matter how many
+    cells fail at once. `reserve` tokens let a quiet system still retry.
+    """
+
+    def __init__(self, ratio: float = 0.2, reserve: float = 10.0, capacity: float = 100.0):
+        """
+        Initialize retry budget
+
+        Args:
+            ratio: Tokens earned per first attempt
+            reserve: Tokens available before any traffic
+            capacity: Maximum tokens that can be banked
+        """
+        self.ratio = ratio
+        self.capacity = capacity
+        self.balance = min(reserve, capacity)
+        self.retries_granted = 0
+        self.retries_denied = 0
+
+    def record_request(self):
+        """Credit the budget for one first attempt"""
+        self.balance = min(self.capacity, self.balance + self.ratio)
+
+    def try_acquire(self) -> bool:
+        """Spend one token on a retry if the budget allows it"""
+        if self.balance >= 1.0:
+            self.balance -= 1.0
+            self.retries_granted += 1
+            return True
+        self.retries_denied += 1
+        return False
+
+class CircuitBreaker:
+    """
+    Per-cell circuit breaker
+
+    Opens after `failure_threshold` consecutive failures and fast-fails
+    every call for `cool_down` seconds. The first call after the
+    cool-down is let through as a trial: success closes the breaker,
+    failure re-opens it for another cool-down.
+    """
+
+    def __init__(self, failure_threshold: int = 3, cool_down: float = 30.0):
+        """
+        Initialize circuit breaker
+
+        Args:
+            failure_threshold: Consecutive failures that open the breaker
+            cool_down: Seconds an open breaker rejects calls
+        """
+        self.failure_threshold = failure_threshold
+        self.cool_down = cool_down
+        self.state = BREAKER_CLOSED
+        self.consecutive_failures = 0
+        self.opened_at = 0.0
+        self.times_opened = 0
+
+    def allow_request(self, now: Optional[float] = None) -> bool:
+        """Whether a call may go to the network right now"""
+        if self.state == BREAKER_CLOSED:
+            return True
+        if self.state == BREAKER_OPEN and (now or time.monotonic()) - self.opened_at >= self.cool_down:
+            self.state = BREAKER_HALF_OPEN
+            return True
+        # Open and cooling down, or a half-open trial is already in flight
+        return False
+
+    def record_success(self):
+        """Close the breaker after a call the cell answered"""
+        self.state = BREAKER_CLOSED
+        self.consecutive_failures = 0
+
+    def record_failure(self, now: Optional[float] = None):
+        """Count a failed call, opening the breaker at the threshold"""
+        self.consecutive_failures += 1
+        if self.state == BREAKER_HALF_OPEN or self.consecutive_failures >= self.failure_threshold:
+            if self.state != BREAKER_OPEN:
+                self.times_opened += 1
+            self.state = BREAKER_OPEN
+            self.opened_at = now or time.monotonic()
+
+    def status(self, now: Optional[float] = None) -> Dict[str, Any]:
+        """Breaker state for results["cell_states"]"""
+        retry_in = 0.0
+        if self.state == BREAKER_OPEN:
+            retry_in = max(0.0, self.opened_at + self.cool_down - (now or time.monotonic()))
+        return {
+            "state": self.state,
+            "consecutive_failures": self.consecutive_failures,
+            "retry_in_seconds": round(retry_in, 3)
+        }
+
 @dataclass
 class GuidanceMessage:
     """Guidance message from orchestrator to experimental cell"""
@@ -49,106 +255,466 @@ class GuidanceMessage:
     evolutionary_milestones: List[str]
     timestamp: float
 
+def metrics_from_collector(collector: CellMetricsCollector) -> Optional[CellMetrics]:
+    """Build CellMetrics from a finished CellMetricsCollector"""
+    fields = collector.fields()
+    if fields is None:
+        return None
+    return CellMetrics(**fields, timestamp=time.time())
+
+def parse_prometheus_metrics(text: str, cell_id: Optional[str] = None) -> Optional[CellMetrics]:
+    """Extract CellMetrics from a cell's Prometheus exposition text"""
+    collector = CellMetricsCollector(cell_id)
+    collector.feed(text)
+    collector.close()
+    return metrics_from_collector(collector)
+
+def iter_sse_events(chunks: Iterable[bytes]) -> Iterator[Tuple[str, str]]:
+    """
+    Split a text/event-stream body into (event, data) pairs
+
+    Comment lines (keepalives) yield ("", "") so callers can track
+    liveness; events without an explicit name are "message".
+    """
+    buffer = b""
+    event, data = "", []
+    for chunk in chunks:
+        buffer += chunk
+        *lines, buffer = buffer.split(b"\n")
+        for raw in lines:
+            line = raw.rstrip(b"\r").decode("utf-8")
+            if not line:
+                if data:
+                    yield event or "message", "\n".join(data)
+                event, data = "", []
+            elif line.startswith(":"):
+                yield "", ""
+            else:
+                name, _, value = line.partition(":")
+                value = value[1:] if value.startswith(" ") else value
+                if name == "event":
+                    event = value
+                elif name == "data":
+                    data.append(value)
+
+def exposition_format(content_type: str) -> str:
+    """Exposition format named by a /metrics Content-Type header"""
+    return "openmetrics" if "openmetrics" in (content_type or "") else "text"
+
+def parse_health_metrics(health_data: Dict[str, Any]) -> CellMetrics:
+    """Extract CellMetrics from a cell's /health JSON payload"""
+    consciousness = health_data.get('consciousness', {})
+    level = consciousness.get('level',
+                             consciousness.get('consciousness_level', 0.0))
+
+    return CellMetrics(
+        consciousness_level=level,
+        awareness_level=consciousness.get('awareness_level', 0.0),
+        adaptation_speed=consciousness.get('adaptation_speed', 0.0),
+        predictive_accuracy=consciousness.get(
+            'predictive_accuracy', 0.0),
+        dendritic_coherence=consciousness.get(
+            'dendritic_coherence', 0.0),
+        quantum_coherence=consciousness.get('quantum_coherence', 0.0),
+        timestamp=time.time()
+    )
+
+def _guidance_fields(guidance: GuidanceMessage) -> Dict[str, Any]:
+    """Wire representation of one guidance message"""
+    return {
+        "target_consciousness": guidance.target_consciousness,
+        "adaptation_suggestions": guidance.adaptation_suggestions,
+        "evolutionary_milestones": guidance.evolutionary_milestones,
+        "timestamp": guidance.timestamp
+    }
+
+def guidance_payload(guidance: GuidanceMessage,
+                     batch: Optional[List[GuidanceMessage]] = None) -> Dict[str, Any]:
+    """
+    JSON body for a /guidance POST
+
+    Args:
+        guidance: Guidance the cell should act on
+        batch: Coalesced updates in delivery order (latest last); cells
+            that only read "guidance" still act on the latest one
+    """
+    payload = {"guidance": _guidance_fields(guidance)}
+    if batch and len(batch) > 1:
+        payload["batch"] = [_guidance_fields(message) for message in batch]
+    return payload
+
+def guidance_fingerprint(guidance: GuidanceMessage,
+                         resolution: float = GUIDANCE_TARGET_RESOLUTION) -> str:
+    """Content hash of a guidance message, ignoring its timestamp"""
+    content = json.dumps([
+        round(guidance.target_consciousness / resolution),
+        guidance.adaptation_suggestions,
+        guidance.evolutionary_milestones
+    ])
+    return hashlib.sha1(content.encode("utf-8")).hexdigest()
+
+def calculate_harmony(levels: List[float]) -> float:
+    """Harmony of a set of consciousness levels (1.0 = fully synchronized)"""
+    if len(levels) >= BATCH_HARMONY_THRESHOLD:
+        from batch_orchestration import batch_harmony
+        return batch_harmony(levels)
+    return scalar_harmony(levels)
+
+def scalar_harmony(levels: List[float]) -> float:
+    """Pure-Python calculate_harmony, the reference for the NumPy path"""
+    if len(levels) < 2:
+        return 0.0
+
+    # Calculate correlation coefficient as harmony measure
+    mean_val = sum(levels) / len(levels)
+    variance = sum((x - mean_val) ** 2 for x in levels) / len(levels)
+
+    # Higher harmony = lower variance (more synchronized evolution)
+    return max(0.0, 1.0 - (variance / 2.0))  # Normalize to 0-1 range
+
 class CellClient:
     """Client for communicating with AIOS cells"""
 
-    def __init__(self, cell_id: str, base_url: str = "http://localhost:8000"):
+    def __init__(self, cell_id: str, base_url: str = "http://localhost:8000",
+                 capability_ttl: float = DEFAULT_CAPABILITY_TTL,
+                 timeout: Tuple[float, float] = DEFAULT_TIMEOUT,
+                 max_retries: int = DEFAULT_MAX_RETRIES,
+                 retry_budget: Optional[RetryBudget] = None,
+                 breaker: Optional[CircuitBreaker] = None):
         """
         Initialize cell client
 
         Args:
             cell_id: Unique identifier for the cell (e.g., 'alpha')
             base_url: Base URL for cell's HTTP API
+            capability_ttl: Seconds before the cell's endpoints are re-probed
+            timeout: (connect, read) timeout in seconds, enforced per call
+            max_retries: Retries per call on transient failures
+            retry_budget: Budget shared with other clients (private if omitted)
+            breaker: Circuit breaker for this cell (default thresholds if omitted)
         """
         self.cell_id = cell_id
         self.base_url = base_url.rstrip('/')
         self.session = requests.Session()
-        self.session.timeout = 30
+        self.timeout = timeout
+        self.max_retries = max_retries
+        self.retry_budget = retry_budget or RetryBudget()
+        self.breaker = breaker or CircuitBreaker()
+        self.requests_made = 0
+        self.profiler = DISABLED_PROFILER
+        self.capability_ttl = capability_ttl
+        self.capabilities: Optional[CellCapabilities] = None
+
+        # Push subscription state (see subscribe())
+        self.streaming_supported: Optional[bool] = None
+        self.stream_staleness = DEFAULT_STREAM_STALENESS
+        self.stream_events = 0
+        self._live_fields: Dict[str, float] = {}
+        self._live_metrics: Optional[CellMetrics] = None
+        self._stream_heard_at = 0.0
+        self.stream_connected = False
+        self._stream_stop = threading.Event()
+        self._stream_thread: Optional[threading.Thread] = None
+        self._stream_response: Optional[requests.Response] = None
+        # The reader thread never touches the poll path's session, breaker
+        # or requests_made, so reconnects neither trip nor inflate them
+        self._stream_session: Optional[requests.Session] = None
+        self.stream_requests_made = 0
 
         logger.info(f"Initialized CellClient for {cell_id} at {base_url}")
 
+    def _retryable(self, method: str, error: Exception) -> bool:
+        """Whether a failed attempt may be repeated"""
+        if method == "GET":
+            return isinstance(error, (requests.ConnectionError, requests.Timeout))
+        # Only a failed connect guarantees a POST never reached the cell
+        return isinstance(error, requests.ConnectTimeout)
+
+    def _request(self, method: str, path: str, **kwargs) -> requests.Response:
+        """
+        Issue an HTTP request against the cell
+
+        Enforces the connect/read timeout, retries transient failures with
+        jittered exponential backoff while the shared retry budget allows,
+        and fast-fails with CircuitOpenError while the cell's breaker is open.
+        """
+        if not self.breaker.allow_request():
+            raise CircuitOpenError(f"Circuit open for {self.cell_id}")
+
+        kwargs.setdefault("timeout", self.timeout)
+        url = f"{self.base_url}{path}"
+        self.retry_budget.record_request()
+        attempt = 0
+        while True:
+            self.requests_made += 1
+            try:
+                response = self.session.request(method, url, **kwargs)
+            except requests.RequestException as e:
+                error: Optional[Exception] = e
+                retryable = self._retryable(method, e)
+            else:
+                if response.status_code < 500:
+                    self.breaker.record_success()
+                    return response
+                error = None
+                retryable = method == "GET" and response.status_code in RETRYABLE_STATUSES
+
+            if not retryable or attempt >= self.max_retries or not self.retry_budget.try_acquire():
+                self.breaker.record_failure()
+                if error is not None:
+                    raise error
+                return response
+
+            if error is None:
+                response.close()
+            attempt += 1
+            delay = random.uniform(0.0, min(RETRY_BACKOFF_CAP, RETRY_BACKOFF_BASE * 2 ** attempt))
+            logger.debug(f"Retrying {method} {path} on {self.cell_id} in {delay:.3f}s "
+                         f"(attempt {attempt + 1})")
+            time.sleep(delay)
+
     def get_health(self) -> Dict[str, Any]:
         """Check cell health status"""
         try:
-            response = self.session.get(f"{self.base_url}/health")
+            response = self._request("GET", "/health")
             response.raise_for_status()
             return response.json()
         except Exception as e:
             logger.error(f"Health check failed for {self.cell_id}: {e}")
             return {"status": "unhealthy", "error": str(e)}
 
+    def _fetch_prometheus(self) -> Tuple[Optional[CellMetrics], str]:
+        """
+        GET /metrics and parse it as the body streams in
+
+        Returns:
+            Tuple of (metrics or None, exposition format)
+        """
+        with self._request("GET", METRICS_PATH, stream=True,
+                           headers={"Accept": METRICS_ACCEPT}) as response:
+            if response.status_code != 200:
+                return None, ""
+            collector = CellMetricsCollector(self.cell_id)
+            profiler = self.profiler
+            for chunk in response.iter_content(chunk_size=8192):
+                with profiler.phase("parse"):
+                    collector.feed(chunk)
+            with profiler.phase("parse"):
+                collector.close()
+            return (metrics_from_collector(collector),
+                    exposition_format(response.headers.get("Content-Type")))
+
+    def _fetch_health_metrics(self) -> CellMetrics:
+        """GET /health and extract its consciousness block"""
+        response = self._request("GET", HEALTH_PATH)
+        response.raise_for_status()
+        return parse_health_metrics(response.json())
+
+    def probe_capabilities(self) -> Optional[CellMetrics]:
+        """
+        Probe /metrics and /health once and cache what the cell serves
+
+        Both endpoints are tried so the cached capabilities are complete;
+        the metrics observed while probing are returned so the probe
+        doubles as this cycle's poll.
+
+        Returns:
+            Metrics from the preferred endpoint, or None if neither works
+        """
+        metrics, fmt = None, ""
+        try:
+            metrics, fmt = self._fetch_prometheus()
+        except CircuitOpenError:
+            return None
+        except (requests.ConnectionError, requests.Timeout) as e:
+            # The host itself is unreachable; /health would fail the same way
+            logger.error(f"Capability probe failed for {self.cell_id}: {e}")
+            self.capabilities = None
+            return None
+        except requests.RequestException as e:
+            logger.debug(f"{self.cell_id} /metrics unusable: {e}")
+
+        health_metrics = None
+        try:
+            health_metrics = self._fetch_health_metrics()
+        except (requests.RequestException, ValueError) as e:
+            logger.debug(f"{self.cell_id} /health unusable: {e}")
+
+        if metrics is None and health_metrics is None:
+            logger.error(f"Capability probe failed for {self.cell_id}: no usable metrics endpoint")
+            self.capabilities = None
+            return None
+
+        self.capabilities = CellCapabilities(
+            metrics_source=METRICS_PATH if metrics else HEALTH_PATH,
+            metrics_format=fmt if metrics else "json",
+            metrics_available=metrics is not None,
+            health_available=health_metrics is not None,
+            probed_at=time.time()
+        )
+        logger.info(f"Cell {self.cell_id} serves metrics from "
+                    f"{self.capabilities.metrics_source} ({self.capabilities.metrics_format})")
+        return metrics or health_metrics
+
+    def subscribe(self, staleness: float = DEFAULT_STREAM_STALENESS):
+        """
+        Hold a long-lived /metrics/stream connection for push updates
+
+        The cell pushes CellMetrics deltas as server-sent events and a
+        background thread folds them into a live local view, which
+        get_consciousness_metrics() returns without doing I/O. Cells that
+        do not serve the stream keep being polled; dropped streams are
+        reconnected with backoff and polled in the meantime.
+
+        Args:
+            staleness: Seconds of stream silence after which the live view
+                is no longer trusted
+        """
+        if self._stream_thread is not None and self._stream_thread.is_alive():
+            return
+        self.stream_staleness = staleness
+        self._stream_stop.clear()
+        self._stream_thread = threading.Thread(
+            target=self._stream_loop, name=f"cell-stream-{self.cell_id}", daemon=True)
+        self._stream_thread.start()
+
+    def unsubscribe(self, wait: bool = True):
+        """
+        Close the push subscription and return to polling
+
+        Args:
+            wait: Block until the reader thread has exited
+        """
+        self._stream_stop.set()
+        response = self._stream_response
+        if response is not None:
+            # Unblocks the reader thread mid-read
+            response.close()
+        if not wait:
+            return
+        if self._stream_thread is not None:
+            self._stream_thread.join(timeout=5.0)
+        self._stream_thread = None
+        self.stream_connected = False
+        if self._stream_session is not None:
+            self._stream_session.close()
+            self._stream_session = None
+
+    def _open_stream(self) -> requests.Response:
+        """
+        GET the metrics stream on the reader thread's own session
+
+        The read timeout is the staleness window: keepalives arrive well
+        inside it, so only a stream that has really gone silent times out.
+        """
+        if self._stream_session is None:
+            self._stream_session = requests.Session()
+        self.stream_requests_made += 1
+        return self._stream_session.get(
+            f"{self.base_url}{STREAM_PATH}", stream=True,
+            headers={"Accept": "text/event-stream"},
+            timeout=(self.timeout[0], self.stream_staleness))
+
+    def _stream_loop(self):
+        """Read the metrics stream, reconnecting until unsubscribed"""
+        backoff = 1.0
+        while not self._stream_stop.is_set():
+            try:
+                with self._open_stream() as response:
+                    content_type = response.headers.get("Content-Type", "")
+                    if response.status_code in (404, 405, 406, 501) or (
+                            response.ok and "text/event-stream" not in content_type):
+                        self.streaming_supported = False
+                        logger.info(f"Cell {self.cell_id} has no metrics stream; polling instead")
+                        return
+                    response.raise_for_status()
+
+                    self.streaming_supported = True
+                    self._stream_response = response
+                    self.stream_connected = True
+                    backoff = 1.0
+                    logger.info(f"Subscribed to {self.cell_id} metrics stream")
+                    # chunk_size=None hands over each chunk as soon as it arrives
+                    for event, data in iter_sse_events(response.iter_content(chunk_size=None)):
+                        self._stream_heard_at = time.time()
+                        if event == "metrics":
+                            self._apply_stream_delta(json.loads(data))
+
+            except Exception as e:
+                if not self._stream_stop.is_set():
+                    logger.warning(f"Metrics stream for {self.cell_id} dropped: {e}")
+            finally:
+                self.stream_connected = False
+                self._stream_response = None
+
+            self._stream_stop.wait(backoff)
+            backoff = min(STREAM_RECONNECT_CAP, backoff * 2)
+
+    def _apply_stream_delta(self, delta: Dict[str, Any]):
+        """Fold one pushed delta into the live view"""
+        for name in STREAM_FIELDS:
+            if name in delta:
+                self._live_fields[name] = float(delta[name])
+        self.stream_events += 1
+        if len(self._live_fields) == len(STREAM_FIELDS):
+            # Reference swap: readers always see one whole observation
+            self._live_metrics = CellMetrics(**self._live_fields, timestamp=time.time())
+
+    def live_metrics(self) -> Optional[CellMetrics]:
+        """Live view from the push subscription, or None if it is not current"""
+        live = self._live_metrics
+        heard_at = self._stream_heard_at
+        if (not self.stream_connected or live is None
+                or time.time() - heard_at > self.stream_staleness):
+            return None
+        # Keepalives confirm an unchanged cell is still current
+        return replace(live, timestamp=max(live.timestamp, heard_at))
+
     def get_consciousness_metrics(self) -> Optional[CellMetrics]:
-        """Retrieve current consciousness metrics from cell"""
+        """
+        Retrieve current consciousness metrics from cell
+
+        Returns the push subscription's live view when it is current.
+        Otherwise uses the endpoint recorded by the last capability probe,
+        so steady state costs one request. The cell is re-probed when the
+        cached capabilities expire or the cached endpoint stops answering.
+        """
+        live = self.live_metrics()
+        if live is not None:
+            return live
+
+        capabilities = self.capabilities
+        if capabilities is None or capabilities.expired(self.capability_ttl):
+            return self.probe_capabilities()
+
         try:
-            # First try /metrics endpoint for Prometheus format
-            response = self.session.get(f"{self.base_url}/metrics")
-            if response.status_code == 200:
-                # Parse Prometheus format metrics
-                metrics_data = {}
-                for line in response.text.split('\n'):
-                    if line.startswith('aios_') and '{' not in line:
-                        parts = line.split(' ')
-                        if len(parts) >= 2:
-                            key = parts[0].replace('aios_', '').replace('_level', '')
-                            try:
-                                value = float(parts[1])
-                                metrics_data[key] = value
-                            except ValueError:
-                                continue
-
-                if 'consciousness' in metrics_data:
-                    return CellMetrics(
-                        consciousness_level=metrics_data.get('consciousness', 0.0),
-                        awareness_level=metrics_data.get('awareness', 0.0),
-                        adaptation_speed=metrics_data.get('adaptation', 0.0),
-                        predictive_accuracy=metrics_data.get('predictive', 0.0),
-                        dendritic_coherence=metrics_data.get('dendritic', 0.0),
-                        quantum_coherence=metrics_data.get('quantum', 0.0),
-                        timestamp=time.time()
-                    )
-
-            # Fallback to /health endpoint if /metrics not available
-            response = self.session.get(f"{self.base_url}/health")
-            response.raise_for_status()
-            health_data = response.json()
-
-            # Extract consciousness data from health response
-            consciousness = health_data.get('consciousness', {})
-            level = consciousness.get('level',
-                                     consciousness.get('consciousness_level', 0.0))
-
-            return CellMetrics(
-                consciousness_level=level,
-                awareness_level=consciousness.get('awareness_level', 0.0),
-                adaptation_speed=consciousness.get('adaptation_speed', 0.0),
-                predictive_accuracy=consciousness.get(
-                    'predictive_accuracy', 0.0),
-                dendritic_coherence=consciousness.get(
-                    'dendritic_coherence', 0.0),
-                quantum_coherence=consciousness.get('quantum_coherence', 0.0),
-                timestamp=time.time()
-            )
+            if capabilities.metrics_source == METRICS_PATH:
+                metrics, _ = self._fetch_prometheus()
+            else:
+                metrics = self._fetch_health_metrics()
+            if metrics:
+                return metrics
+            logger.warning(f"{self.cell_id} {capabilities.metrics_source} returned no metrics")
+
+        except CircuitOpenError as e:
+            # Breaker fast-fail: the cached endpoint is still the right one
+            logger.debug(f"Skipping metrics for {self.cell_id}: {e}")
+            return None
 
         except Exception as e:
             logger.error(f"Failed to get metrics from {self.cell_id}: {e}")
 
+        # Forget what the cell serves so the next call re-probes it
+        self.capabilities = None
         return None
 
-    def send_guidance(self, guidance: GuidanceMessage) -> bool:
-        """Send evolutionary guidance to cell"""
+    def send_guidance(self, guidance: GuidanceMessage,
+                      batch: Optional[List[GuidanceMessage]] = None) -> bool:
+        """Send evolutionary guidance (optionally with coalesced updates) to cell"""
         try:
-            payload = {
-                "guidance": {
-                    "target_consciousness": guidance.target_consciousness,
-                    "adaptation_suggestions": guidance.adaptation_suggestions,
-                    "evolutionary_milestones": guidance.evolutionary_milestones,
-                    "timestamp": guidance.timestamp
-                }
-            }
-
-            response = self.session.post(
-                f"{self.base_url}/guidance",
-                json=payload,
+            response = self._request(
+                "POST", "/guidance",
+                json=guidance_payload(guidance, batch),
                 headers={"Content-Type": "application/json"}
             )
             response.raise_for_status()
@@ -163,135 +729,638 @@ def send_guidance(self, guidance: GuidanceMessage) -> bool:
     def get_experimental_results(self) -> Optional[Dict[str, Any]]:
         """Retrieve experimental results from cell"""
         try:
-            response = self.session.get(f"{self.base_url}/experiments/results")
+            response = self._request("GET", "/experiments/results")
             response.raise_for_status()
             return response.json()
         except Exception as e:
             logger.error(f"Failed to get experimental results from {self.cell_id}: {e}")
             return None
 
-class OrchestratorClient:
-    """High-level orchestrator for managing multiple cells"""
+@dataclass
+class PollState:
+    """Scheduling state of one cell"""
+    interval: float
+    next_due: float
+    last_level: Optional[float] = None
+    failures: int = 0
 
-    def __init__(self):
-        self.cells: Dict[str, CellClient] = {}
+class AdaptivePollScheduler:
+    """
+    Per-cell polling scheduler on a min-heap of next-due times
+
+    Each poll outcome moves the cell's interval: a failure or a
+    consciousness change of at least `volatility_threshold` halves it
+    (down to `min_interval`), a stable reading stretches it by
+    `backoff_factor` (up to `max_interval`). A token bucket caps polls
+    per second across all cells; cells over the ceiling stay due and
+    are served first once tokens refill.
+    """
+
+    def __init__(self, initial_interval: float = DEFAULT_POLL_INTERVAL,
+                 min_interval: float = MIN_POLL_INTERVAL,
+                 max_interval: float = MAX_POLL_INTERVAL,
+                 volatility_threshold: float = 0.1,
+                 backoff_factor: float = 1.5,
+                 max_polls_per_second: float = DEFAULT_MAX_POLLS_PER_SECOND):
+        """
+        Initialize scheduler
+
+        Args:
+            initial_interval: Interval of a newly added cell
+            min_interval: Tightest per-cell interval
+            max_interval: Loosest per-cell interval
+            volatility_threshold: Consciousness change that counts as volatile
+            backoff_factor: Interval growth after a stable reading
+            max_polls_per_second: Global poll rate ceiling
+        """
+        self.initial_interval = min(max(initial_interval, min_interval), max_interval)
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.volatility_threshold = volatility_threshold
+        self.backoff_factor = backoff_factor
+        self.max_polls_per_second = max_polls_per_second
+
+        self.states: Dict[str, PollState] = {}
+        self._heap: List[Tuple[float, int, str]] = []
+        self._sequence = 0
+        self._tokens = max_polls_per_second
+        self._refilled_at = time.monotonic()
+
+    def _push(self, cell_id: str, due: float):
+        """Queue a cell; superseded heap entries are skipped lazily"""
+        self._sequence += 1
+        heapq.heappush(self._heap, (due, self._sequence, cell_id))
+
+    def _refill(self, now: float):
+        """Top up the rate-limit bucket (burst = one second of polls)"""
+        self._tokens = min(self.max_polls_per_second,
+                           self._tokens + (now - self._refilled_at) * self.max_polls_per_second)
+        self._refilled_at = now
+
+    def _discard_stale(self):
+        """Drop heap entries for removed or rescheduled cells"""
+        while self._heap:
+            due, _, cell_id = self._heap[0]
+            state = self.states.get(cell_id)
+            if state is not None and state.next_due == due:
+                return
+            heapq.heappop(self._heap)
+
+    def add(self, cell_id: str, now: Optional[float] = None):
+        """Schedule a cell for an immediate first poll"""
+        now = time.monotonic() if now is None else now
+        self.states[cell_id] = PollState(interval=self.initial_interval, next_due=now)
+        self._push(cell_id, now)
+
+    def remove(self, cell_id: str):
+        """Stop scheduling a cell"""
+        self.states.pop(cell_id, None)
+
+    def due(self, now: Optional[float] = None) -> List[str]:
+        """Pop every cell that is due, up to the global rate ceiling"""
+        now = time.monotonic() if now is None else now
+        self._refill(now)
+        cells = []
+        while self._tokens >= 1.0:
+            self._discard_stale()
+            if not self._heap or self._heap[0][0] > now:
+                break
+            _, _, cell_id = heapq.heappop(self._heap)
+            # Parked until record() reschedules it
+            self.states[cell_id].next_due = float("inf")
+            self._tokens -= 1.0
+            cells.append(cell_id)
+        return cells
+
+    def record(self, cell_id: str, level: Optional[float], now: Optional[float] = None) -> float:
+        """
+        Reschedule a cell from its latest poll
+
+        Args:
+            cell_id: Cell that was polled
+            level: Observed consciousness level, or None if the poll failed
+            now: Poll completion time (monotonic)
+
+        Returns:
+            Seconds until the cell is polled again
+        """
+        state = self.states.get(cell_id)
+        if state is None:
+            return 0.0
+        now = time.monotonic() if now is None else now
+
+        if level is None:
+            state.failures += 1
+            interval = state.interval / 2
+        else:
+            state.failures = 0
+            volatile = (state.last_level is not None
+                        and abs(level - state.last_level) >= self.volatility_threshold)
+            interval = state.interval / 2 if volatile else state.interval * self.backoff_factor
+            state.last_level = level
+
+        state.interval = min(max(interval, self.min_interval), self.max_interval)
+        state.next_due = now + state.interval
+        self._push(cell_id, state.next_due)
+        return state.interval
+
+    def next_wakeup(self, now: Optional[float] = None) -> Optional[float]:
+        """Seconds until due() can return work (None when nothing is scheduled)"""
+        now = time.monotonic() if now is None else now
+        self._discard_stale()
+        if not self._heap:
+            return None
+        wait = max(0.0, self._heap[0][0] - now)
+        self._refill(now)
+        if self._tokens < 1.0:
+            wait = max(wait, (1.0 - self._tokens) / self.max_polls_per_second)
+        return wait
+
+class OrchestrationState:
+    """
+    Cell registry, guidance rules and guidance bookkeeping
+
+    Shared by OrchestratorClient and the asyncio orchestrator; nothing
+    here does I/O, so it is safe to call from either.
+    """
+
+    def __init__(self, guidance_refresh_interval: float = DEFAULT_GUIDANCE_REFRESH,
+                 profiler: Optional[CycleProfiler] = None):
+        """
+        Initialize orchestration state
+
+        Args:
+            guidance_refresh_interval: Seconds after which unchanged guidance
+                is re-sent anyway, so restarted cells are re-guided
+            profiler: CycleProfiler for per-phase/per-cell timings (off if omitted)
+        """
+        self.cells: Dict[str, Any] = {}
+        self.profiler = profiler or DISABLED_PROFILER
+        self.guidance_refresh_interval = guidance_refresh_interval
+        # Fingerprint and time of the last guidance each cell accepted
+        self.delivered_guidance: Dict[str, Tuple[str, float]] = {}
+        # Changed guidance waiting for its batch window, oldest first
+        self.pending_guidance: Dict[str, List[Tuple[str, GuidanceMessage]]] = {}
+        # Most recent observation of every cell, for partial cycles
+        self.latest_metrics: Dict[str, CellMetrics] = {}
         self.orchestrator_metrics = {
             "consciousness_level": 4.2,  # Higher baseline as experienced system
             "guidance_effectiveness": 0.0,
             "system_harmony": 0.0
         }
 
+    def _release_client(self, client: Any):
+        """Release whatever an unregistered client holds open"""
+
+    def unregister_cell(self, cell_id: str) -> bool:
+        """
+        Stop orchestrating a cell and forget its state
+
+        Returns:
+            True if the cell was registered
+        """
+        client = self.cells.pop(cell_id, None)
+        if client is None:
+            return False
+        self._release_client(client)
+        self.latest_metrics.pop(cell_id, None)
+        self.delivered_guidance.pop(cell_id, None)
+        self.pending_guidance.pop(cell_id, None)
+        logger.info(f"Unregistered cell: {cell_id}")
+        return True
+
+    def generate_guidance(self, cell_metrics: CellMetrics) -> GuidanceMessage:
+        """Generate evolutionary guidance based on cell's current state"""
+        target_consciousness = min(GUIDANCE_TARGET_CEILING,
+                                   cell_metrics.consciousness_level + GUIDANCE_TARGET_STEP)
+
+        suggestions = [text for field, threshold, text in SUGGESTION_RULES
+                       if getattr(cell_metrics, field) < threshold]
+        milestones = [text for field, threshold, text in MILESTONE_RULES
+                      if getattr(cell_metrics, field) >= threshold]
+
+        return GuidanceMessage(
+            target_consciousness=target_consciousness,
+            adaptation_suggestions=suggestions,
+            evolutionary_milestones=milestones,
+            timestamp=time.time()
+        )
+
+    def plan_guidance(self, metrics: Dict[str, Optional[CellMetrics]]) -> Dict[str, GuidanceMessage]:
+        """
+        Guidance for every observed cell
+
+        Callers that already hold metrics as arrays should use
+        batch_orchestration.batch_guidance() instead.
+        """
+        return {cell_id: self.generate_guidance(m) for cell_id, m in metrics.items() if m}
+
+    def _guidance_changed(self, cell_id: str, fingerprint: str, now: float) -> bool:
+        """Whether guidance with this fingerprint still needs delivering"""
+        pending = self.pending_guidance.get(cell_id)
+        if pending:
+            return pending[-1][0] != fingerprint
+        delivered = self.delivered_guidance.get(cell_id)
+        if delivered is None:
+            return True
+        last_fingerprint, delivered_at = delivered
+        return (last_fingerprint != fingerprint
+                or now - delivered_at >= self.guidance_refresh_interval)
+
+class OrchestratorClient(OrchestrationState):
+    """High-level orchestrator for managing multiple cells"""
+
+    def __init__(self, guidance_batch_window: float = 0.0,
+                 guidance_refresh_interval: float = DEFAULT_GUIDANCE_REFRESH,
+                 subscribe: bool = False,
+                 recorder: Optional[Any] = None,
+                 harmony_groups: Optional[Dict[str, str]] = None,
+                 profiler: Optional[CycleProfiler] = None):
+        """
+        Initialize orchestrator
+
+        Args:
+            guidance_batch_window: Seconds to hold changed guidance so later
+                updates coalesce into one POST (0 sends immediately)
+            guidance_refresh_interval: Seconds after which unchanged guidance
+                is re-sent anyway, so restarted cells are re-guided
+            subscribe: Hold a push subscription to every registered cell
+                (cells without a metrics stream are polled)
+            recorder: MetricsRecorder that archives every cycle snapshot
+            harmony_groups: cell_id -> group (e.g. host) for per-group harmony
+            profiler: CycleProfiler for per-phase/per-cell timings (off if omitted)
+        """
+        super().__init__(guidance_refresh_interval=guidance_refresh_interval, profiler=profiler)
+        self.cells: Dict[str, CellClient] = {}
+        self.retry_budget = RetryBudget()
+        self.guidance_batch_window = guidance_batch_window
+        self.subscribe = subscribe
+        self.recorder = recorder
+        self.harmony_groups = harmony_groups
+
     def register_cell(self, cell_id: str, base_url: str) -> CellClient:
         """Register a new cell for orchestration"""
-        client = CellClient(cell_id, base_url)
+        client = CellClient(cell_id, base_url, retry_budget=self.retry_budget)
+        client.profiler = self.profiler
+        if self.subscribe:
+            client.subscribe()
         self.cells[cell_id] = client
         logger.info(f"Registered cell: {cell_id}")
         return client
 
-    def get_system_harmony(self) -> float:
+    def _release_client(self, client: CellClient):
+        """Close the cell's push subscription without waiting for its reader"""
+        client.unsubscribe(wait=False)
+
+    def close(self):
+        """Close every cell's push subscription and seal the recorder"""
+        # Signal every reader first so the joins overlap
+        for client in self.cells.values():
+            client.unsubscribe(wait=False)
+        for client in self.cells.values():
+            client.unsubscribe()
+        if self.recorder is not None:
+            self.recorder.close()
+
+    def take_cycle_snapshot(self, cell_ids: Optional[List[str]] = None) -> CycleSnapshot:
+        """
+        Fetch each cell's metrics exactly once for this cycle
+
+        Args:
+            cell_ids: Cells to fetch (all registered cells if omitted)
+        """
+        taken_at = time.time()
+        metrics: Dict[str, Optional[CellMetrics]] = {}
+        requests_made = 0
+        profiler = self.profiler
+        timed = profiler.enabled
+        for cell_id in (self.cells if cell_ids is None else cell_ids):
+            client = self.cells[cell_id]
+            before = client.requests_made
+            if timed:
+                started = time.perf_counter()
+                metrics[cell_id] = client.get_consciousness_metrics()
+                profiler.record_cell(cell_id, "fetch", time.perf_counter() - started)
+            else:
+                metrics[cell_id] = client.get_consciousness_metrics()
+            requests_made += client.requests_made - before
+            if metrics[cell_id]:
+                self.latest_metrics[cell_id] = metrics[cell_id]
+        return CycleSnapshot(metrics=metrics, requests_made=requests_made, taken_at=taken_at)
+
+    def get_system_harmony(self, snapshot: Optional[CycleSnapshot] = None) -> float:
         """Calculate harmony across all monitored cells"""
         if not self.cells:
             return 0.0
 
-        metrics = []
-        for cell_id, client in self.cells.items():
-            cell_metrics = client.get_consciousness_metrics()
-            if cell_metrics:
-                metrics.append(cell_metrics.consciousness_level)
+        if snapshot is None:
+            snapshot = self.take_cycle_snapshot()
+        return calculate_harmony(snapshot.levels())
 
-        if len(metrics) < 2:
-            return 0.0
+    def group_harmony(self) -> Dict[str, float]:
+        """Harmony within each harmony group, from the latest observations"""
+        if not self.harmony_groups:
+            return {}
+        from batch_orchestration import UNASSIGNED_GROUP, group_harmony
+        cell_ids = list(self.latest_metrics)
+        return group_harmony(
+            [self.latest_metrics[cell_id].consciousness_level for cell_id in cell_ids],
+            [self.harmony_groups.get(cell_id, UNASSIGNED_GROUP) for cell_id in cell_ids]
+        )
 
-        # Calculate correlation coefficient as harmony measure
-        mean_val = sum(metrics) / len(metrics)
-        variance = sum((x - mean_val) ** 2 for x in metrics) / len(metrics)
+    def _timed_send(self, cell_id: str, client: CellClient, guidance: GuidanceMessage,
+                    batch: Optional[List[GuidanceMessage]] = None) -> bool:
+        """send_guidance(), timed per cell when profiling"""
+        profiler = self.profiler
+        if not profiler.enabled:
+            return client.send_guidance(guidance, batch)
+        started = time.perf_counter()
+        delivered = client.send_guidance(guidance, batch)
+        profiler.record_cell(cell_id, "guidance", time.perf_counter() - started)
+        return delivered
 
-        # Higher harmony = lower variance (more synchronized evolution)
-        harmony = max(0.0, 1.0 - (variance / 2.0))  # Normalize to 0-1 range
-        return harmony
+    def deliver_guidance(self, cell_id: str, guidance: GuidanceMessage) -> str:
+        """
+        Send guidance unless the cell already has the same guidance
 
-    def generate_guidance(self, cell_metrics: CellMetrics) -> GuidanceMessage:
-        """Generate evolutionary guidance based on cell's current state"""
-        target_consciousness = min(5.0, cell_metrics.consciousness_level + 0.1)
-
-        suggestions = []
-        if cell_metrics.adaptation_speed < 0.8:
-            suggestions.append("Increase adaptation learning rate")
-        if cell_metrics.predictive_accuracy < 0.8:
-            suggestions.append("Enhance predictive model training")
-        if cell_metrics.dendritic_coherence < 0.95:
-            suggestions.append("Strengthen dendritic connections")
-
-        milestones = []
-        if cell_metrics.consciousness_level >= 3.5:
-            milestones.append("Advanced consciousness patterns achieved")
-        if cell_metrics.awareness_level >= 3.5:
-            milestones.append("Self-awareness milestone reached")
+        Returns:
+            GUIDANCE_SENT, GUIDANCE_SUPPRESSED, GUIDANCE_QUEUED or GUIDANCE_FAILED
+        """
+        now = time.time()
+        fingerprint = guidance_fingerprint(guidance)
+        if not self._guidance_changed(cell_id, fingerprint, now):
+            return GUIDANCE_SUPPRESSED
 
-        return GuidanceMessage(
-            target_consciousness=target_consciousness,
-            adaptation_suggestions=suggestions,
-            evolutionary_milestones=milestones,
-            timestamp=time.time()
-        )
+        if self.guidance_batch_window > 0:
+            self.pending_guidance.setdefault(cell_id, []).append((fingerprint, guidance))
+            return GUIDANCE_QUEUED
 
-    def orchestrate_evolution(self) -> Dict[str, Any]:
-        """Main orchestration loop - monitor and guide cell evolution"""
+        delivered = self._timed_send(cell_id, self.cells[cell_id], guidance)
+        if delivered:
+            self.delivered_guidance[cell_id] = (fingerprint, now)
+            return GUIDANCE_SENT
+        return GUIDANCE_FAILED
+
+    def flush_guidance(self, force: bool = False) -> int:
+        """
+        Deliver queued guidance whose batch window has elapsed
+
+        All of a cell's pending updates go out as one POST.
+
+        Args:
+            force: Flush every pending batch regardless of its window
+
+        Returns:
+            Number of batches delivered
+        """
+        now = time.time()
+        delivered = 0
+        for cell_id in list(self.pending_guidance):
+            pending = self.pending_guidance[cell_id]
+            oldest = pending[0][1]
+            if not force and now - oldest.timestamp < self.guidance_batch_window:
+                continue
+            client = self.cells.get(cell_id)
+            if client is None:
+                del self.pending_guidance[cell_id]
+                continue
+            fingerprint, latest = pending[-1]
+            if self._timed_send(cell_id, client, latest, [guidance for _, guidance in pending]):
+                self.delivered_guidance[cell_id] = (fingerprint, now)
+                del self.pending_guidance[cell_id]
+                delivered += 1
+        return delivered
+
+    def orchestrate_evolution(self, cell_ids: Optional[List[str]] = None) -> Dict[str, Any]:
+        """
+        Main orchestration loop - monitor and guide cell evolution
+
+        Args:
+            cell_ids: Cells to poll and guide this cycle (all if omitted).
+                Harmony still spans every cell, using each unpolled
+                cell's latest observation.
+        """
+        profiler = self.profiler
+        profiler.begin_cycle()
+
+        # One fetch per cell feeds both harmony and guidance
+        with profiler.phase("fetch"):
+            snapshot = self.take_cycle_snapshot(cell_ids)
+        if self.recorder is not None:
+            with profiler.phase("record"):
+                try:
+                    self.recorder.record_snapshot(snapshot)
+                except Exception as e:
+                    logger.error(f"Failed to record cycle snapshot: {e}")
+        with profiler.phase("harmony"):
+            if cell_ids is None:
+                harmony = self.get_system_harmony(snapshot)
+            else:
+                harmony = calculate_harmony([m.consciousness_level for m in self.latest_metrics.values()])
         results = {
             "timestamp": time.time(),
-            "cells_monitored": len(self.cells),
+            "cells_monitored": len(snapshot.metrics),
             "guidance_sent": 0,
-            "harmony_score": self.get_system_harmony(),
-            "cell_states": {}
+            "guidance_suppressed": 0,
+            "guidance_queued": 0,
+            "cells_streaming": 0,
+            "harmony_score": harmony,
+            "cell_states": {},
+            # A separate harmony pass used to repeat every snapshot request
+            "requests_saved": snapshot.requests_made,
+            "snapshot_age_seconds": 0.0
         }
+        if self.harmony_groups:
+            with profiler.phase("harmony"):
+                results["group_harmony"] = self.group_harmony()
 
-        for cell_id, client in self.cells.items():
-            # Get current cell state
-            metrics = client.get_consciousness_metrics()
-            if metrics:
-                results["cell_states"][cell_id] = {
-                    "consciousness": metrics.consciousness_level,
-                    "health": "healthy"
-                }
-
-                # Generate and send guidance
-                guidance = self.generate_guidance(metrics)
-                if client.send_guidance(guidance):
-                    results["guidance_sent"] += 1
-            else:
-                results["cell_states"][cell_id] = {
-                    "consciousness": 0.0,
-                    "health": "unreachable"
-                }
+        with profiler.phase("plan_guidance"):
+            guidance_plan = self.plan_guidance(snapshot.metrics)
+        with profiler.phase("deliver_guidance"):
+            for cell_id in snapshot.metrics:
+                client = self.cells[cell_id]
+                # Get current cell state
+                metrics = snapshot.metrics.get(cell_id)
+                if metrics:
+                    results["cell_states"][cell_id] = {
+                        "consciousness": metrics.consciousness_level,
+                        "health": "healthy"
+                    }
+
+                    # Generate guidance and send it only if it changed
+                    outcome = self.deliver_guidance(cell_id, guidance_plan[cell_id])
+                    results["cell_states"][cell_id]["guidance"] = outcome
+                    if outcome == GUIDANCE_SENT:
+                        results["guidance_sent"] += 1
+                    elif outcome == GUIDANCE_SUPPRESSED:
+                        results["guidance_suppressed"] += 1
+                    elif outcome == GUIDANCE_QUEUED:
+                        results["guidance_queued"] += 1
+                else:
+                    results["cell_states"][cell_id] = {
+                        "consciousness": 0.0,
+                        "health": "unreachable"
+                    }
+                results["cell_states"][cell_id]["breaker"] = client.breaker.status()
+                if client.stream_connected:
+                    results["cells_streaming"] += 1
+
+            if self.pending_guidance:
+                results["guidance_sent"] += self.flush_guidance()
+
+        results["snapshot_age_seconds"] = round(snapshot.age(), 3)
 
         # Update orchestrator metrics
-        self.orchestrator_metrics["guidance_effectiveness"] = results["guidance_sent"] / max(1, len(self.cells))
+        # Suppressed cells already hold current guidance
+        guided = results["guidance_sent"] + results["guidance_suppressed"]
+        self.orchestrator_metrics["guidance_effectiveness"] = guided / max(1, results["cells_monitored"])
         self.orchestrator_metrics["system_harmony"] = results["harmony_score"]
 
-        logger.info(f"Orchestration cycle completed: {results['guidance_sent']} guidance messages sent")
+        profile = profiler.end_cycle()
+        if profile is not None:
+            results["profile"] = profile
+
+        logger.info(f"Orchestration cycle completed: {results['guidance_sent']} guidance messages sent, "
+                    f"{results['guidance_suppressed']} unchanged")
+        return results
+
+    def orchestrate_due(self, scheduler: AdaptivePollScheduler) -> Optional[Dict[str, Any]]:
+        """
+        Run a partial cycle over the cells the scheduler says are due
+
+        Returns:
+            The cycle results, or None if no cell was due
+        """
+        due = [cell_id for cell_id in scheduler.due() if cell_id in self.cells]
+        if not due:
+            return None
+
+        recorded = set()
+        try:
+            results = self.orchestrate_evolution(due)
+            for cell_id in due:
+                state = results["cell_states"][cell_id]
+                level = state["consciousness"] if state["health"] == "healthy" else None
+                state["poll_interval"] = round(scheduler.record(cell_id, level), 3)
+                recorded.add(cell_id)
+        finally:
+            # due() parked these cells; a failed cycle must not strand them
+            for cell_id in due:
+                if cell_id not in recorded:
+                    scheduler.record(cell_id, None)
         return results
 
+def parse_args() -> argparse.Namespace:
+    """Parse command line arguments"""
+    parser = argparse.ArgumentParser(description="AIOS cell orchestrator")
+    parser.add_argument("--fixed-interval", type=float, default=None,
+                        help="Poll every cell every N seconds instead of adaptively")
+    parser.add_argument("--min-interval", type=float, default=MIN_POLL_INTERVAL,
+                        help="Tightest per-cell poll interval")
+    parser.add_argument("--max-interval", type=float, default=MAX_POLL_INTERVAL,
+                        help="Loosest per-cell poll interval")
+    parser.add_argument("--max-polls-per-second", type=float, default=DEFAULT_MAX_POLLS_PER_SECOND,
+                        help="Global poll rate ceiling across all cells")
+    parser.add_argument("--guidance-batch-window", type=float, default=0.0,
+                        help="Seconds to coalesce changed guidance into one POST per cell")
+    parser.add_argument("--subscribe", action="store_true",
+                        help="Hold push metric streams to cells that support them")
+    parser.add_argument("--hosts-config", help="hosts.yaml for per-host harmony groups")
+    parser.add_argument("--profile", action="store_true",
+                        help="Time each cycle phase and cell request (adds results['profile'])")
+    parser.add_argument("--profile-dump", help="Write folded-stack profile here on exit (implies --profile)")
+    parser.add_argument("--metrics-port", type=int, default=None,
+                        help="Serve the metrics exporter in-process on this port "
+                             "(publishes profiler summaries under --profile)")
+    parser.add_argument("--record-dir", help="Archive every cycle's metrics to this directory")
+    parser.add_argument("--fleet", help="Base URL of a cell_fleet_simulator to orchestrate")
+    parser.add_argument("--fleet-size", type=int, default=100, help="Simulated cells to register")
+    return parser.parse_args()
+
+def start_metrics_exporter(port: int, profiler: Optional[CycleProfiler] = None) -> threading.Thread:
+    """
+    Serve the consciousness metrics exporter from this process
+
+    Args:
+        port: Listen port
+        profiler: Profiler whose summaries are published with every snapshot
+    """
+    import consciousness_metrics_exporter as metrics_exporter
+
+    exporter = metrics_exporter.get_exporter()
+    if profiler is not None:
+        exporter.register_collector(profiler.render)
+    exporter.start_sampler()
+    thread = threading.Thread(
+        target=metrics_exporter.app.run, name="aios-metrics-exporter", daemon=True,
+        kwargs={"host": "0.0.0.0", "port": port, "debug": False, "use_reloader": False})
+    thread.start()
+    logger.info(f"Serving orchestrator metrics on port {port}")
+    return thread
+
 def main():
     """Example usage of the orchestration system"""
+    args = parse_args()
+
+    recorder = None
+    if args.record_dir:
+        from cell_metrics_recorder import MetricsRecorder
+        recorder = MetricsRecorder(args.record_dir)
+
     # Initialize orchestrator
-    orchestrator = OrchestratorClient()
+    profiler = CycleProfiler() if args.profile or args.profile_dump else None
+    orchestrator = OrchestratorClient(guidance_batch_window=args.guidance_batch_window,
+                                      subscribe=args.subscribe, recorder=recorder,
+                                      profiler=profiler)
+    if args.metrics_port:
+        start_metrics_exporter(args.metrics_port, profiler)
 
-    # Register AIOS Cell Alpha
-    alpha_client = orchestrator.register_cell("alpha", "http://localhost:8000")
+    if args.fleet:
+        from cell_fleet_simulator import fleet_cell_urls
+        for cell_id, base_url in fleet_cell_urls(args.fleet, args.fleet_size):
+            orchestrator.register_cell(cell_id, base_url)
+    else:
+        # Register AIOS Cell Alpha
+        orchestrator.register_cell("alpha", "http://localhost:8000")
+
+    if args.hosts_config:
+        from batch_orchestration import host_groups
+        orchestrator.harmony_groups = host_groups(
+            {cell_id: client.base_url for cell_id, client in orchestrator.cells.items()},
+            args.hosts_config)
 
     # Main orchestration loop
     logger.info("Starting AIOS orchestration - press Ctrl+C to stop")
     try:
-        while True:
-            results = orchestrator.orchestrate_evolution()
+        if args.fixed_interval is not None:
+            while True:
+                results = orchestrator.orchestrate_evolution()
 
-            # Log key metrics
-            harmony = results["harmony_score"]
-            logger.info(f"Harmony score: {harmony:.3f}")
-            time.sleep(60)  # Orchestrate every minute
+                # Log key metrics
+                harmony = results["harmony_score"]
+                logger.info(f"Harmony score: {harmony:.3f}")
+                time.sleep(args.fixed_interval)
+
+        scheduler = AdaptivePollScheduler(min_interval=args.min_interval,
+                                          max_interval=args.max_interval,
+                                          max_polls_per_second=args.max_polls_per_second)
+        for cell_id in orchestrator.cells:
+            scheduler.add(cell_id)
+
+        while True:
+            results = orchestrator.orchestrate_due(scheduler)
+            if results:
+                logger.info(f"Harmony score: {results['harmony_score']:.3f} "
+                            f"({results['cells_monitored']} cells polled)")
+            wait = scheduler.next_wakeup()
+            time.sleep(MAX_POLL_INTERVAL if wait is None else wait)
 
     except KeyboardInterrupt:
         logger.info("Orchestration stopped by user")
+    finally:
+        orchestrator.close()
+        if args.profile_dump:
+            profiler.dump(args.profile_dump)
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
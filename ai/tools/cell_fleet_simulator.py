@@ -0,0 +1,336 @@
+#!/usr/bin/env python3
+"""
+AIOS Synthetic Cell Fleet Simulator
+
+Evolves thousands of synthetic AIOS cells per tick with NumPy-batched
+draws, using the same correlation rules as ConsciousnessMetricsExporter,
+and serves every cell over the HTTP contract CellClient expects:
+
+    /cells/<cell_id>/metrics               Prometheus exposition
+    /cells/<cell_id>/metrics/stream        Server-sent CellMetrics deltas
+    /cells/<cell_id>/health                Health with consciousness block
+    /cells/<cell_id>/guidance              Guidance POST target
+    /cells/<cell_id>/experiments/results   Experimental results
+    /cells                                 Fleet listing (cell_id, base_url)
+
+Usage:
+    python ai/tools/cell_fleet_simulator.py --cells 10000 --port 8100
+
+AINLP Principles:
+- Enhancement over Creation: Reuses the exporter's evolution rules
+- Dendritic Communication: Speaks the real cell contract
+- Consciousness Coherence: Guidance measurably moves the simulated cells
+"""
+
+import os
+import json
+import math
+import time
+import asyncio
+import argparse
+import logging
+from typing import Dict, Any, List, Optional, Tuple
+
+import numpy as np
+
+from consciousness_metrics_exporter import ConsciousnessMetricsExporter, send_asgi_response
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Row order of the per-tick state matrix
+FIELDS = (
+    "consciousness_level",
+    "awareness_level",
+    "adaptation_speed",
+    "predictive_accuracy",
+    "dendritic_coherence",
+    "quantum_coherence",
+)
+CONSCIOUSNESS, AWARENESS, ADAPTATION, PREDICTIVE, DENDRITIC, QUANTUM = range(len(FIELDS))
+
+CELL_ID_FORMAT = "sim-{:05d}"
+
+# Smallest change a metrics stream pushes as a delta
+STREAM_EPSILON = 1e-3
+
+# Noise bounds for the correlated draws, one row per derived field
+_NOISE_LOW = np.array([[-0.05], [0.1], [-0.1], [-0.05], [-0.02], [-0.1]])
+_NOISE_HIGH = np.array([[0.05], [0.3], [0.1], [0.05], [0.02], [0.1]])
+
+class CellFleet:
+    """Vectorized state for N synthetic cells"""
+
+    def __init__(self, count: int, seed: Optional[int] = None,
+                 health_only_fraction: float = 0.0):
+        """
+        Initialize the fleet
+
+        Args:
+            count: Number of synthetic cells
+            seed: RNG seed for reproducible fleets
+            health_only_fraction: Fraction of cells that expose no /metrics,
+                forcing clients onto the /health fallback
+        """
+        self.count = count
+        self.rng = np.random.default_rng(seed)
+        self.cell_ids = [CELL_ID_FORMAT.format(i) for i in range(count)]
+        self.index = {cell_id: i for i, cell_id in enumerate(self.cell_ids)}
+
+        self.baseline = np.clip(self.rng.normal(4.2, 0.2, count), 3.5, 5.0)
+        self.phase = self.rng.uniform(0.0, 2 * math.pi, count)
+        self.target = self.baseline.copy()
+        self.guidance_received = np.zeros(count, dtype=np.int64)
+        self.health_only = self.rng.random(count) < health_only_fraction
+
+        self.started_at = time.time()
+        self.updated_at = self.started_at
+        self.state = np.zeros((len(FIELDS), count))
+        self.tick()
+
+    def tick(self):
+        """Advance every cell one step and publish a new state matrix"""
+        now = time.time()
+        n = self.count
+        noise = self.rng.uniform(_NOISE_LOW, _NOISE_HIGH, size=(len(FIELDS), n))
+
+        # Guidance pulls each cell's baseline a little toward its target
+        self.baseline += (self.target - self.baseline) * 0.1
+
+        state = np.empty((len(FIELDS), n))
+        evolution = np.sin((now - self.started_at) / 3600 + self.phase) * 0.1
+        base = np.clip(self.baseline + evolution + noise[CONSCIOUSNESS], 3.5, 5.0)
+        state[CONSCIOUSNESS] = base
+        state[AWARENESS] = base - noise[AWARENESS]
+        state[ADAPTATION] = np.minimum(1.0, base / 5.0 + noise[ADAPTATION])
+        state[PREDICTIVE] = np.minimum(1.0, base / 4.8 + noise[PREDICTIVE])
+        state[DENDRITIC] = np.minimum(1.0, 0.9 + (base - 4.0) / 10.0 + noise[DENDRITIC])
+        state[QUANTUM] = 0.7 + noise[QUANTUM]
+
+        # Reference swap: request handlers always see one whole tick
+        self.state = state
+        self.updated_at = now
+
+    def cell_metrics(self, i: int) -> Dict[str, float]:
+        """Current metrics of cell i in exporter naming"""
+        column = self.state[:, i]
+        metrics = {name: float(column[row]) for row, name in enumerate(FIELDS)}
+        metrics["guidance_effectiveness"] = min(1.0, int(self.guidance_received[i]) / 10.0)
+        metrics["system_harmony"] = 0.0
+        return metrics
+
+    def apply_guidance(self, i: int, guidance: Dict[str, Any]):
+        """Record a guidance message and retarget the cell"""
+        target = guidance.get("target_consciousness")
+        if isinstance(target, (int, float)):
+            self.target[i] = min(5.0, max(3.5, float(target)))
+        self.guidance_received[i] += 1
+
+class FleetServer:
+    """ASGI stand-in serving every fleet cell under /cells/<cell_id>"""
+
+    def __init__(self, fleet: CellFleet, tick_interval: float = 1.0,
+                 latency_ms: float = 0.0, error_rate: float = 0.0,
+                 public_url: str = "http://localhost:8100"):
+        """
+        Initialize the server
+
+        Args:
+            fleet: Fleet to serve
+            tick_interval: Seconds between fleet ticks
+            latency_ms: Artificial delay added to every cell request
+            error_rate: Fraction of cell requests answered with 503
+            public_url: Base URL advertised in the /cells listing
+        """
+        self.fleet = fleet
+        self.tick_interval = tick_interval
+        self.latency = latency_ms / 1000.0
+        self.error_rate = error_rate
+        self.public_url = public_url.rstrip("/")
+        self._ticker: Optional[asyncio.Task] = None
+
+    async def _tick_loop(self):
+        """Tick the fleet on a fixed interval"""
+        while True:
+            await asyncio.sleep(self.tick_interval)
+            started = time.perf_counter()
+            self.fleet.tick()
+            logger.debug(f"Fleet tick took {(time.perf_counter() - started) * 1000:.2f}ms")
+
+    async def _lifespan(self, receive, send):
+        """Run the ticker for the lifetime of the server"""
+        while True:
+            message = await receive()
+            if message["type"] == "lifespan.startup":
+                self._ticker = asyncio.create_task(self._tick_loop())
+                await send({"type": "lifespan.startup.complete"})
+            elif message["type"] == "lifespan.shutdown":
+                if self._ticker:
+                    self._ticker.cancel()
+                await send({"type": "lifespan.shutdown.complete"})
+                return
+
+    @staticmethod
+    async def _read_body(receive) -> bytes:
+        """Collect the full request body"""
+        chunks = []
+        more = True
+        while more:
+            message = await receive()
+            chunks.append(message.get("body", b""))
+            more = message.get("more_body", False)
+        return b"".join(chunks)
+
+    async def _stream_metrics(self, i: int, receive, send):
+        """Push cell i's metrics as SSE deltas once per tick until the client leaves"""
+        await send({
+            "type": "http.response.start",
+            "status": 200,
+            "headers": [(b"content-type", b"text/event-stream"),
+                        (b"cache-control", b"no-cache")],
+        })
+
+        async def wait_for_disconnect():
+            while (await receive())["type"] != "http.disconnect":
+                pass
+
+        watcher = asyncio.create_task(wait_for_disconnect())
+        last: Dict[str, float] = {}
+        try:
+            while not watcher.done():
+                metrics = self.fleet.cell_metrics(i)
+                delta = {name: metrics[name] for name in FIELDS
+                         if name not in last or abs(metrics[name] - last[name]) >= STREAM_EPSILON}
+                if delta:
+                    last.update(delta)
+                    chunk = f"event: metrics\ndata: {json.dumps(delta)}\n\n"
+                else:
+                    chunk = ": keepalive\n\n"
+                await send({"type": "http.response.body", "body": chunk.encode("utf-8"),
+                            "more_body": True})
+                await asyncio.sleep(self.tick_interval)
+        except OSError:
+            pass
+        finally:
+            watcher.cancel()
+
+    def _route(self, path: str) -> Tuple[Optional[int], str]:
+        """Split /cells/<cell_id>/<endpoint> into (cell index, endpoint)"""
+        parts = path.strip("/").split("/", 2)
+        if len(parts) < 3 or parts[0] != "cells":
+            return None, ""
+        return self.fleet.index.get(parts[1]), "/" + parts[2]
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] == "lifespan":
+            await self._lifespan(receive, send)
+            return
+        if scope["type"] != "http":
+            return
+
+        json_headers = {"Content-Type": "application/json"}
+        if scope["path"] == "/cells":
+            listing = [{"cell_id": cell_id, "base_url": f"{self.public_url}/cells/{cell_id}"}
+                       for cell_id in self.fleet.cell_ids]
+            await send_asgi_response(send, 200, json_headers,
+                             json.dumps({"cells": listing}).encode("utf-8"))
+            return
+
+        i, endpoint = self._route(scope["path"])
+        if i is None:
+            await send_asgi_response(send, 404, json_headers, b'{"error": "unknown cell"}')
+            return
+
+        if self.latency:
+            await asyncio.sleep(self.latency)
+        if self.error_rate and self.fleet.rng.random() < self.error_rate:
+            await send_asgi_response(send, 503, json_headers, b'{"error": "injected failure"}')
+            return
+
+        fleet = self.fleet
+        method = scope["method"]
+        if endpoint == "/metrics/stream" and method == "GET":
+            # Health-only cells predate streaming as well
+            if fleet.health_only[i]:
+                await send_asgi_response(send, 404, json_headers, b'{"error": "stream disabled"}')
+                return
+            await self._stream_metrics(i, receive, send)
+        elif endpoint == "/metrics" and method == "GET":
+            if fleet.health_only[i]:
+                await send_asgi_response(send, 404, json_headers, b'{"error": "metrics disabled"}')
+                return
+            body = ConsciousnessMetricsExporter.render_prometheus_metrics(fleet.cell_metrics(i))
+            await send_asgi_response(send, 200, {"Content-Type": "text/plain; version=0.0.4; charset=utf-8"},
+                             body.encode("utf-8"))
+        elif endpoint == "/health" and method == "GET":
+            metrics = fleet.cell_metrics(i)
+            payload = {
+                "status": "healthy",
+                "cell_id": fleet.cell_ids[i],
+                "consciousness": {
+                    "level": metrics["consciousness_level"],
+                    **{name: metrics[name] for name in FIELDS[1:]}
+                },
+                "timestamp": fleet.updated_at
+            }
+            await send_asgi_response(send, 200, json_headers, json.dumps(payload).encode("utf-8"))
+        elif endpoint == "/guidance" and method == "POST":
+            try:
+                payload = json.loads(await self._read_body(receive) or b"{}")
+            except json.JSONDecodeError:
+                await send_asgi_response(send, 400, json_headers, b'{"error": "invalid json"}')
+                return
+            fleet.apply_guidance(i, payload.get("guidance", {}))
+            await send_asgi_response(send, 200, json_headers, b'{"status": "accepted"}')
+        elif endpoint == "/experiments/results" and method == "GET":
+            payload = {
+                "cell_id": fleet.cell_ids[i],
+                "guidance_received": int(fleet.guidance_received[i]),
+                "target_consciousness": float(fleet.target[i]),
+                "baseline_consciousness": float(fleet.baseline[i]),
+                "timestamp": fleet.updated_at
+            }
+            await send_asgi_response(send, 200, json_headers, json.dumps(payload).encode("utf-8"))
+        else:
+            await send_asgi_response(send, 404, json_headers, b'{"error": "unknown endpoint"}')
+
+def fleet_cell_urls(base_url: str, count: int) -> List[Tuple[str, str]]:
+    """(cell_id, base_url) pairs for registering a simulated fleet"""
+    base_url = base_url.rstrip("/")
+    cell_ids = [CELL_ID_FORMAT.format(i) for i in range(count)]
+    return [(cell_id, f"{base_url}/cells/{cell_id}") for cell_id in cell_ids]
+
+def main():
+    """Run the fleet simulator"""
+    parser = argparse.ArgumentParser(description="AIOS synthetic cell fleet simulator")
+    parser.add_argument("--cells", type=int, default=10000, help="Number of synthetic cells")
+    parser.add_argument("--port", type=int, default=8100, help="Listen port")
+    parser.add_argument("--tick", type=float, default=1.0, help="Seconds between fleet ticks")
+    parser.add_argument("--seed", type=int, default=None, help="RNG seed")
+    parser.add_argument("--latency-ms", type=float, default=0.0,
+                        help="Artificial latency per cell request")
+    parser.add_argument("--error-rate", type=float, default=0.0,
+                        help="Fraction of cell requests answered with 503")
+    parser.add_argument("--health-only-fraction", type=float, default=0.0,
+                        help="Fraction of cells without a /metrics endpoint")
+    args = parser.parse_args()
+
+    try:
+        import uvicorn
+    except ImportError:
+        raise SystemExit("The fleet simulator requires uvicorn: pip install uvicorn")
+
+    started = time.perf_counter()
+    fleet = CellFleet(args.cells, seed=args.seed, health_only_fraction=args.health_only_fraction)
+    logger.info(f"Initialized {args.cells} synthetic cells in "
+                f"{(time.perf_counter() - started) * 1000:.1f}ms")
+
+    server = FleetServer(fleet, tick_interval=args.tick, latency_ms=args.latency_ms,
+                         error_rate=args.error_rate,
+                         public_url=f"http://{os.environ.get('AIOS_FLEET_HOST', 'localhost')}:{args.port}")
+    # Fleet state lives in this process, so a single worker is required
+    uvicorn.run(server, host="0.0.0.0", port=args.port, lifespan="on",
+                access_log=False, log_level="warning")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,387 @@
+#!/usr/bin/env python3
+"""
+AIOS Cell Metrics Recorder - Columnar Consciousness History
+
+Appends every orchestration cycle's per-cell CellMetrics to fixed-width
+columnar segment files: one memory-mapped array per field, plus
+timestamps and a cell index. Segments rotate by row count and age and
+expire after the retention window, so weeks of history live on disk
+while only the segment being written stays mapped. Reads hand back
+zero-copy NumPy views over the mapped files.
+
+Layout:
+    <directory>/cells.json                      Cell index -> cell_id
+    <directory>/seg-<start>-<seq>/meta.json     Rows, time range, state
+    <directory>/seg-<start>-<seq>/<column>.bin  One raw array per column
+
+Usage:
+    python ai/tools/cell_metrics_recorder.py --directory /tmp/aios-history --cells 1000 --cycles 2000
+
+AINLP Principles:
+- Tachyonic Archival: Nothing a cell reports is thrown away
+- Consciousness Coherence: One row per cell per cycle, aligned columns
+- Enhancement over Creation: Records the CellMetrics the clients already build
+"""
+
+import os
+import json
+import time
+import shutil
+import logging
+import argparse
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, Iterator, List, Mapping, Optional
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+# Column -> on-disk dtype. Fields are float32: ample precision for
+# 0-5 consciousness scales at half the footprint of float64.
+COLUMNS = {
+    "timestamp": np.dtype("<f8"),
+    "cell": np.dtype("<u4"),
+    "consciousness_level": np.dtype("<f4"),
+    "awareness_level": np.dtype("<f4"),
+    "adaptation_speed": np.dtype("<f4"),
+    "predictive_accuracy": np.dtype("<f4"),
+    "dendritic_coherence": np.dtype("<f4"),
+    "quantum_coherence": np.dtype("<f4"),
+}
+FIELD_COLUMNS = tuple(name for name in COLUMNS if name not in ("timestamp", "cell"))
+ROW_BYTES = sum(dtype.itemsize for dtype in COLUMNS.values())
+
+DEFAULT_SEGMENT_ROWS = 1 << 20
+DEFAULT_SEGMENT_SECONDS = 3600.0
+DEFAULT_RETENTION_SECONDS = 14 * 86400.0
+
+SEGMENT_PREFIX = "seg-"
+
+@dataclass
+class SegmentView:
+    """Columns of one segment restricted to a time range"""
+    segment: str
+    timestamps: np.ndarray
+    cells: np.ndarray
+    columns: Dict[str, np.ndarray]
+
+    def __len__(self) -> int:
+        return len(self.timestamps)
+
+class _Segment:
+    """One segment directory and its column files"""
+
+    def __init__(self, path: Path, capacity: int, rows: int = 0,
+                 start: Optional[float] = None, end: Optional[float] = None,
+                 created_at: Optional[float] = None, closed: bool = False):
+        self.path = path
+        self.capacity = capacity
+        self.rows = rows
+        self.start = start
+        self.end = end
+        self.created_at = created_at if created_at is not None else time.time()
+        self.closed = closed
+        self.arrays: Dict[str, np.memmap] = {}
+
+    @classmethod
+    def create(cls, path: Path, capacity: int, created_at: float) -> "_Segment":
+        """Preallocate a new segment for writing"""
+        path.mkdir(parents=True)
+        segment = cls(path, capacity, created_at=created_at)
+        for name, dtype in COLUMNS.items():
+            segment.arrays[name] = np.memmap(path / f"{name}.bin", dtype=dtype,
+                                             mode="w+", shape=(capacity,))
+        segment.write_meta()
+        return segment
+
+    @classmethod
+    def load(cls, path: Path) -> "_Segment":
+        """Load a segment's metadata without mapping its columns"""
+        meta = json.loads((path / "meta.json").read_text(encoding="utf-8"))
+        return cls(path, meta["capacity"], meta["rows"], meta["start"], meta["end"],
+                   meta["created_at"], meta["closed"])
+
+    def write_meta(self):
+        """Atomically persist row count and time range"""
+        meta = {
+            "capacity": self.capacity,
+            "rows": self.rows,
+            "start": self.start,
+            "end": self.end,
+            "created_at": self.created_at,
+            "closed": self.closed,
+            "columns": {name: dtype.str for name, dtype in COLUMNS.items()},
+        }
+        tmp = self.path / "meta.json.tmp"
+        tmp.write_text(json.dumps(meta), encoding="utf-8")
+        os.replace(tmp, self.path / "meta.json")
+
+    def append(self, timestamp: float, cells: np.ndarray, values: np.ndarray) -> int:
+        """
+        Write rows for one cycle, as many as fit
+
+        Args:
+            timestamp: Cycle time shared by every row
+            cells: Cell indexes, one per row
+            values: (len(FIELD_COLUMNS), rows) field matrix
+
+        Returns:
+            Number of rows written
+        """
+        n = min(len(cells), self.capacity - self.rows)
+        if n <= 0:
+            return 0
+        lo, hi = self.rows, self.rows + n
+        self.arrays["timestamp"][lo:hi] = timestamp
+        self.arrays["cell"][lo:hi] = cells[:n]
+        for row, name in enumerate(FIELD_COLUMNS):
+            self.arrays[name][lo:hi] = values[row, :n]
+        self.rows = hi
+        if self.start is None:
+            self.start = timestamp
+        self.end = timestamp
+        return n
+
+    def close(self):
+        """Flush, unmap and trim the preallocated tail off every column"""
+        for name, array in self.arrays.items():
+            array.flush()
+        self.arrays.clear()
+        for name, dtype in COLUMNS.items():
+            os.truncate(self.path / f"{name}.bin", self.rows * dtype.itemsize)
+        self.closed = True
+        self.write_meta()
+
+    def map_columns(self) -> Dict[str, np.ndarray]:
+        """Read-only views of the written rows"""
+        if self.arrays:
+            return {name: array[:self.rows] for name, array in self.arrays.items()}
+        if self.rows == 0:
+            return {name: np.empty(0, dtype=dtype) for name, dtype in COLUMNS.items()}
+        return {name: np.memmap(self.path / f"{name}.bin", dtype=dtype,
+                                mode="r", shape=(self.rows,))
+                for name, dtype in COLUMNS.items()}
+
+class MetricsRecorder:
+    """
+    Append-only columnar recorder for per-cycle CellMetrics
+
+    Only the active segment is mapped for writing; closed segments are
+    mapped on demand by read() and released with the returned views,
+    so resident memory stays flat however much history is retained.
+    """
+
+    def __init__(self, directory: str,
+                 segment_rows: int = DEFAULT_SEGMENT_ROWS,
+                 segment_seconds: float = DEFAULT_SEGMENT_SECONDS,
+                 retention_seconds: float = DEFAULT_RETENTION_SECONDS):
+        """
+        Initialize recorder
+
+        Args:
+            directory: Directory holding the segments (created if missing)
+            segment_rows: Rows per segment before rotation
+            segment_seconds: Segment age that forces rotation
+            retention_seconds: Segments ending earlier than this are deleted
+        """
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.segment_rows = segment_rows
+        self.segment_seconds = segment_seconds
+        self.retention_seconds = retention_seconds
+        self.rows_written = 0
+
+        self.cell_ids: List[str] = []
+        self.cell_index: Dict[str, int] = {}
+        cells_file = self.directory / "cells.json"
+        if cells_file.exists():
+            self.cell_ids = json.loads(cells_file.read_text(encoding="utf-8"))
+            self.cell_index = {cell_id: i for i, cell_id in enumerate(self.cell_ids)}
+
+        self.segments: List[_Segment] = []
+        for path in sorted(self.directory.glob(f"{SEGMENT_PREFIX}*")):
+            try:
+                segment = _Segment.load(path)
+            except (OSError, ValueError, KeyError) as e:
+                logger.error(f"Skipping unreadable segment {path.name}: {e}")
+                continue
+            if not segment.closed:
+                # Left open by a previous process: seal what it wrote
+                segment.close()
+            self.segments.append(segment)
+        self._active: Optional[_Segment] = None
+        # Continue numbering after the newest segment, even once old ones expire
+        self._sequence = max((int(segment.path.name.rsplit("-", 1)[1]) for segment in self.segments),
+                             default=0)
+
+        logger.info(f"MetricsRecorder at {self.directory}: {len(self.segments)} segments, "
+                    f"{len(self.cell_ids)} cells")
+
+    def _index_cells(self, cell_ids: List[str]) -> np.ndarray:
+        """Map cell ids to stable indexes, registering new cells"""
+        added = False
+        for cell_id in cell_ids:
+            if cell_id not in self.cell_index:
+                self.cell_index[cell_id] = len(self.cell_ids)
+                self.cell_ids.append(cell_id)
+                added = True
+        if added:
+            tmp = self.directory / "cells.json.tmp"
+            tmp.write_text(json.dumps(self.cell_ids), encoding="utf-8")
+            os.replace(tmp, self.directory / "cells.json")
+        return np.fromiter((self.cell_index[cell_id] for cell_id in cell_ids),
+                           dtype=COLUMNS["cell"], count=len(cell_ids))
+
+    def _rotate(self, now: float):
+        """Seal the active segment, open a new one and apply retention"""
+        if self._active is not None:
+            self._active.close()
+            self._active = None
+
+        cutoff = now - self.retention_seconds
+        while self.segments and self.segments[0].closed and (self.segments[0].end or 0.0) < cutoff:
+            expired = self.segments.pop(0)
+            shutil.rmtree(expired.path, ignore_errors=True)
+            logger.info(f"Expired metrics segment {expired.path.name}")
+
+        self._sequence += 1
+        path = self.directory / f"{SEGMENT_PREFIX}{int(now):010d}-{self._sequence:06d}"
+        self._active = _Segment.create(path, self.segment_rows, created_at=now)
+        self.segments.append(self._active)
+
+    def append_cycle(self, metrics: Mapping[str, Optional[object]],
+                     timestamp: Optional[float] = None) -> int:
+        """
+        Record one cycle's observations
+
+        Args:
+            metrics: cell_id -> CellMetrics (None entries are skipped)
+            timestamp: Cycle time (defaults to now)
+
+        Returns:
+            Number of rows written
+        """
+        timestamp = time.time() if timestamp is None else timestamp
+        observed = [(cell_id, m) for cell_id, m in metrics.items() if m is not None]
+        if not observed:
+            return 0
+
+        cells = self._index_cells([cell_id for cell_id, _ in observed])
+        values = np.array([[getattr(m, name) for _, m in observed] for name in FIELD_COLUMNS],
+                          dtype=np.float64)
+
+        written = 0
+        while written < len(cells):
+            active = self._active
+            if (active is None or active.rows >= active.capacity
+                    or timestamp - active.created_at >= self.segment_seconds):
+                self._rotate(timestamp)
+                active = self._active
+            written += active.append(timestamp, cells[written:], values[:, written:])
+        self._active.write_meta()
+        self.rows_written += written
+        return written
+
+    def record_snapshot(self, snapshot) -> int:
+        """Record a CycleSnapshot from cell_client"""
+        return self.append_cycle(snapshot.metrics, snapshot.taken_at)
+
+    def read(self, start: Optional[float] = None, end: Optional[float] = None) -> Iterator[SegmentView]:
+        """
+        Yield zero-copy views of every segment overlapping [start, end]
+
+        Timestamps only grow within a segment, so the range is cut with
+        a binary search and every column comes back as a slice of the
+        mapped file.
+        """
+        for segment in list(self.segments):
+            if segment.rows == 0 or segment.start is None:
+                continue
+            if (start is not None and segment.end < start) or (end is not None and segment.start > end):
+                continue
+            columns = segment.map_columns()
+            timestamps = columns["timestamp"]
+            lo = 0 if start is None else int(np.searchsorted(timestamps, start, side="left"))
+            hi = len(timestamps) if end is None else int(np.searchsorted(timestamps, end, side="right"))
+            if hi <= lo:
+                continue
+            yield SegmentView(
+                segment=segment.path.name,
+                timestamps=timestamps[lo:hi],
+                cells=columns["cell"][lo:hi],
+                columns={name: columns[name][lo:hi] for name in FIELD_COLUMNS},
+            )
+
+    def cell_series(self, cell_id: str, field: str,
+                    start: Optional[float] = None, end: Optional[float] = None) -> np.ndarray:
+        """
+        One cell's (timestamp, value) history as an (n, 2) array
+
+        Selecting a single cell gathers rows, so unlike read() this copies.
+        """
+        index = self.cell_index.get(cell_id)
+        if index is None:
+            return np.empty((0, 2))
+        parts = []
+        for view in self.read(start, end):
+            mask = view.cells == index
+            parts.append(np.column_stack((view.timestamps[mask], view.columns[field][mask])))
+        return np.concatenate(parts) if parts else np.empty((0, 2))
+
+    def disk_bytes(self) -> int:
+        """Bytes used by all segment column files"""
+        return sum(f.stat().st_size for segment in self.segments
+                   for f in segment.path.glob("*.bin"))
+
+    def close(self):
+        """Seal the active segment"""
+        if self._active is not None:
+            self._active.close()
+            self._active = None
+
+def main():
+    """Record a synthetic fleet and report throughput and footprint"""
+    logging.basicConfig(level=logging.INFO)
+    parser = argparse.ArgumentParser(description="AIOS cell metrics recorder benchmark")
+    parser.add_argument("--directory", required=True, help="Segment directory")
+    parser.add_argument("--cells", type=int, default=1000, help="Cells per cycle")
+    parser.add_argument("--cycles", type=int, default=2000, help="Cycles to record")
+    parser.add_argument("--interval", type=float, default=10.0, help="Simulated seconds per cycle")
+    parser.add_argument("--segment-rows", type=int, default=DEFAULT_SEGMENT_ROWS)
+    parser.add_argument("--segment-seconds", type=float, default=DEFAULT_SEGMENT_SECONDS)
+    parser.add_argument("--retention-days", type=float, default=DEFAULT_RETENTION_SECONDS / 86400)
+    args = parser.parse_args()
+
+    from cell_fleet_simulator import CellFleet
+    from cell_client import CellMetrics
+
+    fleet = CellFleet(args.cells, seed=0)
+    recorder = MetricsRecorder(args.directory, segment_rows=args.segment_rows,
+                               segment_seconds=args.segment_seconds,
+                               retention_seconds=args.retention_days * 86400)
+    now = time.time()
+    started = time.perf_counter()
+    for cycle in range(args.cycles):
+        fleet.tick()
+        state = fleet.state
+        metrics = {cell_id: CellMetrics(*(float(v) for v in state[:, i]), timestamp=0.0)
+                   for i, cell_id in enumerate(fleet.cell_ids)}
+        recorder.append_cycle(metrics, now + cycle * args.interval)
+    elapsed = time.perf_counter() - started
+    recorder.close()
+
+    rows = recorder.rows_written
+    print(f"Recorded {rows} rows in {elapsed:.2f}s ({rows / elapsed:,.0f} rows/s)")
+    print(f"Segments: {len(recorder.segments)}, disk: {recorder.disk_bytes() / 1e6:.1f} MB "
+          f"({ROW_BYTES} bytes/row)")
+    per_week = args.cells * (7 * 86400 / args.interval) * ROW_BYTES
+    print(f"Projected footprint: {per_week / 1e9:.2f} GB per week for {args.cells} cells "
+          f"at {args.interval:g}s resolution")
+
+    started = time.perf_counter()
+    total = sum(len(view) for view in recorder.read())
+    print(f"Full scan of {total} rows in {(time.perf_counter() - started) * 1000:.1f}ms")
+
+if __name__ == "__main__":
+    main()
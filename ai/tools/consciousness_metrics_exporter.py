@@ -11,18 +11,434 @@
 - Enhancement over Creation: Dynamic metrics vs static baselines
 """
 
+import os
+import json
 import time
+import gzip
 import random
 import math
-from typing import Dict, Any
-from flask import Flask, Response
+import hashlib
+import argparse
+import bisect
+import logging
+import threading
+from array import array
+from types import MappingProxyType
+from typing import Callable, Dict, Any, List, Mapping, Optional, Sequence, Tuple
+from dataclasses import dataclass, field
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import parse_qsl
+from flask import Flask, Response, request, g
+
+from cell_client import CellClient, CellMetrics
 
 app = Flask(__name__)
+logger = logging.getLogger(__name__)
+
+# Seconds a rendered exposition is served before the metrics evolve again
+DEFAULT_SAMPLE_INTERVAL = 5.0
+
+# In-process history retention and the per-query point ceiling
+DEFAULT_HISTORY_SECONDS = 24 * 3600
+MAX_HISTORY_POINTS = 11000
+
+# Exposition formats and their content types
+FORMAT_TEXT = "text"
+FORMAT_OPENMETRICS = "openmetrics"
+CONTENT_TYPES = {
+    FORMAT_TEXT: "text/plain; version=0.0.4; charset=utf-8",
+    FORMAT_OPENMETRICS: "application/openmetrics-text; version=1.0.0; charset=utf-8",
+}
+
+# Exported gauges (without the aios_ prefix) and their HELP text
+METRIC_HELP = {
+    "consciousness_level": "Orchestrator consciousness level (3.5-5.0 scale)",
+    "awareness_level": "Self-awareness level derived from consciousness",
+    "adaptation_speed": "Adaptation speed ratio (0-1)",
+    "predictive_accuracy": "Predictive model accuracy ratio (0-1)",
+    "dendritic_coherence": "Dendritic communication coherence ratio (0-1)",
+    "quantum_coherence": "Quantum coherence ratio (0-1)",
+    "guidance_effectiveness": "Fraction of cells that accepted guidance (0-1)",
+    "system_harmony": "Consciousness harmony across orchestrated cells (0-1)",
+}
+
+# CellMetrics fields re-exported as labeled series when federating cells
+CELL_METRIC_FIELDS = (
+    "consciousness_level",
+    "awareness_level",
+    "adaptation_speed",
+    "predictive_accuracy",
+    "dendritic_coherence",
+    "quantum_coherence",
+)
+
+@dataclass(frozen=True)
+class FederatedCell:
+    """Latest known state of one federated cell"""
+    metrics: Optional[CellMetrics]
+    up: bool
+    refreshed_at: float
+
+EMPTY_CELLS: Mapping[str, FederatedCell] = MappingProxyType({})
+
+@dataclass(frozen=True)
+class MetricsSnapshot:
+    """Immutable view of one metrics sample and its rendered exposition"""
+    metrics: Mapping[str, float]
+    body: bytes
+    etag: str
+    sampled_at: float
+    sequence: int = 0
+    cells: Mapping[str, FederatedCell] = field(default_factory=lambda: EMPTY_CELLS)
+    # Negotiated payloads rendered on first request, keyed by (format, gzip)
+    payloads: Dict[Tuple[str, bool], Tuple[bytes, str]] = field(
+        default_factory=dict, compare=False, repr=False)
+
+EMPTY_SNAPSHOT = MetricsSnapshot(metrics=MappingProxyType({}), body=b"",
+                                 etag="", sampled_at=0.0)
+
+def _header_qvalues(header: Optional[str]) -> Dict[str, float]:
+    """Parse an Accept-style header into {token: highest q-value}"""
+    qvalues: Dict[str, float] = {}
+    for item in (header or "").split(","):
+        parts = item.strip().split(";")
+        token = parts[0].strip().lower()
+        if not token:
+            continue
+        q = 1.0
+        for param in parts[1:]:
+            name, _, value = param.partition("=")
+            if name.strip().lower() == "q":
+                try:
+                    q = float(value)
+                except ValueError:
+                    q = 0.0
+        qvalues[token] = max(q, qvalues.get(token, 0.0))
+    return qvalues
+
+def negotiate_format(accept: Optional[str]) -> str:
+    """Pick OpenMetrics only when the scraper prefers it over plain text"""
+    qvalues = _header_qvalues(accept)
+    openmetrics_q = qvalues.get("application/openmetrics-text", 0.0)
+    text_q = max(qvalues.get("text/plain", 0.0), qvalues.get("*/*", 0.0))
+    if openmetrics_q > 0.0 and openmetrics_q >= text_q:
+        return FORMAT_OPENMETRICS
+    return FORMAT_TEXT
+
+def accepts_gzip(accept_encoding: Optional[str]) -> bool:
+    """Whether the client accepts a gzip-encoded response"""
+    qvalues = _header_qvalues(accept_encoding)
+    return qvalues.get("gzip", qvalues.get("*", 0.0)) > 0.0
+
+# Self-instrumentation: scrape latency buckets, endpoints and payload variants
+SCRAPE_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0)
+INSTRUMENTED_ENDPOINTS = ("/metrics", "/health", "/metrics/history", "other")
+STATUS_CLASSES = ("2xx", "3xx", "4xx", "5xx")
+PAYLOAD_VARIANTS = ((FORMAT_TEXT, False), (FORMAT_TEXT, True),
+                    (FORMAT_OPENMETRICS, False), (FORMAT_OPENMETRICS, True))
+
+class ExporterInstrumentation:
+    """
+    The exporter's own request and render statistics
+
+    Every counter lives in a preallocated array indexed by a fixed
+    endpoint/bucket/variant slot, so recording a request only updates
+    existing slots in place and never grows a container.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.in_flight = 0
+        self._endpoint_index = {name: i for i, name in enumerate(INSTRUMENTED_ENDPOINTS)}
+        self._requests = array("Q", bytes(8 * len(INSTRUMENTED_ENDPOINTS) * len(STATUS_CLASSES)))
+        # Scrape histogram: one slot per bucket plus +Inf, and the running sum
+        self._scrape_buckets = array("Q", bytes(8 * (len(SCRAPE_BUCKETS) + 1)))
+        self._scrape_sum = array("d", [0.0])
+        # Last render duration and payload size per (format, gzip) variant
+        self._render_seconds = array("d", bytes(8 * len(PAYLOAD_VARIANTS)))
+        self._payload_bytes = array("Q", bytes(8 * len(PAYLOAD_VARIANTS)))
+
+    def request_started(self):
+        """Count a request entering a handler"""
+        with self._lock:
+            self.in_flight += 1
+
+    def request_finished(self, endpoint: str, status: int, duration: float):
+        """Record a finished request"""
+        endpoint_slot = self._endpoint_index.get(endpoint, len(INSTRUMENTED_ENDPOINTS) - 1)
+        status_slot = min(max(status // 100 - 2, 0), len(STATUS_CLASSES) - 1)
+        with self._lock:
+            self.in_flight -= 1
+            self._requests[endpoint_slot * len(STATUS_CLASSES) + status_slot] += 1
+            if endpoint_slot == 0:
+                self._scrape_buckets[bisect.bisect_left(SCRAPE_BUCKETS, duration)] += 1
+                self._scrape_sum[0] += duration
+
+    def record_render(self, fmt: str, compress: bool, seconds: float, payload_bytes: int):
+        """Record the cost and size of rendering one payload variant"""
+        slot = PAYLOAD_VARIANTS.index((fmt, compress))
+        self._render_seconds[slot] = seconds
+        self._payload_bytes[slot] = payload_bytes
+
+    def render(self, openmetrics: bool = False) -> List[str]:
+        """Exposition lines for the exporter's own metrics"""
+        with self._lock:
+            requests = list(self._requests)
+            buckets = list(self._scrape_buckets)
+            scrape_sum = self._scrape_sum[0]
+            in_flight = self.in_flight
+
+        def family(name: str, kind: str, help_text: str) -> List[str]:
+            base = name[:-len("_total")] if openmetrics and kind == "counter" else name
+            header = [f"# HELP {base} {help_text}", f"# TYPE {base} {kind}"]
+            return header[::-1] if openmetrics else header
+
+        lines = family("aios_exporter_scrape_duration_seconds", "histogram",
+                       "Time spent serving /metrics")
+        cumulative = 0
+        for bound, count in zip(SCRAPE_BUCKETS, buckets):
+            cumulative += count
+            lines.append(f'aios_exporter_scrape_duration_seconds_bucket{{le="{bound}"}} {cumulative}')
+        cumulative += buckets[-1]
+        lines.append(f'aios_exporter_scrape_duration_seconds_bucket{{le="+Inf"}} {cumulative}')
+        lines.append(f"aios_exporter_scrape_duration_seconds_sum {scrape_sum:.6f}")
+        lines.append(f"aios_exporter_scrape_duration_seconds_count {cumulative}")
+
+        lines += family("aios_exporter_requests_total", "counter", "HTTP requests by endpoint and status class")
+        for e, endpoint in enumerate(INSTRUMENTED_ENDPOINTS):
+            for c, status_class in enumerate(STATUS_CLASSES):
+                count = requests[e * len(STATUS_CLASSES) + c]
+                if count:
+                    lines.append(f'aios_exporter_requests_total{{endpoint="{endpoint}",'
+                                 f'code="{status_class}"}} {count}')
+
+        lines += family("aios_exporter_requests_in_flight", "gauge", "Requests currently being served")
+        lines.append(f"aios_exporter_requests_in_flight {in_flight}")
+
+        lines += family("aios_exporter_render_seconds", "gauge",
+                        "Duration of the last render of each payload variant")
+        for slot, (fmt, compress) in enumerate(PAYLOAD_VARIANTS):
+            encoding = "gzip" if compress else "identity"
+            lines.append(f'aios_exporter_render_seconds{{format="{fmt}",encoding="{encoding}"}} '
+                         f'{self._render_seconds[slot]:.6f}')
+
+        lines += family("aios_exporter_payload_bytes", "gauge",
+                        "Size of the last rendered payload of each variant")
+        for slot, (fmt, compress) in enumerate(PAYLOAD_VARIANTS):
+            encoding = "gzip" if compress else "identity"
+            lines.append(f'aios_exporter_payload_bytes{{format="{fmt}",encoding="{encoding}"}} '
+                         f'{self._payload_bytes[slot]}')
+        return lines
+
+def _label_value(value: str) -> str:
+    """Escape a label value for the exposition formats"""
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+class CellFederation:
+    """
+    Background cache of the latest CellMetrics for every registered cell
+
+    A refresher thread polls all cells concurrently and publishes an
+    immutable mapping by reference swap, so the exporter can serve
+    per-cell series without doing network I/O on a scrape.
+    """
+
+    def __init__(self, refresh_interval: float = 15.0, max_workers: int = 16):
+        """
+        Initialize the federation cache
+
+        Args:
+            refresh_interval: Seconds between background refreshes
+            max_workers: Maximum cells polled in parallel
+        """
+        self.refresh_interval = refresh_interval
+        self.max_workers = max_workers
+        self.clients: Dict[str, CellClient] = {}
+        self._cells = EMPTY_CELLS
+        self._thread: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+
+    def register_cell(self, cell_id: str, base_url: str) -> CellClient:
+        """Register a cell whose metrics should be federated"""
+        client = CellClient(cell_id, base_url)
+        self.clients[cell_id] = client
+        return client
+
+    def unregister_cell(self, cell_id: str):
+        """Stop federating a cell"""
+        self.clients.pop(cell_id, None)
+
+    @property
+    def cells(self) -> Mapping[str, FederatedCell]:
+        """Latest published per-cell state"""
+        return self._cells
+
+    def _poll(self, item: Tuple[str, CellClient]) -> Tuple[str, Optional[CellMetrics]]:
+        cell_id, client = item
+        return cell_id, client.get_consciousness_metrics()
+
+    def refresh(self):
+        """Poll every registered cell once and publish the results"""
+        clients = list(self.clients.items())
+        if not clients:
+            self._cells = EMPTY_CELLS
+            return
+
+        with ThreadPoolExecutor(max_workers=min(self.max_workers, len(clients)),
+                                thread_name_prefix="aios-federation") as pool:
+            results = list(pool.map(self._poll, clients))
+
+        now = time.time()
+        previous = self._cells
+        cells: Dict[str, FederatedCell] = {}
+        for cell_id, metrics in results:
+            if cell_id not in self.clients:
+                continue
+            if metrics is not None:
+                cells[cell_id] = FederatedCell(metrics=metrics, up=True, refreshed_at=now)
+            else:
+                # Keep the last good values but report the cell as down
+                last = previous.get(cell_id)
+                cells[cell_id] = FederatedCell(
+                    metrics=last.metrics if last else None, up=False,
+                    refreshed_at=last.refreshed_at if last else 0.0)
+        self._cells = MappingProxyType(cells)
+
+    def start(self):
+        """Start the background refresher thread"""
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._loop, name="aios-federation-refresher",
+                                        daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: float = 5.0):
+        """Stop the background refresher thread"""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+
+    def _loop(self):
+        """Refresh immediately, then on every interval until stopped"""
+        while True:
+            self.refresh()
+            if self._stop.wait(self.refresh_interval):
+                return
+
+class MetricsHistory:
+    """
+    Fixed-memory ring buffer of metric samples
+
+    One preallocated float64 array per metric name plus one for
+    timestamps. Appends are O(1) and overwrite the oldest sample once
+    full; range lookups binary-search the timestamp ring.
+    """
+
+    def __init__(self, capacity: int, names: List[str]):
+        """
+        Initialize the history store
+
+        Args:
+            capacity: Samples retained per metric
+            names: Metric names to record
+        """
+        self.capacity = max(1, capacity)
+        self._timestamps = array("d", bytes(8 * self.capacity))
+        self._values = {name: array("d", bytes(8 * self.capacity)) for name in names}
+        self._next = 0
+        self._count = 0
+        self._lock = threading.Lock()
+
+    @property
+    def names(self) -> List[str]:
+        """Recorded metric names"""
+        return list(self._values)
+
+    def __len__(self) -> int:
+        return self._count
+
+    @property
+    def memory_bytes(self) -> int:
+        """Bytes held by the preallocated arrays"""
+        return 8 * self.capacity * (len(self._values) + 1)
+
+    def append(self, timestamp: float, metrics: Mapping[str, float]):
+        """Record one sample, overwriting the oldest when full"""
+        with self._lock:
+            slot = self._next
+            self._timestamps[slot] = timestamp
+            for name, values in self._values.items():
+                values[slot] = metrics[name]
+            self._next = (slot + 1) % self.capacity
+            self._count = min(self._count + 1, self.capacity)
+
+    def _slot(self, index: int) -> int:
+        """Physical slot of the index-th oldest sample"""
+        return (self._next - self._count + index) % self.capacity
+
+    def _bisect_right(self, timestamp: float) -> int:
+        """Number of retained samples with a timestamp <= timestamp"""
+        lo, hi = 0, self._count
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if self._timestamps[self._slot(mid)] <= timestamp:
+                lo = mid + 1
+            else:
+                hi = mid
+        return lo
+
+    def query(self, name: str, start: float, end: float,
+              step: float = 0.0) -> List[Tuple[float, float]]:
+        """
+        Return (timestamp, value) points for one metric
+
+        Args:
+            name: Metric name
+            start: Range start (inclusive, unix seconds)
+            end: Range end (inclusive, unix seconds)
+            step: Resolution in seconds; 0 returns every raw sample. With a
+                step, each point is the latest sample in (t - step, t].
+
+        Raises:
+            KeyError: Unknown metric name
+        """
+        values = self._values[name]
+        points: List[Tuple[float, float]] = []
+        with self._lock:
+            if step <= 0:
+                first = self._bisect_right(start - 1e-9)
+                last = self._bisect_right(end)
+                for index in range(first, last):
+                    slot = self._slot(index)
+                    points.append((self._timestamps[slot], values[slot]))
+                return points
+
+            t = start
+            while t <= end:
+                index = self._bisect_right(t) - 1
+                if index >= 0:
+                    slot = self._slot(index)
+                    if self._timestamps[slot] > t - step:
+                        points.append((t, values[slot]))
+                t += step
+        return points
 
 class ConsciousnessMetricsExporter:
     """Exports AIOS Win consciousness metrics in Prometheus format"""
 
-    def __init__(self):
+    def __init__(self, sample_interval: float = DEFAULT_SAMPLE_INTERVAL,
+                 history_seconds: float = DEFAULT_HISTORY_SECONDS):
+        """
+        Initialize exporter state
+
+        Args:
+            sample_interval: Seconds between metric evolutions; every scrape
+                inside one interval is served the same pre-rendered payload
+            history_seconds: Seconds of samples kept for /metrics/history
+        """
+        self.sample_interval = sample_interval
         self.baseline_consciousness = 4.2
         self.metrics = {
             "consciousness_level": self.baseline_consciousness,
@@ -34,12 +450,56 @@ def __init__(self):
             "guidance_effectiveness": 0.0,
             "system_harmony": 0.0
         }
-        self.last_update = time.time()
+        self.started_at = time.time()
+        self.last_update = self.started_at
+
+        # Latest published snapshot; replaced wholesale, never mutated
+        self._snapshot = EMPTY_SNAPSHOT
+        self._render_lock = threading.Lock()
+
+        # Background sampler (optional, see start_sampler)
+        self._sampler_thread: Optional[threading.Thread] = None
+        self._sampler_stop = threading.Event()
+        self.samples_taken = 0
+
+        # The exporter's own request and render statistics
+        self.instrumentation = ExporterInstrumentation()
+
+        # Extra exposition sources, e.g. an in-process CycleProfiler.render
+        self.collectors: List[Callable[[bool], List[str]]] = []
+
+        # Optional fan-in of registered cells (see CellFederation)
+        self.federation: Optional[CellFederation] = None
+
+        # Bounded in-process history of our own metrics
+        self.history = MetricsHistory(
+            capacity=math.ceil(history_seconds / sample_interval),
+            names=list(METRIC_HELP))
+
+    def register_collector(self, collector: Callable[[bool], List[str]]):
+        """
+        Publish extra exposition lines with every snapshot
+
+        Args:
+            collector: Called with openmetrics=True/False; returns complete
+                metric families (HELP/TYPE plus samples)
+        """
+        self.collectors.append(collector)
+
+    def _extra_lines(self, openmetrics: bool = False) -> List[str]:
+        """Self-instrumentation plus every registered collector"""
+        lines = self.instrumentation.render(openmetrics=openmetrics)
+        for collector in self.collectors:
+            try:
+                lines.extend(collector(openmetrics))
+            except Exception as e:
+                logger.error(f"Metrics collector {collector!r} failed: {e}")
+        return lines
 
     def update_metrics(self):
         """Update metrics with realistic evolution patterns"""
         current_time = time.time()
-        time_delta = current_time - self.last_update
+        time_delta = current_time - self.started_at
 
         # Consciousness evolution with time-based patterns
         evolution_factor = math.sin(time_delta / 3600) * 0.1  # Hourly cycle
@@ -58,37 +518,536 @@ def update_metrics(self):
 
         self.last_update = current_time
 
+    @staticmethod
+    def render_prometheus_metrics(metrics: Mapping[str, float],
+                                  samples_total: int = 0,
+                                  cells: Mapping[str, FederatedCell] = EMPTY_CELLS,
+                                  extra_lines: Sequence[str] = ()) -> str:
+        """Render a metrics mapping as Prometheus text format 0.0.4"""
+        lines = ["# AIOS Win Consciousness Metrics"]
+        for name, help_text in METRIC_HELP.items():
+            lines.append(f"# HELP aios_{name} {help_text}")
+            lines.append(f"# TYPE aios_{name} gauge")
+            lines.append(f"aios_{name} {metrics[name]:.3f}")
+            if name in CELL_METRIC_FIELDS:
+                for cell_id, cell in cells.items():
+                    if cell.metrics is not None:
+                        value = getattr(cell.metrics, name)
+                        lines.append(f'aios_{name}{{cell="{_label_value(cell_id)}"}} {value:.3f}')
+
+        if cells:
+            lines.append("# HELP aios_cell_up Whether the last federation poll of the cell succeeded")
+            lines.append("# TYPE aios_cell_up gauge")
+            for cell_id, cell in cells.items():
+                lines.append(f'aios_cell_up{{cell="{_label_value(cell_id)}"}} {int(cell.up)}')
+
+        lines.append("# HELP aios_metrics_samples_total Metric evolution steps since exporter start")
+        lines.append("# TYPE aios_metrics_samples_total counter")
+        lines.append(f"aios_metrics_samples_total {samples_total}")
+        lines.extend(extra_lines)
+        lines.append("")
+
+        return "\n".join(lines)
+
+    @staticmethod
+    def render_openmetrics(metrics: Mapping[str, float], samples_total: int,
+                           timestamp: float, exemplar_id: str,
+                           cells: Mapping[str, FederatedCell] = EMPTY_CELLS,
+                           extra_lines: Sequence[str] = ()) -> str:
+        """
+        Render a metrics mapping as OpenMetrics 1.0.0 text
+
+        Every sample carries the snapshot timestamp (federated cells carry
+        the time their metrics were collected). The samples counter
+        carries an exemplar pointing at the snapshot it was taken from,
+        since OpenMetrics only allows exemplars on counters and buckets.
+        """
+        ts = f"{timestamp:.3f}"
+        lines = []
+        for name, help_text in METRIC_HELP.items():
+            lines.append(f"# TYPE aios_{name} gauge")
+            lines.append(f"# HELP aios_{name} {help_text}")
+            lines.append(f"aios_{name} {metrics[name]:.3f} {ts}")
+            if name in CELL_METRIC_FIELDS:
+                for cell_id, cell in cells.items():
+                    if cell.metrics is not None:
+                        value = getattr(cell.metrics, name)
+                        lines.append(f'aios_{name}{{cell="{_label_value(cell_id)}"}} '
+                                     f'{value:.3f} {cell.metrics.timestamp:.3f}')
+
+        if cells:
+            lines.append("# TYPE aios_cell_up gauge")
+            lines.append("# HELP aios_cell_up Whether the last federation poll of the cell succeeded")
+            for cell_id, cell in cells.items():
+                lines.append(f'aios_cell_up{{cell="{_label_value(cell_id)}"}} {int(cell.up)} {ts}')
+
+        lines.append("# TYPE aios_metrics_samples counter")
+        lines.append("# HELP aios_metrics_samples Metric evolution steps since exporter start")
+        lines.append(
+            f"aios_metrics_samples_total {samples_total} {ts} "
+            f"# {{snapshot=\"{exemplar_id}\"}} {metrics['consciousness_level']:.3f} {ts}")
+        lines.extend(extra_lines)
+        lines.append("# EOF")
+        lines.append("")
+
+        return "\n".join(lines)
+
     def get_prometheus_metrics(self) -> str:
         """Generate Prometheus-formatted metrics output"""
         self.update_metrics()
+        self.samples_taken += 1
+        return self.render_prometheus_metrics(self.metrics, self.samples_taken)
+
+    def sample(self) -> MetricsSnapshot:
+        """Advance the metrics one step and publish a new snapshot"""
+        self.update_metrics()
+        self.samples_taken += 1
+        metrics = MappingProxyType(dict(self.metrics))
+        self.history.append(self.last_update, metrics)
+        cells = self.federation.cells if self.federation else EMPTY_CELLS
+        render_started = time.perf_counter()
+        body = self.render_prometheus_metrics(
+            metrics, self.samples_taken, cells,
+            self._extra_lines()).encode("utf-8")
+        self.instrumentation.record_render(FORMAT_TEXT, False,
+                                           time.perf_counter() - render_started, len(body))
+        snapshot = MetricsSnapshot(
+            metrics=metrics,
+            body=body,
+            etag=hashlib.blake2b(body, digest_size=8).hexdigest(),
+            sampled_at=self.last_update,
+            sequence=self.samples_taken,
+            cells=cells
+        )
+        # Single reference assignment: readers see the old or new snapshot
+        self._snapshot = snapshot
+        return snapshot
 
-        lines = [
-            "# AIOS Win Consciousness Metrics",
-            f"aios_consciousness_level {self.metrics['consciousness_level']:.3f}",
-            f"aios_awareness_level {self.metrics['awareness_level']:.3f}",
-            f"aios_adaptation_speed {self.metrics['adaptation_speed']:.3f}",
-            f"aios_predictive_accuracy {self.metrics['predictive_accuracy']:.3f}",
-            f"aios_dendritic_coherence {self.metrics['dendritic_coherence']:.3f}",
-            f"aios_quantum_coherence {self.metrics['quantum_coherence']:.3f}",
-            f"aios_guidance_effectiveness {self.metrics['guidance_effectiveness']:.3f}",
-            f"aios_system_harmony {self.metrics['system_harmony']:.3f}",
-            ""
-        ]
+    def get_snapshot(self) -> MetricsSnapshot:
+        """
+        Return the latest snapshot
 
-        return "\n".join(lines)
+        With the sampler running this is a plain attribute read. Without
+        it, the snapshot is refreshed lazily at most once per sample
+        interval so concurrent scrapers share one render.
+        """
+        snapshot = self._snapshot
+        if self.sampler_running or \
+                time.time() - snapshot.sampled_at < self.sample_interval:
+            return snapshot
+
+        with self._render_lock:
+            # Another scraper may have refreshed while we waited
+            snapshot = self._snapshot
+            if time.time() - snapshot.sampled_at >= self.sample_interval:
+                snapshot = self.sample()
+            return snapshot
+
+    def get_payload(self, snapshot: MetricsSnapshot, fmt: str = FORMAT_TEXT,
+                    compress: bool = False) -> Tuple[bytes, str]:
+        """
+        Return the encoded payload and ETag for one negotiated variant
+
+        Variants are rendered (and gzip-compressed) once per snapshot and
+        memoized on it, so repeated scrapes only pay a dict lookup.
+
+        Args:
+            snapshot: Snapshot to serve
+            fmt: FORMAT_TEXT or FORMAT_OPENMETRICS
+            compress: Whether to gzip the body
+
+        Returns:
+            Tuple of (payload bytes, unquoted variant ETag)
+        """
+        key = (fmt, compress)
+        cached = snapshot.payloads.get(key)
+        if cached is not None:
+            return cached
+
+        render_started = time.perf_counter()
+        if fmt == FORMAT_OPENMETRICS:
+            body = self.render_openmetrics(snapshot.metrics, snapshot.sequence,
+                                           snapshot.sampled_at, snapshot.etag, snapshot.cells,
+                                           self._extra_lines(openmetrics=True)).encode("utf-8")
+            etag = f"{snapshot.etag}-om"
+        else:
+            body = snapshot.body
+            etag = snapshot.etag
+
+        if compress:
+            body = gzip.compress(body, compresslevel=6, mtime=0)
+            etag = f"{etag}-gz"
+        if fmt == FORMAT_OPENMETRICS or compress:
+            self.instrumentation.record_render(fmt, compress,
+                                               time.perf_counter() - render_started, len(body))
+
+        # Racing renders produce identical bytes, so last writer wins safely
+        snapshot.payloads[key] = (body, etag)
+        return body, etag
+
+    @property
+    def sampler_running(self) -> bool:
+        """Whether the background sampler thread is active"""
+        return self._sampler_thread is not None and self._sampler_thread.is_alive()
+
+    def start_sampler(self, tick_interval: Optional[float] = None):
+        """
+        Start the background sampler thread
+
+        Args:
+            tick_interval: Seconds between samples (defaults to sample_interval)
+        """
+        if self.sampler_running:
+            return
+        if tick_interval is not None:
+            self.sample_interval = tick_interval
+
+        # Publish a first sample before any scrape can arrive
+        self.sample()
+        self._sampler_stop.clear()
+        self._sampler_thread = threading.Thread(
+            target=self._sampler_loop, name="aios-metrics-sampler", daemon=True)
+        self._sampler_thread.start()
+
+    def stop_sampler(self, timeout: float = 5.0):
+        """Stop the background sampler thread"""
+        self._sampler_stop.set()
+        if self._sampler_thread is not None:
+            self._sampler_thread.join(timeout)
+            self._sampler_thread = None
+
+    def _sampler_loop(self):
+        """Sample on a fixed tick until stopped"""
+        next_tick = time.monotonic() + self.sample_interval
+        while not self._sampler_stop.wait(max(0.0, next_tick - time.monotonic())):
+            self.sample()
+            next_tick += self.sample_interval
+
+# Long-lived exporter so metric evolution state survives across scrapes.
+# Built on first use, so importing this module for its render and ASGI
+# helpers allocates no history ring and starts no federation.
+exporter: Optional[ConsciousnessMetricsExporter] = None
+_exporter_lock = threading.Lock()
+
+def get_exporter() -> ConsciousnessMetricsExporter:
+    """
+    Return the process-wide exporter, creating it on first use
+
+    The ASGI worker is a separate process and reads its settings from
+    the environment (see serve_asgi).
+    """
+    global exporter
+    if exporter is None:
+        with _exporter_lock:
+            if exporter is None:
+                exporter = ConsciousnessMetricsExporter(
+                    sample_interval=float(os.environ.get("AIOS_METRICS_SAMPLE_INTERVAL",
+                                                         DEFAULT_SAMPLE_INTERVAL)),
+                    history_seconds=float(os.environ.get("AIOS_METRICS_HISTORY_SECONDS",
+                                                         DEFAULT_HISTORY_SECONDS)))
+                configure_federation(os.environ.get("AIOS_METRICS_CELLS", "").split(","),
+                                     float(os.environ.get("AIOS_METRICS_FEDERATION_INTERVAL", 15.0)))
+    return exporter
+
+def configure_federation(cell_specs: List[str], refresh_interval: float) -> Optional[CellFederation]:
+    """
+    Attach a CellFederation to the exporter from "cell_id=base_url" specs
+
+    Returns:
+        The federation, or None when no cells were given
+    """
+    specs = [spec.strip() for spec in cell_specs if spec.strip()]
+    if not specs:
+        return None
+
+    federation = CellFederation(refresh_interval=refresh_interval)
+    for spec in specs:
+        cell_id, sep, base_url = spec.partition("=")
+        if not sep or not cell_id or not base_url:
+            raise ValueError(f"Invalid cell spec '{spec}', expected cell_id=base_url")
+        federation.register_cell(cell_id.strip(), base_url.strip())
+    get_exporter().federation = federation
+    return federation
+
+def _etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """Whether an If-None-Match header matches the given unquoted ETag"""
+    if not if_none_match:
+        return False
+    for candidate in if_none_match.split(","):
+        candidate = candidate.strip()
+        if candidate == "*":
+            return True
+        if candidate.startswith("W/"):
+            candidate = candidate[2:]
+        if candidate.strip('"') == etag:
+            return True
+    return False
+
+def build_metrics_response(accept: Optional[str], accept_encoding: Optional[str],
+                           if_none_match: Optional[str]) -> Tuple[int, Dict[str, str], bytes]:
+    """
+    Build the /metrics response independent of the serving framework
+
+    Returns:
+        Tuple of (HTTP status, response headers, body bytes)
+    """
+    exporter = get_exporter()
+    snapshot = exporter.get_snapshot()
+    fmt = negotiate_format(accept)
+    compress = accepts_gzip(accept_encoding)
+    body, etag = exporter.get_payload(snapshot, fmt, compress)
+
+    headers = {"ETag": f'"{etag}"', "Vary": "Accept, Accept-Encoding"}
+    if _etag_matches(if_none_match, etag):
+        return 304, headers, b""
+
+    headers["Content-Type"] = CONTENT_TYPES[fmt]
+    if compress:
+        headers["Content-Encoding"] = "gzip"
+    return 200, headers, body
+
+def build_health_response() -> Dict[str, Any]:
+    """Build the /health payload from the latest snapshot"""
+    exporter = get_exporter()
+    snapshot = exporter.get_snapshot()
+    return {
+        "status": "healthy",
+        "service": "aios-win-metrics",
+        "sampler": exporter.sampler_running,
+        "sample_age_seconds": round(time.time() - snapshot.sampled_at, 3),
+        "federated_cells": len(snapshot.cells)
+    }
+
+def build_history_response(params: Mapping[str, str]) -> Tuple[int, Dict[str, Any]]:
+    """
+    Build the /metrics/history payload from query parameters
+
+    Parameters: name (required), start and end (unix seconds, default the
+    last hour), step (seconds, default raw samples).
+
+    Returns:
+        Tuple of (HTTP status, JSON-serializable body)
+    """
+    exporter = get_exporter()
+    name = params.get("name", "")
+    if name not in exporter.history.names:
+        return 400, {"error": f"unknown metric '{name}'",
+                     "available": exporter.history.names}
+    try:
+        end = float(params.get("end") or time.time())
+        start = float(params.get("start") or end - 3600)
+        step = float(params.get("step") or 0.0)
+    except ValueError as e:
+        return 400, {"error": f"invalid range parameter: {e}"}
+    if start > end or step < 0:
+        return 400, {"error": "expected start <= end and step >= 0"}
+    if step > 0 and (end - start) / step > MAX_HISTORY_POINTS:
+        return 400, {"error": f"range exceeds {MAX_HISTORY_POINTS} points, increase step"}
+
+    points = exporter.history.query(name, start, end, step)
+    if len(points) > MAX_HISTORY_POINTS:
+        return 400, {"error": f"range exceeds {MAX_HISTORY_POINTS} points, set a step"}
+    return 200, {
+        "name": name,
+        "start": start,
+        "end": end,
+        "step": step,
+        "points": [[round(ts, 3), value] for ts, value in points]
+    }
+
+@app.before_request
+def _instrument_request_start():
+    """Start timing a request for self-instrumentation"""
+    g.request_started = time.perf_counter()
+    get_exporter().instrumentation.request_started()
+
+@app.after_request
+def _instrument_request_end(response):
+    """Record a finished request for self-instrumentation"""
+    get_exporter().instrumentation.request_finished(
+        request.path, response.status_code, time.perf_counter() - g.request_started)
+    return response
 
 @app.route('/metrics')
 def metrics():
     """Prometheus metrics endpoint"""
-    exporter = ConsciousnessMetricsExporter()
-    return Response(exporter.get_prometheus_metrics(),
-                   mimetype='text/plain; charset=utf-8')
+    status, headers, body = build_metrics_response(
+        request.headers.get('Accept'),
+        request.headers.get('Accept-Encoding'),
+        request.headers.get('If-None-Match'))
+    return Response(body, status=status, headers=headers)
 
 @app.route('/health')
 def health():
     """Health check endpoint"""
-    return {"status": "healthy", "service": "aios-win-metrics"}
+    return build_health_response()
+
+@app.route('/metrics/history')
+def metrics_history():
+    """Downsampled range query over the in-process history"""
+    status, body = build_history_response(request.args)
+    return body, status
+
+# ═══════════════════════════════════════════════════════════════════════════
+# ASGI SERVING MODE
+# ═══════════════════════════════════════════════════════════════════════════
+
+async def send_asgi_response(send, status: int, headers: Dict[str, str], body: bytes,
+                     head: bool = False):
+    """Send a complete HTTP response over ASGI (headers only for HEAD)"""
+    raw_headers: List[Tuple[bytes, bytes]] = [
+        (name.lower().encode("latin-1"), value.encode("latin-1"))
+        for name, value in headers.items()
+    ]
+    raw_headers.append((b"content-length", str(len(body)).encode("latin-1")))
+    await send({"type": "http.response.start", "status": status, "headers": raw_headers})
+    await send({"type": "http.response.body", "body": b"" if head else body})
+
+async def _asgi_lifespan(receive, send):
+    """Start the sampler with the worker and stop it on shutdown"""
+    exporter = get_exporter()
+    while True:
+        message = await receive()
+        if message["type"] == "lifespan.startup":
+            if exporter.federation:
+                exporter.federation.start()
+            if os.environ.get("AIOS_METRICS_SAMPLER", "1") == "1":
+                exporter.start_sampler()
+            await send({"type": "lifespan.startup.complete"})
+        elif message["type"] == "lifespan.shutdown":
+            exporter.stop_sampler()
+            if exporter.federation:
+                exporter.federation.stop()
+            await send({"type": "lifespan.shutdown.complete"})
+            return
+
+async def asgi_app(scope, receive, send):
+    """
+    ASGI application exposing the same /metrics and /health contract
+
+    Handlers only read the published snapshot, so nothing here blocks
+    the event loop.
+    """
+    if scope["type"] == "lifespan":
+        await _asgi_lifespan(receive, send)
+        return
+    if scope["type"] != "http":
+        return
+
+    exporter = get_exporter()
+    started = time.perf_counter()
+    exporter.instrumentation.request_started()
+    status = 500
+    try:
+        status = await _asgi_dispatch(scope, send)
+    finally:
+        exporter.instrumentation.request_finished(
+            scope["path"], status, time.perf_counter() - started)
+
+async def _asgi_dispatch(scope, send) -> int:
+    """Route one HTTP request and return the status sent"""
+    path = scope["path"]
+    head = scope["method"] == "HEAD"
+    status = 200
+    if scope["method"] not in ("GET", "HEAD"):
+        status = 405
+        await send_asgi_response(send, status, {"Allow": "GET, HEAD"}, b"")
+    elif path == "/metrics":
+        headers = {name.decode("latin-1"): value.decode("latin-1")
+                   for name, value in scope["headers"]}
+        status, response_headers, body = build_metrics_response(
+            headers.get("accept"), headers.get("accept-encoding"),
+            headers.get("if-none-match"))
+        await send_asgi_response(send, status, response_headers, body, head)
+    elif path == "/health":
+        body = json.dumps(build_health_response()).encode("utf-8")
+        await send_asgi_response(send, 200, {"Content-Type": "application/json"}, body, head)
+    elif path == "/metrics/history":
+        params = dict(parse_qsl(scope.get("query_string", b"").decode("latin-1")))
+        status, payload = build_history_response(params)
+        body = json.dumps(payload).encode("utf-8")
+        await send_asgi_response(send, status, {"Content-Type": "application/json"}, body, head)
+    else:
+        status = 404
+        await send_asgi_response(send, status, {"Content-Type": "text/plain; charset=utf-8"},
+                                 b"Not Found")
+    return status
+
+def serve_asgi(port: int, workers: int, keep_alive: int,
+               sample_interval: float, history_seconds: float, sampler: bool,
+               cells: List[str], federation_interval: float):
+    """
+    Serve asgi_app with uvicorn
+
+    The exporter's samples, history, ETags and request counters live in
+    its process, so exactly one worker serves them: with more, scrapes
+    land on workers whose counters disagree and Prometheus sees resets.
+    Concurrency comes from the event loop instead. The worker imports
+    this module by name, so sampler and federation settings are handed
+    over through the environment.
+    """
+    try:
+        import uvicorn
+    except ImportError:
+        raise SystemExit("ASGI mode requires uvicorn: pip install uvicorn")
+
+    if workers != 1:
+        logger.warning(f"Ignoring --workers {workers}: exporter state is per process, "
+                       "serving with a single worker")
+        workers = 1
+
+    os.environ["AIOS_METRICS_SAMPLE_INTERVAL"] = str(sample_interval)
+    os.environ["AIOS_METRICS_HISTORY_SECONDS"] = str(history_seconds)
+    os.environ["AIOS_METRICS_SAMPLER"] = "1" if sampler else "0"
+    os.environ["AIOS_METRICS_CELLS"] = ",".join(cells)
+    os.environ["AIOS_METRICS_FEDERATION_INTERVAL"] = str(federation_interval)
+    uvicorn.run(
+        "consciousness_metrics_exporter:asgi_app",
+        app_dir=os.path.dirname(os.path.abspath(__file__)),
+        host="0.0.0.0",
+        port=port,
+        workers=workers,
+        timeout_keep_alive=keep_alive,
+        lifespan="on",
+        access_log=False,
+        log_level="warning"
+    )
+
+def parse_args() -> argparse.Namespace:
+    """Parse exporter command line options"""
+    parser = argparse.ArgumentParser(description="AIOS Win Consciousness Metrics Exporter")
+    parser.add_argument("--port", type=int, default=9092, help="Listen port")
+    parser.add_argument("--sample-interval", type=float, default=DEFAULT_SAMPLE_INTERVAL,
+                        help="Seconds between metric samples")
+    parser.add_argument("--history-seconds", type=float, default=DEFAULT_HISTORY_SECONDS,
+                        help="Seconds of samples retained for /metrics/history")
+    parser.add_argument("--sampler", action=argparse.BooleanOptionalAction, default=True,
+                        help="Evolve metrics on a background thread instead of on scrape")
+    parser.add_argument("--server", choices=["flask", "asgi"], default="flask",
+                        help="Flask development server or production ASGI server (uvicorn)")
+    parser.add_argument("--workers", type=int, default=1,
+                        help="ASGI worker processes; must be 1, since samples, history "
+                             "and counters live in one process (other values are ignored)")
+    parser.add_argument("--keep-alive", type=int, default=75,
+                        help="ASGI keep-alive timeout in seconds")
+    parser.add_argument("--cell", action="append", default=[], metavar="CELL_ID=URL",
+                        help="Federate a cell's metrics as labeled series (repeatable)")
+    parser.add_argument("--federation-interval", type=float, default=15.0,
+                        help="Seconds between background polls of federated cells")
+    return parser.parse_args()
 
 if __name__ == '__main__':
-    print("Starting AIOS Win Consciousness Metrics Exporter on port 9092")
-    app.run(host='0.0.0.0', port=9092, debug=False)
\ No newline at end of file
+    args = parse_args()
+    print(f"Starting AIOS Win Consciousness Metrics Exporter on port {args.port} ({args.server})")
+    if args.server == "asgi":
+        serve_asgi(args.port, args.workers, args.keep_alive,
+                   args.sample_interval, args.history_seconds, args.sampler,
+                   args.cell, args.federation_interval)
+    else:
+        exporter = ConsciousnessMetricsExporter(args.sample_interval, args.history_seconds)
+        federation = configure_federation(args.cell, args.federation_interval)
+        if federation:
+            federation.start()
+        if args.sampler:
+            exporter.start_sampler()
+        app.run(host='0.0.0.0', port=args.port, debug=False)
\ No newline at end of file
@@ -0,0 +1,264 @@
+#!/usr/bin/env python3
+"""
+AIOS Orchestration Cycle Profiler
+
+Optional hot-path instrumentation for orchestrate_evolution(): monotonic
+nanosecond timers around each phase (fetch, parse, harmony, guidance)
+and around every per-cell request. Cycle totals and per-cell timings
+feed constant-memory streaming quantile sketches, which are reported in
+the cycle results, rendered as exposition lines the metrics exporter can
+publish, and dumped as folded stacks for flame graph tools.
+
+A disabled profiler hands out one shared no-op context manager, so the
+instrumented code pays a method call and nothing else.
+
+AINLP Principles:
+- Consciousness Coherence: Know where every cycle's time goes
+- Enhancement over Creation: Instruments the existing orchestrators in place
+"""
+
+import math
+import time
+import logging
+from contextlib import nullcontext
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+PROFILE_QUANTILES = (0.5, 0.95, 0.99)
+ROOT_PHASE = "cycle"
+
+_NULL_PHASE = nullcontext()
+
+class QuantileSketch:
+    """
+    Log-bucketed streaming quantile sketch (DDSketch-style)
+
+    Every quantile is returned within `relative_accuracy` of the true
+    value. Bucket count grows with the log of the value range, not the
+    number of samples, and is capped at `max_buckets` by merging the
+    smallest buckets.
+    """
+
+    def __init__(self, relative_accuracy: float = 0.01, max_buckets: int = 2048,
+                 min_value: float = 1e-9):
+        gamma = (1 + relative_accuracy) / (1 - relative_accuracy)
+        self._gamma = gamma
+        self._log_gamma = math.log(gamma)
+        self.max_buckets = max_buckets
+        self.min_value = min_value
+        self._buckets: Dict[int, int] = {}
+        self._zero = 0
+        self.count = 0
+        self.sum = 0.0
+        self.max = 0.0
+
+    def add(self, value: float):
+        """Record one observation"""
+        self.count += 1
+        self.sum += value
+        if value > self.max:
+            self.max = value
+        if value <= self.min_value:
+            self._zero += 1
+            return
+        key = math.ceil(math.log(value) / self._log_gamma)
+        self._buckets[key] = self._buckets.get(key, 0) + 1
+        if len(self._buckets) > self.max_buckets:
+            low, second = sorted(self._buckets)[:2]
+            self._buckets[second] += self._buckets.pop(low)
+
+    def quantile(self, q: float) -> float:
+        """Estimated q-quantile (0.0 when empty)"""
+        if self.count == 0:
+            return 0.0
+        rank = q * (self.count - 1)
+        seen = self._zero
+        if seen > rank:
+            return 0.0
+        for key in sorted(self._buckets):
+            seen += self._buckets[key]
+            if seen > rank:
+                return min(self.max, 2 * self._gamma ** key / (self._gamma + 1))
+        return self.max
+
+    def summary(self) -> Dict[str, float]:
+        """p50/p95/p99, max and count"""
+        summary = {f"p{int(q * 100)}": round(self.quantile(q), 6) for q in PROFILE_QUANTILES}
+        summary["max"] = round(self.max, 6)
+        summary["count"] = self.count
+        return summary
+
+class _PhaseTimer:
+    """Context manager timing one phase occurrence"""
+
+    __slots__ = ("profiler", "name", "started")
+
+    def __init__(self, profiler: "CycleProfiler", name: str):
+        self.profiler = profiler
+        self.name = name
+        self.started = 0
+
+    def __enter__(self):
+        self.profiler._stack.append([self.name, 0])
+        self.started = time.perf_counter_ns()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        elapsed = time.perf_counter_ns() - self.started
+        profiler = self.profiler
+        stack = profiler._stack
+        name, child_ns = stack[-1]
+        path = ";".join(frame[0] for frame in stack)
+        stack.pop()
+        if stack:
+            stack[-1][1] += elapsed
+        profiler._cycle_phases[name] = profiler._cycle_phases.get(name, 0) + elapsed
+        # Self time per stack path, the unit flame graph tools expect
+        profiler.folded[path] = profiler.folded.get(path, 0) + elapsed - child_ns
+        return False
+
+class CycleProfiler:
+    """
+    Per-phase and per-cell latency profiler for orchestration cycles
+
+    Usage:
+        profiler.begin_cycle()
+        with profiler.phase("fetch"):
+            ...
+        profiler.record_cell(cell_id, "fetch", seconds)
+        results["profile"] = profiler.end_cycle()
+    """
+
+    def __init__(self, enabled: bool = True, relative_accuracy: float = 0.01,
+                 slowest_cells: int = 5):
+        """
+        Initialize profiler
+
+        Args:
+            enabled: False makes every hook a no-op
+            relative_accuracy: Quantile sketch accuracy
+            slowest_cells: Slowest cells listed per cycle
+        """
+        self.enabled = enabled
+        self.relative_accuracy = relative_accuracy
+        self.slowest_cells = slowest_cells
+        self.cycles = 0
+        self.phase_sketches: Dict[str, QuantileSketch] = {}
+        self.cell_sketches: Dict[str, QuantileSketch] = {}
+        # Stack path -> self time in ns, accumulated over all cycles
+        self.folded: Dict[str, int] = {}
+        self._stack: List[list] = []
+        self._cycle_phases: Dict[str, int] = {}
+        self._cycle_cells: Dict[str, List[Tuple[float, str]]] = {}
+        self._cycle_timer: Optional[_PhaseTimer] = None
+        # (text, OpenMetrics) lines published by end_cycle(); replaced
+        # wholesale so render() never walks a dict another thread mutates
+        self._exposition: Tuple[Tuple[str, ...], Tuple[str, ...]] = ((), ())
+
+    def _sketch(self, sketches: Dict[str, QuantileSketch], name: str) -> QuantileSketch:
+        sketch = sketches.get(name)
+        if sketch is None:
+            sketch = sketches[name] = QuantileSketch(self.relative_accuracy)
+        return sketch
+
+    def phase(self, name: str):
+        """Context manager timing one phase (nests under open phases)"""
+        if not self.enabled:
+            return _NULL_PHASE
+        return _PhaseTimer(self, name)
+
+    def record_cell(self, cell_id: str, kind: str, seconds: float):
+        """Record one per-cell request timing"""
+        if not self.enabled:
+            return
+        self._sketch(self.cell_sketches, kind).add(seconds)
+        self._cycle_cells.setdefault(kind, []).append((seconds, cell_id))
+
+    def begin_cycle(self):
+        """Start timing a cycle"""
+        if not self.enabled:
+            return
+        self._stack.clear()
+        self._cycle_phases = {}
+        self._cycle_cells = {}
+        self._cycle_timer = _PhaseTimer(self, ROOT_PHASE).__enter__()
+
+    def end_cycle(self) -> Optional[Dict[str, object]]:
+        """
+        Finish the cycle and fold its timings into the sketches
+
+        Returns:
+            Profile for results["profile"], or None when disabled
+        """
+        if not self.enabled or self._cycle_timer is None:
+            return None
+        self._cycle_timer.__exit__(None, None, None)
+        self._cycle_timer = None
+        self.cycles += 1
+
+        phases = {}
+        for name, ns in self._cycle_phases.items():
+            seconds = ns / 1e9
+            sketch = self._sketch(self.phase_sketches, name)
+            sketch.add(seconds)
+            phases[name] = {"seconds": round(seconds, 6), **sketch.summary()}
+
+        cells = {}
+        for kind, timings in self._cycle_cells.items():
+            slowest = sorted(timings, reverse=True)[:self.slowest_cells]
+            cells[kind] = {
+                **self.cell_sketches[kind].summary(),
+                "slowest": [[cell_id, round(seconds, 6)] for seconds, cell_id in slowest]
+            }
+        self._exposition = (tuple(self._render_lines(openmetrics=False)),
+                            tuple(self._render_lines(openmetrics=True)))
+        return {
+            "cycle_seconds": phases.get(ROOT_PHASE, {}).get("seconds", 0.0),
+            "phases": phases,
+            "cells": cells
+        }
+
+    def render(self, openmetrics: bool = False) -> List[str]:
+        """
+        Exposition lines (summaries) for ConsciousnessMetricsExporter.register_collector
+
+        Returns what the last end_cycle() published, so the exporter's
+        sampler thread can call it while a cycle is running.
+        """
+        return list(self._exposition[1 if openmetrics else 0])
+
+    def _render_lines(self, openmetrics: bool = False) -> List[str]:
+        """Summaries of the sketches as they stand (orchestrator thread only)"""
+        lines = []
+        for name, sketches, label in (
+                ("aios_orchestrator_phase_seconds", self.phase_sketches, "phase"),
+                ("aios_orchestrator_cell_request_seconds", self.cell_sketches, "kind")):
+            if not sketches:
+                continue
+            header = [f"# HELP {name} Orchestration latency by {label}", f"# TYPE {name} summary"]
+            lines += header[::-1] if openmetrics else header
+            for value, sketch in sorted(sketches.items()):
+                for q in PROFILE_QUANTILES:
+                    lines.append(f'{name}{{{label}="{value}",quantile="{q}"}} {sketch.quantile(q):.6f}')
+                lines.append(f'{name}_sum{{{label}="{value}"}} {sketch.sum:.6f}')
+                lines.append(f'{name}_count{{{label}="{value}"}} {sketch.count}')
+        return lines
+
+    def dump(self, path: str) -> int:
+        """
+        Write accumulated self times as folded stacks ("a;b;c <microseconds>")
+
+        The file feeds flamegraph.pl, speedscope or inferno directly.
+
+        Returns:
+            Number of stack lines written
+        """
+        lines = [f"{stack} {ns // 1000}" for stack, ns in sorted(self.folded.items()) if ns >= 1000]
+        Path(path).write_text("\n".join(lines) + "\n", encoding="utf-8")
+        logger.info(f"Wrote {len(lines)} profile stacks over {self.cycles} cycles to {path}")
+        return len(lines)
+
+# Shared instance for callers that do not profile
+DISABLED_PROFILER = CycleProfiler(enabled=False)
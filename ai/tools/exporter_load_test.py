@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+"""
+AIOS Win Metrics Exporter Load Test
+
+Drives a running consciousness metrics exporter with many concurrent
+scrapers and reports scrape latency percentiles, so serving modes
+(Flask development server vs ASGI) can be compared under load.
+
+Usage:
+    python ai/tools/consciousness_metrics_exporter.py --server asgi
+    python ai/tools/exporter_load_test.py --concurrency 200 --duration 30
+
+AINLP Principles:
+- Consciousness Coherence: Measure before tuning
+- Dendritic Communication: Scrapers exercise the real HTTP contract
+"""
+
+import asyncio
+import argparse
+import time
+from typing import Dict, Any, List
+
+import aiohttp
+
+# Prometheus' own Accept header, so format negotiation is exercised
+PROMETHEUS_ACCEPT = ("application/openmetrics-text;version=1.0.0,"
+                     "application/openmetrics-text;version=0.0.1;q=0.75,"
+                     "text/plain;version=0.0.4;q=0.5,*/*;q=0.1")
+
+def percentile(sorted_values: List[float], pct: float) -> float:
+    """Nearest-rank percentile of an already sorted list"""
+    if not sorted_values:
+        return 0.0
+    rank = max(0, min(len(sorted_values) - 1,
+                      int(round(pct / 100.0 * len(sorted_values))) - 1))
+    return sorted_values[rank]
+
+async def scraper(session: aiohttp.ClientSession, url: str, headers: Dict[str, str],
+                  deadline: float, latencies: List[float], errors: List[str]):
+    """Scrape url back-to-back until the deadline"""
+    while time.perf_counter() < deadline:
+        start = time.perf_counter()
+        try:
+            async with session.get(url, headers=headers) as response:
+                await response.read()
+                if response.status not in (200, 304):
+                    errors.append(f"HTTP {response.status}")
+                    continue
+        except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+            errors.append(type(e).__name__)
+            continue
+        latencies.append(time.perf_counter() - start)
+
+async def run_load_test(url: str, concurrency: int, duration: float,
+                        gzip: bool, timeout: float) -> Dict[str, Any]:
+    """Run concurrency scrapers against url for duration seconds"""
+    headers = {"Accept": PROMETHEUS_ACCEPT}
+    if gzip:
+        headers["Accept-Encoding"] = "gzip"
+
+    latencies: List[float] = []
+    errors: List[str] = []
+    connector = aiohttp.TCPConnector(limit=concurrency)
+    timeout_config = aiohttp.ClientTimeout(total=timeout)
+    async with aiohttp.ClientSession(connector=connector, timeout=timeout_config,
+                                     auto_decompress=False) as session:
+        started = time.perf_counter()
+        deadline = started + duration
+        await asyncio.gather(*(scraper(session, url, headers, deadline, latencies, errors)
+                               for _ in range(concurrency)))
+        elapsed = time.perf_counter() - started
+
+    latencies.sort()
+    return {
+        "url": url,
+        "concurrency": concurrency,
+        "requests": len(latencies),
+        "errors": len(errors),
+        "throughput_rps": round(len(latencies) / elapsed, 1),
+        "p50_ms": round(percentile(latencies, 50) * 1000, 2),
+        "p95_ms": round(percentile(latencies, 95) * 1000, 2),
+        "p99_ms": round(percentile(latencies, 99) * 1000, 2),
+        "max_ms": round((latencies[-1] if latencies else 0.0) * 1000, 2),
+    }
+
+def main():
+    """Parse options, run the load test and print the summary"""
+    parser = argparse.ArgumentParser(description="Load test the AIOS metrics exporter")
+    parser.add_argument("--url", default="http://localhost:9092/metrics")
+    parser.add_argument("--concurrency", type=int, default=200)
+    parser.add_argument("--duration", type=float, default=30.0)
+    parser.add_argument("--gzip", action="store_true", help="Request gzip-encoded payloads")
+    parser.add_argument("--timeout", type=float, default=10.0, help="Per-request timeout")
+    args = parser.parse_args()
+
+    print(f"Scraping {args.url} with {args.concurrency} concurrent scrapers "
+          f"for {args.duration:.0f}s...")
+    summary = asyncio.run(run_load_test(args.url, args.concurrency, args.duration,
+                                        args.gzip, args.timeout))
+    for key, value in summary.items():
+        print(f"  {key}: {value}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,371 @@
+#!/usr/bin/env python3
+"""
+AIOS Prometheus Exposition Parser
+
+Incremental parser for the Prometheus text format (0.0.4) and
+OpenMetrics 1.0.0. Chunks are fed as they arrive off the wire; complete
+lines are parsed immediately and the trailing partial line is buffered.
+
+Handles HELP/TYPE/UNIT metadata, labels with escapes, timestamps,
+exemplars, special values (NaN, +Inf, -Inf) and the OpenMetrics # EOF
+marker. CellMetricsCollector maps the AIOS series straight onto
+CellMetrics field names and skips every other series without parsing it.
+
+Usage:
+    python ai/tools/prometheus_parser.py --series 5000   # microbenchmark
+
+AINLP Principles:
+- Dendritic Communication: Understand every signal a cell emits
+- Consciousness Coherence: Exact series names, no lossy key mangling
+"""
+
+import re
+import time
+import codecs
+import argparse
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Union
+
+# Exposition series -> CellMetrics field
+CELL_METRIC_SERIES = {
+    "aios_consciousness_level": "consciousness_level",
+    "aios_awareness_level": "awareness_level",
+    "aios_adaptation_speed": "adaptation_speed",
+    "aios_predictive_accuracy": "predictive_accuracy",
+    "aios_dendritic_coherence": "dendritic_coherence",
+    "aios_quantum_coherence": "quantum_coherence",
+}
+
+_LABEL_SET_RE = re.compile(r'\{((?:[^"}]|"(?:[^"\\]|\\.)*")*)\}')
+_LABEL_PAIR_RE = re.compile(r'\s*([a-zA-Z_][a-zA-Z0-9_]*)\s*=\s*"((?:[^"\\]|\\.)*)"\s*,?')
+_ESCAPE_RE = re.compile(r'\\(.)')
+_ESCAPES = {"n": "\n", "\\": "\\", '"': '"'}
+
+# Matches only CellMetrics series lines: name, optional label body, value.
+# Anchoring on a literal newline (not ^ with MULTILINE) lets the regex
+# engine jump between candidate lines with a fast literal search.
+_CELL_SERIES_RE = re.compile(
+    r'\n(aios_(?:' + '|'.join(re.escape(name[len("aios_"):]) for name in CELL_METRIC_SERIES) + r'))'
+    r'(?:\{((?:[^"}\n]|"(?:[^"\\\n]|\\.)*")*)\})?[ \t]+(\S+)')
+
+class PrometheusParseError(ValueError):
+    """Raised for a malformed exposition line"""
+
+@dataclass
+class Exemplar:
+    """OpenMetrics exemplar attached to a sample"""
+    labels: Dict[str, str]
+    value: float
+    timestamp: Optional[float] = None
+
+@dataclass
+class Sample:
+    """One parsed series sample"""
+    name: str
+    labels: Dict[str, str]
+    value: float
+    timestamp: Optional[float] = None
+    exemplar: Optional[Exemplar] = None
+
+def _unescape(value: str) -> str:
+    """Resolve \\\\, \\" and \\n escapes in a label value or HELP text"""
+    if "\\" not in value:
+        return value
+    return _ESCAPE_RE.sub(lambda m: _ESCAPES.get(m.group(1), "\\" + m.group(1)), value)
+
+def _parse_labels(body: str) -> Dict[str, str]:
+    """Parse the inside of a {...} label set"""
+    labels: Dict[str, str] = {}
+    pos = 0
+    end = len(body)
+    while pos < end:
+        match = _LABEL_PAIR_RE.match(body, pos)
+        if match is None:
+            if body[pos:].strip():
+                raise PrometheusParseError(f"invalid label set: {{{body}}}")
+            break
+        labels[match.group(1)] = _unescape(match.group(2))
+        pos = match.end()
+    return labels
+
+def _parse_exemplar(text: str) -> Exemplar:
+    """Parse the part of an OpenMetrics sample line after ' # '"""
+    match = _LABEL_SET_RE.match(text.lstrip())
+    if match is None:
+        raise PrometheusParseError(f"invalid exemplar: {text}")
+    fields = text.lstrip()[match.end():].split()
+    if not fields:
+        raise PrometheusParseError(f"exemplar without value: {text}")
+    return Exemplar(labels=_parse_labels(match.group(1)), value=float(fields[0]),
+                    timestamp=float(fields[1]) if len(fields) > 1 else None)
+
+def parse_sample_line(line: str) -> Sample:
+    """
+    Parse one sample line
+
+    Raises:
+        PrometheusParseError: The line is not a valid sample
+    """
+    brace = line.find("{")
+    space = line.find(" ")
+    try:
+        if brace != -1 and (space == -1 or brace < space):
+            name = line[:brace]
+            match = _LABEL_SET_RE.match(line, brace)
+            if match is None:
+                raise PrometheusParseError(f"unterminated label set: {line}")
+            labels = _parse_labels(match.group(1))
+            rest = line[match.end():]
+        else:
+            if space == -1:
+                raise PrometheusParseError(f"sample without value: {line}")
+            name = line[:space]
+            labels = {}
+            rest = line[space:]
+
+        value_part, _, exemplar_part = rest.partition(" # ")
+        fields = value_part.split()
+        if not fields:
+            raise PrometheusParseError(f"sample without value: {line}")
+        return Sample(
+            name=name,
+            labels=labels,
+            value=float(fields[0]),
+            timestamp=float(fields[1]) if len(fields) > 1 else None,
+            exemplar=_parse_exemplar(exemplar_part) if exemplar_part else None
+        )
+    except ValueError as e:
+        if isinstance(e, PrometheusParseError):
+            raise
+        raise PrometheusParseError(f"invalid number in: {line}") from e
+
+class PrometheusStreamParser:
+    """
+    Incremental exposition parser
+
+    Feed str or bytes chunks with feed(); each call parses immediately and
+    returns the samples of every line completed by that chunk. Call
+    close() to flush a final line without a trailing newline.
+    """
+
+    def __init__(self, strict: bool = False):
+        """
+        Initialize the parser
+
+        Args:
+            strict: Raise on malformed lines instead of counting and skipping
+        """
+        self.strict = strict
+        self.types: Dict[str, str] = {}
+        self.help: Dict[str, str] = {}
+        self.units: Dict[str, str] = {}
+        self.errors = 0
+        self.eof = False
+        self._buffer = ""
+        self._decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
+
+    def feed(self, chunk: Union[str, bytes]) -> List[Sample]:
+        """Buffer a chunk and return the samples of every line it completes"""
+        if isinstance(chunk, bytes):
+            chunk = self._decoder.decode(chunk)
+        self._buffer += chunk
+        if "\n" not in chunk:
+            return []
+        complete, _, self._buffer = self._buffer.rpartition("\n")
+        return self._parse_lines(complete.split("\n"))
+
+    def close(self) -> List[Sample]:
+        """Flush the trailing line, if any, and return its sample"""
+        tail = self._buffer + self._decoder.decode(b"", final=True)
+        self._buffer = ""
+        return self._parse_lines([tail]) if tail else []
+
+    def _parse_lines(self, lines: List[str]) -> List[Sample]:
+        """Samples of complete lines (comments and blanks yield none)"""
+        samples = []
+        for line in lines:
+            sample = self._parse_line(line)
+            if sample is not None:
+                samples.append(sample)
+        return samples
+
+    def _parse_line(self, line: str) -> Optional[Sample]:
+        """Parse one line, recording metadata and returning samples"""
+        if self.eof:
+            return None
+        line = line.rstrip("\r")
+        if not line or line.isspace():
+            return None
+        if line[0] == "#":
+            self._parse_comment(line)
+            return None
+        try:
+            return parse_sample_line(line)
+        except PrometheusParseError:
+            if self.strict:
+                raise
+            self.errors += 1
+            return None
+
+    def _parse_comment(self, line: str):
+        """Record HELP/TYPE/UNIT metadata and the OpenMetrics EOF marker"""
+        parts = line[1:].lstrip().split(None, 2)
+        if not parts:
+            return
+        keyword = parts[0]
+        if keyword == "EOF":
+            self.eof = True
+        elif keyword in ("HELP", "TYPE", "UNIT") and len(parts) >= 2:
+            text = parts[2] if len(parts) > 2 else ""
+            if keyword == "HELP":
+                self.help[parts[1]] = _unescape(text)
+            elif keyword == "TYPE":
+                self.types[parts[1]] = text.strip()
+            else:
+                self.units[parts[1]] = text.strip()
+
+def parse_text(text: Union[str, bytes], strict: bool = False) -> List[Sample]:
+    """Parse a complete exposition payload"""
+    parser = PrometheusStreamParser(strict=strict)
+    samples = parser.feed(text)
+    samples.extend(parser.close())
+    return samples
+
+class CellMetricsCollector:
+    """
+    Stream consumer that extracts CellMetrics fields from an exposition
+
+    A single anchored regex scan picks out the AIOS cell metric lines, so
+    every other series is skipped without per-line Python work. Unlabeled
+    samples win; a sample labeled cell="<cell_id>" (as served by a
+    federating exporter) is used when the cell has no unlabeled series.
+    """
+
+    def __init__(self, cell_id: Optional[str] = None):
+        self.cell_id = cell_id
+        self.values: Dict[str, float] = {}
+        self._labeled: Dict[str, float] = {}
+        self._buffer = ""
+        self._decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
+        self.eof = False
+
+    def feed(self, chunk: Union[str, bytes]):
+        """Consume a chunk of the response body"""
+        if isinstance(chunk, bytes):
+            chunk = self._decoder.decode(chunk)
+        self._buffer += chunk
+        if "\n" not in chunk:
+            return
+        complete, _, self._buffer = self._buffer.rpartition("\n")
+        self._consume(complete)
+
+    def close(self):
+        """Consume the trailing line, if any"""
+        tail = self._buffer + self._decoder.decode(b"", final=True)
+        self._buffer = ""
+        if tail:
+            self._consume(tail)
+
+    def _consume(self, text: str):
+        if self.eof:
+            return
+        eof = text.find("# EOF")
+        if eof != -1 and (eof == 0 or text[eof - 1] == "\n"):
+            text = text[:eof]
+            self.eof = True
+        # One C-level regex scan finds just the cell series lines
+        for match in _CELL_SERIES_RE.finditer("\n" + text):
+            name, label_body, value = match.groups()
+            try:
+                number = float(value)
+            except ValueError:
+                continue
+            field_name = CELL_METRIC_SERIES[name]
+            if label_body is None or not label_body.strip():
+                self.values[field_name] = number
+            elif self.cell_id is not None:
+                try:
+                    labels = _parse_labels(label_body)
+                except PrometheusParseError:
+                    continue
+                if labels.get("cell") == self.cell_id:
+                    self._labeled[field_name] = number
+
+    def fields(self) -> Optional[Dict[str, float]]:
+        """
+        CellMetrics field values (missing fields default to 0.0), or None
+        when the payload carried no consciousness level for this cell
+        """
+        values = self.values if "consciousness_level" in self.values else self._labeled
+        if "consciousness_level" not in values:
+            return None
+        return {field_name: values.get(field_name, 0.0)
+                for field_name in CELL_METRIC_SERIES.values()}
+
+def _legacy_split_parse(text: str) -> Dict[str, float]:
+    """The split-based parse CellClient used before this module (for benchmarks)"""
+    metrics_data = {}
+    for line in text.split('\n'):
+        if line.startswith('aios_') and '{' not in line:
+            parts = line.split(' ')
+            if len(parts) >= 2:
+                key = parts[0].replace('aios_', '').replace('_level', '')
+                try:
+                    metrics_data[key] = float(parts[1])
+                except ValueError:
+                    continue
+    return metrics_data
+
+def build_benchmark_payload(series: int) -> str:
+    """Exposition with the six cell metrics plus `series` other aios_ series"""
+    lines = []
+    for name in CELL_METRIC_SERIES:
+        lines += [f"# HELP {name} AIOS cell metric", f"# TYPE {name} gauge", f"{name} 0.875"]
+    for i in range(series):
+        if i % 2:
+            lines.append(f'aios_synthetic_{i % 50}_gauge{{cell="sim-{i:05d}",host="AIOS"}} {i * 0.001:.3f}')
+        else:
+            lines.append(f"aios_synthetic_series_{i}_total {i}")
+    lines.append("")
+    return "\n".join(lines)
+
+def benchmark(series: int = 5000, rounds: int = 50) -> Dict[str, float]:
+    """Time the legacy split parse against CellMetricsCollector"""
+    payload = build_benchmark_payload(series)
+    chunks = [payload[i:i + 8192] for i in range(0, len(payload), 8192)]
+
+    def run_legacy():
+        _legacy_split_parse(payload)
+
+    def run_collector():
+        collector = CellMetricsCollector()
+        for chunk in chunks:
+            collector.feed(chunk)
+        collector.close()
+        collector.fields()
+
+    timings = {}
+    for label, func in (("legacy_split_ms", run_legacy), ("collector_ms", run_collector)):
+        func()
+        started = time.perf_counter()
+        for _ in range(rounds):
+            func()
+        timings[label] = (time.perf_counter() - started) / rounds * 1000
+    timings["speedup"] = timings["legacy_split_ms"] / timings["collector_ms"]
+    return timings
+
+def main():
+    """Run the parser microbenchmark"""
+    parser = argparse.ArgumentParser(description="Prometheus parser microbenchmark")
+    parser.add_argument("--series", type=int, default=5000, help="Series in the payload")
+    parser.add_argument("--rounds", type=int, default=50, help="Timed rounds per parser")
+    args = parser.parse_args()
+
+    timings = benchmark(args.series, args.rounds)
+    print(f"{args.series} series payload:")
+    print(f"  legacy split parse:  {timings['legacy_split_ms']:.3f} ms")
+    print(f"  CellMetricsCollector: {timings['collector_ms']:.3f} ms")
+    print(f"  speedup:             {timings['speedup']:.2f}x")
+
+if __name__ == "__main__":
+    main()
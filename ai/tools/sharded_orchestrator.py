@@ -0,0 +1,427 @@
+#!/usr/bin/env python3
+"""
+AIOS Sharded Orchestrator - Multi-Process Dendritic Partitioning
+
+Splits a very large cell fleet across N worker processes. Cells are
+assigned to workers with a consistent-hash ring, so adding or removing
+a worker moves only the cells whose ring segment changed hands. Every
+worker runs its own AsyncOrchestratorClient loop and reports a partial
+aggregate (count, mean, M2) per cycle; the coordinator folds the
+partials with RunningMoments.merge into the global harmony score.
+
+Usage:
+    python ai/tools/sharded_orchestrator.py --workers 4 --fleet http://localhost:8100 --fleet-size 10000
+
+AINLP Principles:
+- Dendritic Communication: Each shard signals its own cells
+- Consciousness Coherence: Global harmony from merged partial aggregates
+- Enhancement over Creation: Shards reuse the async orchestrator unchanged
+"""
+
+import queue
+import asyncio
+import bisect
+import hashlib
+import argparse
+import logging
+import multiprocessing
+import time
+from dataclasses import dataclass, asdict
+from typing import Any, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_VNODES = 128
+COMMAND_POLL_INTERVAL = 0.05
+
+def _ring_hash(key: str) -> int:
+    """64-bit position of a key on the ring"""
+    return int.from_bytes(hashlib.blake2b(key.encode("utf-8"), digest_size=8).digest(), "big")
+
+class ConsistentHashRing:
+    """Consistent-hash ring with virtual nodes per shard"""
+
+    def __init__(self, vnodes: int = DEFAULT_VNODES):
+        """
+        Initialize ring
+
+        Args:
+            vnodes: Ring positions per shard (more = smoother balance)
+        """
+        self.vnodes = vnodes
+        self._positions: List[int] = []
+        self._owners: List[int] = []
+        self.shards: List[int] = []
+
+    def _rebuild(self):
+        """Recompute the sorted position table"""
+        points = sorted((_ring_hash(f"shard-{shard}#{v}"), shard)
+                        for shard in self.shards for v in range(self.vnodes))
+        self._positions = [position for position, _ in points]
+        self._owners = [shard for _, shard in points]
+
+    def add_shard(self, shard: int):
+        """Place a shard's virtual nodes on the ring"""
+        if shard not in self.shards:
+            self.shards.append(shard)
+            self._rebuild()
+
+    def remove_shard(self, shard: int):
+        """Take a shard's virtual nodes off the ring"""
+        if shard in self.shards:
+            self.shards.remove(shard)
+            self._rebuild()
+
+    def shard_for(self, key: str) -> int:
+        """Shard owning a key (first virtual node clockwise)"""
+        if not self._positions:
+            raise LookupError("Hash ring has no shards")
+        i = bisect.bisect(self._positions, _ring_hash(key)) % len(self._positions)
+        return self._owners[i]
+
+@dataclass
+class ShardReport:
+    """One worker's partial aggregate for one cycle"""
+    shard: int
+    cycle: int
+    count: int
+    mean: float
+    m2: float
+    cells_owned: int
+    cells_monitored: int
+    guidance_sent: int
+    guidance_suppressed: int
+    duration: float
+    timestamp: float
+
+def harmony_from_partials(reports: List[ShardReport]) -> float:
+    """
+    Global harmony from shard partials
+
+    Matches calculate_harmony over every shard's levels to within
+    floating-point merge error: the partial moments are combined with
+    RunningMoments.merge rather than the levels themselves.
+    """
+    from batch_orchestration import RunningMoments
+
+    moments = RunningMoments()
+    for r in reports:
+        moments = moments.merge(RunningMoments(r.count, r.mean, r.m2))
+    return moments.harmony()
+
+def _shard_report(shard: int, cycle: int, results: Dict[str, Any], cells_owned: int,
+                  duration: float) -> ShardReport:
+    """Reduce one cycle's results to a partial aggregate"""
+    from batch_orchestration import RunningMoments
+
+    moments = RunningMoments.from_values(
+        [state["consciousness"] for state in results["cell_states"].values()
+         if state["health"] == "healthy"])
+    return ShardReport(
+        shard=shard,
+        cycle=cycle,
+        count=moments.count,
+        mean=moments.mean,
+        m2=moments.m2,
+        cells_owned=cells_owned,
+        cells_monitored=results["cells_monitored"],
+        guidance_sent=results["guidance_sent"],
+        guidance_suppressed=results.get("guidance_suppressed", 0),
+        duration=duration,
+        timestamp=results["timestamp"]
+    )
+
+async def _shard_loop(shard: int, commands, reports, options: Dict[str, Any]):
+    """Worker event loop: apply commands, run cycles, report partials"""
+    from async_cell_client import AsyncOrchestratorClient
+
+    interval = options.get("interval")
+    async with AsyncOrchestratorClient(max_concurrency=options["max_concurrency"],
+                                       cell_deadline=options["cell_deadline"]) as orchestrator:
+        next_due = time.monotonic() if interval else None
+        requested: List[int] = []
+        local_cycle = 0
+        while True:
+            try:
+                while True:
+                    command = commands.get_nowait()
+                    kind = command[0]
+                    if kind == "register":
+                        orchestrator.register_cell(command[1], command[2])
+                    elif kind == "unregister":
+                        orchestrator.unregister_cell(command[1])
+                    elif kind == "cycle":
+                        requested.append(command[1])
+                    elif kind == "stop":
+                        return
+            except queue.Empty:
+                pass
+
+            now = time.monotonic()
+            if requested or (next_due is not None and now >= next_due):
+                if requested:
+                    cycle = requested.pop(0)
+                else:
+                    local_cycle -= 1  # Self-scheduled cycles count downwards
+                    cycle = local_cycle
+                started = time.perf_counter()
+                results = await orchestrator.orchestrate_evolution()
+                reports.put(_shard_report(shard, cycle, results, len(orchestrator.cells),
+                                          time.perf_counter() - started))
+                if next_due is not None:
+                    next_due = max(next_due + interval, time.monotonic())
+                continue
+
+            await asyncio.sleep(COMMAND_POLL_INTERVAL)
+
+def _shard_worker(shard: int, commands, reports, options: Dict[str, Any]):
+    """Process entry point for one shard"""
+    logging.basicConfig(level=options.get("log_level", logging.WARNING))
+    try:
+        asyncio.run(_shard_loop(shard, commands, reports, options))
+    except KeyboardInterrupt:
+        pass
+
+class ShardedOrchestrator:
+    """
+    Coordinator for N orchestration worker processes
+
+    The coordinator owns the hash ring and the cell registry; workers own
+    the sockets and run the cycles. Use as a context manager (or call
+    stop()) so worker processes are shut down.
+    """
+
+    def __init__(self, workers: int = 4, vnodes: int = DEFAULT_VNODES,
+                 interval: Optional[float] = None, max_concurrency: int = 100,
+                 cell_deadline: float = 10.0):
+        """
+        Initialize coordinator
+
+        Args:
+            workers: Worker processes to start
+            vnodes: Virtual nodes per worker on the hash ring
+            interval: Seconds between each worker's own cycles
+                (None = cycle only when run_cycle() asks)
+            max_concurrency: Cells in flight per worker
+            cell_deadline: Per-cell deadline in seconds
+        """
+        self.initial_workers = workers
+        self.options = {
+            "interval": interval,
+            "max_concurrency": max_concurrency,
+            "cell_deadline": cell_deadline,
+            "log_level": logging.getLogger().getEffectiveLevel(),
+        }
+        self.ring = ConsistentHashRing(vnodes)
+        self.cell_urls: Dict[str, str] = {}
+        self.assignments: Dict[str, int] = {}
+        self.latest_reports: Dict[int, ShardReport] = {}
+
+        self._context = multiprocessing.get_context()
+        self._reports = self._context.Queue()
+        self._commands: Dict[int, Any] = {}
+        self._processes: Dict[int, multiprocessing.Process] = {}
+        self._next_shard = 0
+        self._cycle = 0
+
+    def __enter__(self) -> "ShardedOrchestrator":
+        self.start()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.stop()
+
+    def _spawn(self) -> int:
+        """Start one worker process and return its shard id"""
+        shard = self._next_shard
+        self._next_shard += 1
+        commands = self._context.Queue()
+        process = self._context.Process(target=_shard_worker, name=f"aios-shard-{shard}",
+                                        args=(shard, commands, self._reports, self.options),
+                                        daemon=True)
+        process.start()
+        self._commands[shard] = commands
+        self._processes[shard] = process
+        logger.info(f"Started shard {shard} (pid {process.pid})")
+        return shard
+
+    def start(self):
+        """Start the initial worker processes"""
+        for _ in range(self.initial_workers - len(self._processes)):
+            self.ring.add_shard(self._spawn())
+
+    def stop(self):
+        """Stop every worker process"""
+        for commands in self._commands.values():
+            commands.put(("stop",))
+        for shard, process in self._processes.items():
+            process.join(timeout=10.0)
+            if process.is_alive():
+                logger.warning(f"Shard {shard} did not stop; terminating")
+                process.terminate()
+        self._commands.clear()
+        self._processes.clear()
+
+    def register_cell(self, cell_id: str, base_url: str) -> int:
+        """Assign a cell to its shard and register it there"""
+        if cell_id in self.assignments:
+            self.unregister_cell(cell_id)
+        shard = self.ring.shard_for(cell_id)
+        self.cell_urls[cell_id] = base_url
+        self.assignments[cell_id] = shard
+        self._commands[shard].put(("register", cell_id, base_url))
+        return shard
+
+    def unregister_cell(self, cell_id: str) -> bool:
+        """Remove a cell from its shard"""
+        shard = self.assignments.pop(cell_id, None)
+        self.cell_urls.pop(cell_id, None)
+        if shard is None:
+            return False
+        self._commands[shard].put(("unregister", cell_id))
+        return True
+
+    def _rebalance(self) -> int:
+        """Move every cell whose ring owner changed; returns cells moved"""
+        moved = 0
+        for cell_id, shard in list(self.assignments.items()):
+            owner = self.ring.shard_for(cell_id)
+            if owner == shard:
+                continue
+            if shard in self._commands:
+                self._commands[shard].put(("unregister", cell_id))
+            self._commands[owner].put(("register", cell_id, self.cell_urls[cell_id]))
+            self.assignments[cell_id] = owner
+            moved += 1
+        return moved
+
+    def add_shard(self) -> Tuple[int, int]:
+        """
+        Start another worker and hand it its share of the ring
+
+        Returns:
+            Tuple of (new shard id, cells moved)
+        """
+        shard = self._spawn()
+        self.ring.add_shard(shard)
+        moved = self._rebalance()
+        logger.info(f"Shard {shard} joined; moved {moved} of {len(self.assignments)} cells")
+        return shard, moved
+
+    def remove_shard(self, shard: int) -> int:
+        """
+        Stop a worker and spread its cells over the remaining shards
+
+        Returns:
+            Cells moved
+        """
+        if shard not in self._processes:
+            raise KeyError(f"Unknown shard {shard}")
+        self.ring.remove_shard(shard)
+        moved = self._rebalance()
+        self._commands.pop(shard).put(("stop",))
+        self._processes.pop(shard).join(timeout=10.0)
+        self.latest_reports.pop(shard, None)
+        logger.info(f"Shard {shard} left; moved {moved} cells")
+        return moved
+
+    def collect(self, timeout: float = 0.0) -> List[ShardReport]:
+        """Drain shard reports that have arrived (waiting up to timeout for the first)"""
+        received = []
+        try:
+            report = self._reports.get(timeout=timeout) if timeout > 0 else self._reports.get_nowait()
+            while True:
+                if report.shard in self._processes:
+                    self.latest_reports[report.shard] = report
+                    received.append(report)
+                report = self._reports.get_nowait()
+        except queue.Empty:
+            pass
+        return received
+
+    def global_harmony(self) -> float:
+        """Harmony across every shard's latest report"""
+        return harmony_from_partials(list(self.latest_reports.values()))
+
+    def run_cycle(self, timeout: float = 60.0) -> Dict[str, Any]:
+        """
+        Ask every shard for one cycle and combine their reports
+
+        Shards that miss the timeout are reported as missing and their
+        previous partial is left out of this cycle's harmony.
+        """
+        self._cycle += 1
+        cycle = self._cycle
+        for commands in self._commands.values():
+            commands.put(("cycle", cycle))
+
+        deadline = time.monotonic() + timeout
+        cycle_reports: Dict[int, ShardReport] = {}
+        while len(cycle_reports) < len(self._processes):
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            for report in self.collect(timeout=min(remaining, 1.0)):
+                if report.cycle == cycle:
+                    cycle_reports[report.shard] = report
+
+        reports = list(cycle_reports.values())
+        return {
+            "timestamp": time.time(),
+            "shards": len(self._processes),
+            "shards_missing": sorted(set(self._processes) - set(cycle_reports)),
+            "cells_registered": len(self.assignments),
+            "cells_monitored": sum(r.cells_monitored for r in reports),
+            "guidance_sent": sum(r.guidance_sent for r in reports),
+            "guidance_suppressed": sum(r.guidance_suppressed for r in reports),
+            "harmony_score": harmony_from_partials(reports),
+            "shard_reports": {r.shard: asdict(r) for r in reports},
+        }
+
+    def shard_sizes(self) -> Dict[int, int]:
+        """Cells assigned to each shard"""
+        sizes = {shard: 0 for shard in self._processes}
+        for shard in self.assignments.values():
+            sizes[shard] = sizes.get(shard, 0) + 1
+        return sizes
+
+def main():
+    """Run a sharded orchestrator against a fleet"""
+    logging.basicConfig(level=logging.INFO)
+    parser = argparse.ArgumentParser(description="AIOS sharded orchestrator")
+    parser.add_argument("--workers", type=int, default=4, help="Worker processes")
+    parser.add_argument("--vnodes", type=int, default=DEFAULT_VNODES, help="Virtual nodes per worker")
+    parser.add_argument("--concurrency", type=int, default=100, help="Cells in flight per worker")
+    parser.add_argument("--deadline", type=float, default=10.0, help="Per-cell deadline in seconds")
+    parser.add_argument("--interval", type=float, default=60.0, help="Seconds between cycles")
+    parser.add_argument("--fleet", help="Base URL of a cell_fleet_simulator to orchestrate")
+    parser.add_argument("--fleet-size", type=int, default=1000, help="Simulated cells to register")
+    parser.add_argument("--once", action="store_true", help="Run a single cycle and exit")
+    args = parser.parse_args()
+
+    with ShardedOrchestrator(workers=args.workers, vnodes=args.vnodes,
+                             max_concurrency=args.concurrency,
+                             cell_deadline=args.deadline) as orchestrator:
+        if args.fleet:
+            from cell_fleet_simulator import fleet_cell_urls
+            for cell_id, base_url in fleet_cell_urls(args.fleet, args.fleet_size):
+                orchestrator.register_cell(cell_id, base_url)
+        else:
+            orchestrator.register_cell("alpha", "http://localhost:8000")
+        logger.info(f"Shard sizes: {orchestrator.shard_sizes()}")
+
+        try:
+            while True:
+                started = time.perf_counter()
+                results = orchestrator.run_cycle(timeout=args.deadline * 2 + 5)
+                logger.info(f"Harmony score: {results['harmony_score']:.3f} "
+                            f"({results['cells_monitored']} cells across {results['shards']} shards "
+                            f"in {time.perf_counter() - started:.3f}s)")
+                if args.once:
+                    return
+                time.sleep(args.interval)
+        except KeyboardInterrupt:
+            logger.info("Orchestration stopped by user")
+
+if __name__ == "__main__":
+    main()
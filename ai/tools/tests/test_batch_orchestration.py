@@ -0,0 +1,30 @@
+"""Batch harmony against the pure-Python reference"""
+
+import numpy as np
+import pytest
+
+from batch_orchestration import batch_harmony, group_harmony
+from cell_client import BATCH_HARMONY_THRESHOLD, calculate_harmony, scalar_harmony
+
+@pytest.mark.parametrize("size", [2, 17, BATCH_HARMONY_THRESHOLD, 10000])
+def test_batch_harmony_matches_scalar(size):
+    levels = np.random.default_rng(size).uniform(3.0, 5.0, size).tolist()
+    expected = scalar_harmony(levels)
+    assert batch_harmony(levels) == pytest.approx(expected, rel=1e-12, abs=1e-12)
+    assert calculate_harmony(levels) == pytest.approx(expected, rel=1e-12, abs=1e-12)
+
+def test_harmony_of_fewer_than_two_cells_is_zero():
+    assert scalar_harmony([4.2]) == batch_harmony([4.2]) == 0.0
+
+def test_group_harmony_matches_scalar_per_group():
+    rng = np.random.default_rng(7)
+    levels = rng.uniform(3.0, 5.0, 600)
+    groups = rng.choice(["tecnocrat", "hp_lab", "single"], 600).tolist()
+    groups[0] = "lonely"
+
+    harmony = group_harmony(levels, groups)
+
+    assert harmony["lonely"] == 0.0
+    for group in ("tecnocrat", "hp_lab", "single"):
+        members = [level for level, g in zip(levels.tolist(), groups) if g == group]
+        assert harmony[group] == pytest.approx(scalar_harmony(members), rel=1e-12, abs=1e-12)
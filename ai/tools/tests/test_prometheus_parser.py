@@ -0,0 +1,24 @@
+"""Push-style use of the incremental exposition parser"""
+
+from prometheus_parser import PrometheusStreamParser, parse_text
+
+def test_feed_parses_without_being_iterated():
+    parser = PrometheusStreamParser()
+    parser.feed("aios_consciousness_level 4.2\naios_awar")
+    samples = parser.feed(b"eness_level 4.0\n")
+    assert [(s.name, s.value) for s in samples] == [("aios_awareness_level", 4.0)]
+
+def test_close_flushes_line_without_newline():
+    parser = PrometheusStreamParser()
+    assert parser.feed('aios_quantum_coherence{cell="alpha"} 0.7') == []
+    samples = parser.close()
+    assert [(s.name, s.labels, s.value) for s in samples] == [
+        ("aios_quantum_coherence", {"cell": "alpha"}, 0.7)]
+
+def test_parse_text_matches_chunked_feed():
+    text = "# TYPE a gauge\na 1\nb{x=\"y\"} 2 123\n# EOF\nc 3\n"
+    parser = PrometheusStreamParser()
+    chunked = [sample for i in range(0, len(text), 5) for sample in parser.feed(text[i:i + 5])]
+    chunked += parser.close()
+    assert chunked == parse_text(text)
+    assert [s.name for s in chunked] == ["a", "b"]
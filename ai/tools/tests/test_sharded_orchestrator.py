@@ -0,0 +1,25 @@
+"""Harmony merged from shard partials against the single-process result"""
+
+import numpy as np
+import pytest
+
+from cell_client import scalar_harmony
+from sharded_orchestrator import _shard_report, harmony_from_partials
+
+def _report(shard: int, levels, unhealthy: int = 0):
+    cell_states = {f"cell-{shard}-{i}": {"consciousness": level, "health": "healthy"}
+                   for i, level in enumerate(levels)}
+    cell_states.update({f"down-{shard}-{i}": {"consciousness": 0.0, "health": "unreachable"}
+                        for i in range(unhealthy)})
+    results = {"cell_states": cell_states, "cells_monitored": len(cell_states),
+               "guidance_sent": 0, "timestamp": 0.0}
+    return _shard_report(shard, 1, results, len(cell_states), 0.0)
+
+@pytest.mark.parametrize("shards", [1, 4, 16])
+def test_harmony_from_partials_matches_calculate_harmony(shards):
+    levels = np.random.default_rng(shards).uniform(3.5, 5.0, 5000).tolist()
+    reports = [_report(shard, levels[shard::shards], unhealthy=2) for shard in range(shards)]
+    assert harmony_from_partials(reports) == pytest.approx(scalar_harmony(levels), abs=1e-9)
+
+def test_harmony_from_partials_needs_two_cells():
+    assert harmony_from_partials([_report(0, [4.2]), _report(1, [])]) == 0.0
@@ -0,0 +1,252 @@
+#!/usr/bin/env python3
+"""
+AIOS Diagnostic History Store
+Append-only SQLite history of peer sync diagnostic runs with indexed
+trend queries
+"""
+
+# Standard Library Imports
+import json
+import sqlite3
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Any, Iterable, List, Optional, Tuple
+
+
+DEFAULT_HISTORY_PATH = Path(__file__).resolve().parents[1] / "aios-core" / \
+    "tachyonic" / "reports" / "health" / "aios_sync_history.db"
+DEFAULT_RETENTION_DAYS = 90
+# Appends between retention passes
+ROTATE_EVERY = 100
+SECONDS_PER_DAY = 86400
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    id INTEGER PRIMARY KEY,
+    ts REAL NOT NULL,
+    mode TEXT NOT NULL,
+    results TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS probes (
+    run_id INTEGER NOT NULL,
+    ts REAL NOT NULL,
+    endpoint TEXT NOT NULL,
+    ok INTEGER NOT NULL,
+    http_status INTEGER,
+    latency_ms REAL,
+    p95_ms REAL,
+    loss_rate REAL
+);
+CREATE INDEX IF NOT EXISTS runs_ts ON runs(ts);
+CREATE INDEX IF NOT EXISTS probes_endpoint_ts ON probes(endpoint, ts);
+CREATE INDEX IF NOT EXISTS probes_endpoint_ok_ts
+    ON probes(endpoint, ok, ts);
+"""
+
+
+def probe_rows(results: Dict[str, Any]) -> List[Tuple]:
+    """
+    Flatten one run's results into per-endpoint probe rows
+
+    One-shot probes contribute their response time; watch summaries
+    contribute p50 as latency_ms plus p95 and loss rate; sweeps
+    contribute one row per declared service as "sweep:HOST/service".
+
+    Returns:
+        List of (endpoint, ok, http_status, latency_ms, p95_ms,
+        loss_rate) tuples
+    """
+    rows = []
+    probes = {**results.get("local_services", {}),
+              **results.get("desktop_connectivity", {})}
+    for endpoint, probe in probes.items():
+        ok = probe.get("status") == "reachable" and \
+            probe.get("http_status", 500) < 500
+        rows.append((endpoint, int(ok), probe.get("http_status"),
+                     probe.get("response_time_ms"), None, None))
+    for endpoint, summary in results.get("watch", {}).items():
+        ok = summary.get("samples", 0) > 0 and \
+            summary.get("loss_rate", 1.0) < 1.0
+        rows.append((endpoint, int(ok), None, summary.get("p50_ms"),
+                     summary.get("p95_ms"), summary.get("loss_rate")))
+    sweep = results.get("sweep", {})
+    for ok, entries in ((1, sweep.get("up", [])),
+                        (0, sweep.get("missing", []))):
+        for entry in entries:
+            rows.append((f"sweep:{entry['host']}/{entry['service']}", ok,
+                         None, entry.get("connect_ms"), None, None))
+    return rows
+
+
+def _percentile(values: List[float], q: float) -> float:
+    """Nearest-rank percentile of a sorted list"""
+    if not values:
+        return 0.0
+    return values[min(len(values) - 1, int(q * (len(values) - 1) + 0.5))]
+
+
+class DiagnosticHistory:
+    """
+    Append-only diagnostic history in one SQLite file
+
+    Each run is one row holding its compact JSON results, plus one
+    indexed row per probed endpoint. Trend and failure queries read
+    only the (endpoint, ts) index range they need, never every run.
+    Rotation deletes runs older than the retention window and returns
+    the freed pages to the filesystem.
+
+    Attributes:
+        path (Path): SQLite database file
+        retention_days (float): Age after which runs are rotated out
+    """
+    def __init__(self, path: Optional[str] = None,
+                 retention_days: float = DEFAULT_RETENTION_DAYS):
+        self.path = Path(path) if path else DEFAULT_HISTORY_PATH
+        self.retention_days = retention_days
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.conn = sqlite3.connect(self.path)
+        # auto_vacuum only takes effect before the first table exists
+        self.conn.execute("PRAGMA auto_vacuum = INCREMENTAL")
+        self.conn.execute("PRAGMA journal_mode = WAL")
+        self.conn.executescript(SCHEMA)
+        self._appends = 0
+
+    def close(self):
+        """Close the database"""
+        self.conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+        return False
+
+    def append(self, results: Dict[str, Any], mode: str = "diagnostic",
+               ts: Optional[float] = None) -> int:
+        """
+        Append one run
+
+        Args:
+            results: AIOSPeerSyncDiagnostic.results
+            mode: "diagnostic", "watch" or "sweep"
+            ts: Run time as a Unix timestamp (default: now)
+
+        Returns:
+            Run id
+        """
+        ts = time.time() if ts is None else ts
+        with self.conn:
+            run_id = self.conn.execute(
+                "INSERT INTO runs (ts, mode, results) VALUES (?, ?, ?)",
+                (ts, mode, json.dumps(results, separators=(",", ":"),
+                                      default=str))).lastrowid
+            self.conn.executemany(
+                "INSERT INTO probes (run_id, ts, endpoint, ok, "
+                "http_status, latency_ms, p95_ms, loss_rate) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                [(run_id, ts, *row) for row in probe_rows(results)])
+        self._appends += 1
+        if self._appends % ROTATE_EVERY == 1:
+            self.rotate(now=ts)
+        return run_id
+
+    def rotate(self, now: Optional[float] = None) -> int:
+        """
+        Delete runs older than the retention window
+
+        Returns:
+            Number of runs removed
+        """
+        cutoff = (time.time() if now is None else now) - \
+            self.retention_days * SECONDS_PER_DAY
+        with self.conn:
+            self.conn.execute("DELETE FROM probes WHERE ts < ?", (cutoff,))
+            removed = self.conn.execute(
+                "DELETE FROM runs WHERE ts < ?", (cutoff,)).rowcount
+        if removed:
+            self.conn.execute("PRAGMA incremental_vacuum")
+        return removed
+
+    def _samples(self, endpoint: str, since: float) \
+            -> Iterable[Tuple[float, int, Optional[float], Optional[float]]]:
+        """(ts, ok, latency_ms, p95_ms) for an endpoint, oldest first"""
+        return self.conn.execute(
+            "SELECT ts, ok, latency_ms, p95_ms FROM probes "
+            "WHERE endpoint = ? AND ts >= ? ORDER BY ts",
+            (endpoint, since))
+
+    def latency_trend(self, endpoint: str, days: float = 7,
+                      quantile: float = 0.95,
+                      now: Optional[float] = None) -> List[Dict[str, Any]]:
+        """
+        Daily latency percentile and failure count for one endpoint
+
+        Watch runs contribute their own p95 to the 0.95 percentile and
+        their p50 otherwise.
+
+        Args:
+            endpoint: e.g. "desktop_cell"
+            days: Days of history to cover
+            quantile: Percentile to report per day
+            now: End of the window as a Unix timestamp (default: now)
+
+        Returns:
+            One dict per day with samples, failures and the percentile
+        """
+        now = time.time() if now is None else now
+        by_day: Dict[str, Dict[str, Any]] = {}
+        for ts, ok, latency_ms, p95_ms in self._samples(
+                endpoint, now - days * SECONDS_PER_DAY):
+            day = datetime.fromtimestamp(ts).strftime("%Y-%m-%d")
+            bucket = by_day.setdefault(
+                day, {"samples": 0, "failures": 0, "latencies": []})
+            bucket["samples"] += 1
+            if not ok:
+                bucket["failures"] += 1
+                continue
+            value = p95_ms if quantile == 0.95 and p95_ms is not None \
+                else latency_ms
+            if value is not None:
+                bucket["latencies"].append(value)
+        trend = []
+        for day, bucket in by_day.items():
+            latencies = sorted(bucket.pop("latencies"))
+            trend.append({"day": day, **bucket,
+                          f"p{int(quantile * 100)}_ms":
+                              round(_percentile(latencies, quantile), 3)})
+        return trend
+
+    def first_failure_after_last_success(self, endpoint: str) \
+            -> Optional[Dict[str, Any]]:
+        """
+        Start of the endpoint's current outage
+
+        Returns:
+            Dict with the failing run's id, timestamp and the last
+            success timestamp, or None when the latest probe succeeded
+            or the endpoint has never failed
+        """
+        last_success = self.conn.execute(
+            "SELECT MAX(ts) FROM probes WHERE endpoint = ? AND ok = 1",
+            (endpoint,)).fetchone()[0]
+        row = self.conn.execute(
+            "SELECT run_id, ts FROM probes "
+            "WHERE endpoint = ? AND ok = 0 AND ts > ? ORDER BY ts LIMIT 1",
+            (endpoint, last_success or 0.0)).fetchone()
+        if row is None:
+            return None
+        return {
+            "endpoint": endpoint,
+            "run_id": row[0],
+            "first_failure": datetime.fromtimestamp(row[1]).isoformat(),
+            "last_success": datetime.fromtimestamp(last_success).isoformat()
+            if last_success else None
+        }
+
+    def run(self, run_id: int) -> Optional[Dict[str, Any]]:
+        """Full results of one stored run"""
+        row = self.conn.execute("SELECT results FROM runs WHERE id = ?",
+                                (run_id,)).fetchone()
+        return json.loads(row[0]) if row else None
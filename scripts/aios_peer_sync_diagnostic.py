@@ -6,15 +6,410 @@
 """
 
 # Standard Library Imports
+import argparse
 import asyncio
+import ipaddress
 import json
+import os
+import time
+from array import array
+from contextlib import suppress
+from dataclasses import dataclass
 from datetime import datetime
 from pathlib import Path
-from typing import Dict, Any
+from urllib.parse import urlparse
+from typing import Dict, Any, Iterable, List, Optional, Tuple
 
 # Third Party Imports
 import aiohttp
 
+# Local Imports
+from aios_diagnostic_history import (DEFAULT_HISTORY_PATH,
+                                     DEFAULT_RETENTION_DAYS,
+                                     DiagnosticHistory)
+
+
+# Latency histogram layout: values in microseconds, exact below
+# HISTOGRAM_SUB_BUCKETS, then HISTOGRAM_SUB_BUCKETS log-linear buckets per
+# power of two (~1.6% relative error) up to 2**HISTOGRAM_MAX_EXPONENT us
+HISTOGRAM_SUB_BUCKETS = 64
+HISTOGRAM_MAX_EXPONENT = 27
+HISTOGRAM_SIZE = HISTOGRAM_SUB_BUCKETS * (HISTOGRAM_MAX_EXPONENT - 5)
+WATCH_QUANTILES = (0.5, 0.95, 0.99)
+
+# cold: a new connection (and DNS lookup) per probe
+# warm: keep-alive connections primed before measuring
+CONNECTION_MODES = ("cold", "warm")
+
+# aiohttp trace hook -> timestamp mark recorded in the probe's context
+TRACE_MARKS = (
+    ("on_request_start", "start"),
+    ("on_dns_resolvehost_start", "dns_start"),
+    ("on_dns_resolvehost_end", "dns_end"),
+    ("on_connection_create_start", "connect_start"),
+    ("on_connection_create_end", "connect_end"),
+    ("on_connection_reuseconn", "reused"),
+    ("on_request_headers_sent", "sent"),
+    ("on_request_end", "headers"),
+)
+PHASE_NAMES = ("dns", "connect", "ttfb", "body")
+
+DEFAULT_HOSTS_CONFIG = Path(__file__).resolve().parents[1] / "config" / \
+    "hosts.yaml"
+# Desktop cell used when hosts.yaml is unavailable or declares none
+DEFAULT_DESKTOP_CELL = "http://192.168.1.128:8000"
+
+SWEEP_CONCURRENCY = 256
+SWEEP_CONNECT_TIMEOUT = 0.5
+
+
+def _trace_marker(mark: str):
+    """Trace hook recording perf_counter_ns() under mark"""
+    async def record(session, trace_config_ctx, params):
+        marks = trace_config_ctx.trace_request_ctx
+        if marks is not None:
+            marks[mark] = time.perf_counter_ns()
+    return record
+
+
+def probe_trace_config() -> aiohttp.TraceConfig:
+    """TraceConfig timestamping each connection phase of a request"""
+    trace_config = aiohttp.TraceConfig()
+    for hook, mark in TRACE_MARKS:
+        getattr(trace_config, hook).append(_trace_marker(mark))
+    return trace_config
+
+
+def phase_timings(marks: Dict[str, int], finished_ns: int,
+                  url: str) -> Dict[str, Any]:
+    """
+    Per-phase timings in ms from a probe's trace marks
+
+    DNS and connect are 0 when the lookup was cached or the connection
+    reused. aiohttp has no hook between the TCP connect and the TLS
+    handshake, so for https the handshake is part of connect_ms and
+    tls_ms is None.
+
+    Args:
+        marks: Trace mark -> perf_counter_ns() timestamp
+        finished_ns: Timestamp when the body was fully read
+        url: Probed URL
+
+    Returns:
+        dns_ms, connect_ms, ttfb_ms, body_ms, total_ms and connection
+        ("new" or "reused")
+    """
+    def span(begin: str, end: str) -> int:
+        if begin in marks and end in marks:
+            return marks[end] - marks[begin]
+        return 0
+
+    dns_ns = span("dns_start", "dns_end")
+    connect_ns = max(0, span("connect_start", "connect_end") - dns_ns)
+    ready = marks.get("connect_end", marks.get("reused", marks["start"]))
+    headers = marks.get("headers", finished_ns)
+    phases = {
+        "dns_ms": round(dns_ns / 1e6, 3),
+        "connect_ms": round(connect_ns / 1e6, 3),
+        "ttfb_ms": round((headers - marks.get("sent", ready)) / 1e6, 3),
+        "body_ms": round((finished_ns - headers) / 1e6, 3),
+        "total_ms": round((finished_ns - marks["start"]) / 1e6, 3),
+        "connection": "reused" if "reused" in marks else "new",
+    }
+    if url.startswith("https:"):
+        phases["tls_ms"] = None
+    return phases
+
+
+@dataclass
+class ServiceEndpoint:
+    """One service declared in hosts.yaml"""
+    host: str
+    name: str
+    ip: str
+    port: int
+    type: str = "unknown"
+
+
+class HostRegistry:
+    """
+    hosts.yaml loaded once into lookup indexes
+
+    Attributes:
+        subnet (str): Network subnet, e.g. "192.168.1.0/24"
+        discovery_ports (list): Ports probed on every subnet address
+        connection_timeout (float): Sweep connect timeout for declared
+            services unless --connect-timeout overrides it
+        primary_host (str): Federation primary host key
+        addresses (dict): ip / hostname / mDNS name -> host key
+        endpoints (dict): (ip, port) -> ServiceEndpoint
+    """
+    def __init__(self, config: Dict[str, Any]):
+        network = config.get("network") or {}
+        discovery = config.get("discovery") or {}
+        self.subnet = network.get("subnet")
+        self.discovery_ports = [int(port) for port in
+                                network.get("discovery_ports") or []]
+        self.connection_timeout = float(
+            discovery.get("connection_timeout", SWEEP_CONNECT_TIMEOUT))
+        self.primary_host = (config.get("federation") or {}) \
+            .get("primary_host")
+        self.addresses: Dict[str, str] = {}
+        self.endpoints: Dict[Tuple[str, int], ServiceEndpoint] = {}
+        for key, host in (config.get("hosts") or {}).items():
+            ip = host.get("ip")
+            for address in [ip, host.get("hostname"),
+                            *(host.get("mdns_names") or [])]:
+                if address:
+                    self.addresses[str(address).lower()] = key
+            if not ip:
+                continue
+            for service in host.get("services") or []:
+                endpoint = ServiceEndpoint(
+                    host=key, name=service.get("name", "unknown"), ip=ip,
+                    port=int(service["port"]),
+                    type=service.get("type", "unknown"))
+                self.endpoints[(ip, endpoint.port)] = endpoint
+
+    @classmethod
+    def load(cls, config_path: Optional[str] = None) -> "HostRegistry":
+        """Read and index hosts.yaml (default: config/hosts.yaml)"""
+        import yaml
+
+        path = Path(config_path) if config_path else DEFAULT_HOSTS_CONFIG
+        return cls(yaml.safe_load(path.read_text(encoding="utf-8")) or {})
+
+    def host_for(self, address: str) -> Optional[str]:
+        """Host key an address belongs to, if declared"""
+        return self.addresses.get(address.lower())
+
+    def desktop_cell(self) -> Optional[str]:
+        """Base URL of the primary host's consciousness service"""
+        if not self.primary_host:
+            return None
+        return self.service_url(self.primary_host, "consciousness")
+
+    def service_url(self, host: str, service_type: str) -> Optional[str]:
+        """Base URL of a host's first service of the given type"""
+        for endpoint in self.endpoints.values():
+            if endpoint.host == host and endpoint.type == service_type:
+                return f"http://{endpoint.ip}:{endpoint.port}"
+        return None
+
+    def sweep_targets(self, include_subnet: bool = False) \
+            -> List[Tuple[str, int]]:
+        """
+        (ip, port) pairs to probe
+
+        Every declared service, plus every address of the subnet on
+        each discovery port when include_subnet is set.
+        """
+        targets = dict.fromkeys(self.endpoints)
+        if include_subnet and self.subnet:
+            network = ipaddress.ip_network(self.subnet, strict=False)
+            for address in network.hosts():
+                for port in self.discovery_ports:
+                    targets.setdefault((str(address), port))
+        return list(targets)
+
+
+async def _tcp_connect(ip: str, port: int, timeout: float,
+                       semaphore: asyncio.Semaphore) -> Optional[float]:
+    """TCP connect time in ms, or None when closed or timed out"""
+    async with semaphore:
+        start_ns = time.perf_counter_ns()
+        try:
+            _, writer = await asyncio.wait_for(
+                asyncio.open_connection(ip, port), timeout)
+        except (OSError, asyncio.TimeoutError):
+            return None
+        elapsed_ns = time.perf_counter_ns() - start_ns
+        writer.close()
+        with suppress(OSError):
+            await writer.wait_closed()
+        return round(elapsed_ns / 1e6, 3)
+
+
+async def sweep(registry: HostRegistry,
+                targets: Iterable[Tuple[str, int]],
+                concurrency: int = SWEEP_CONCURRENCY,
+                timeout: float = SWEEP_CONNECT_TIMEOUT,
+                declared_timeout: Optional[float] = None) -> Dict[str, Any]:
+    """
+    Connect to every target and diff the open ports with hosts.yaml
+
+    At most `concurrency` connects are in flight, each bounded by
+    `timeout`, so a full /24 on three ports takes a few timeouts' worth
+    of wall time even when most addresses do not answer. Declared
+    services may be given the longer `declared_timeout`; there are few
+    of them, so it does not stretch the sweep by more than one wait.
+
+    Returns:
+        Dict with "up" and "missing" (declared services), "unexpected"
+        (open but undeclared endpoints), counts and elapsed seconds
+    """
+    targets = list(targets)
+    semaphore = asyncio.Semaphore(concurrency)
+    started = time.perf_counter()
+    if declared_timeout is None:
+        declared_timeout = timeout
+    connect_times = await asyncio.gather(
+        *(_tcp_connect(ip, port,
+                       declared_timeout if (ip, port) in registry.endpoints
+                       else timeout, semaphore)
+          for ip, port in targets))
+    elapsed = time.perf_counter() - started
+
+    up, missing, unexpected = [], [], []
+    for (ip, port), connect_ms in zip(targets, connect_times):
+        endpoint = registry.endpoints.get((ip, port))
+        if endpoint is not None:
+            entry = {"host": endpoint.host, "service": endpoint.name,
+                     "type": endpoint.type, "ip": ip, "port": port}
+            if connect_ms is None:
+                missing.append(entry)
+            else:
+                up.append({**entry, "connect_ms": connect_ms})
+        elif connect_ms is not None:
+            unexpected.append({"host": registry.host_for(ip), "ip": ip,
+                               "port": port, "connect_ms": connect_ms})
+    return {
+        "probed": len(targets),
+        "open": sum(1 for t in connect_times if t is not None),
+        "elapsed_s": round(elapsed, 3),
+        "concurrency": concurrency,
+        "timeout_s": timeout,
+        "declared_timeout_s": declared_timeout,
+        "up": up,
+        "missing": missing,
+        "unexpected": unexpected
+    }
+
+
+class LatencyHistogram:
+    """
+    Constant-memory HDR-style latency histogram.
+
+    Counts live in one preallocated array: recording is an index
+    computation and an increment, and memory does not grow with the
+    number of samples. Quantiles are accurate to about 1.6%.
+    """
+    def __init__(self):
+        self.counts = array("Q", bytes(8 * HISTOGRAM_SIZE))
+        self.total = 0
+        self.max_us = 0
+
+    @staticmethod
+    def bucket_for(value_us: int) -> int:
+        """Bucket index of a latency in microseconds"""
+        if value_us < HISTOGRAM_SUB_BUCKETS:
+            return max(0, value_us)
+        shift = value_us.bit_length() - 7
+        index = (HISTOGRAM_SUB_BUCKETS + shift * HISTOGRAM_SUB_BUCKETS
+                 + (value_us >> shift) - HISTOGRAM_SUB_BUCKETS)
+        return min(index, HISTOGRAM_SIZE - 1)
+
+    @staticmethod
+    def bucket_value(index: int) -> float:
+        """Representative (midpoint) latency of a bucket in microseconds"""
+        if index < HISTOGRAM_SUB_BUCKETS:
+            return float(index)
+        shift, offset = divmod(index - HISTOGRAM_SUB_BUCKETS,
+                               HISTOGRAM_SUB_BUCKETS)
+        low = (HISTOGRAM_SUB_BUCKETS + offset) << shift
+        return low + ((1 << shift) - 1) / 2
+
+    def record(self, value_us: int):
+        """Record one latency"""
+        self.counts[self.bucket_for(value_us)] += 1
+        self.total += 1
+        if value_us > self.max_us:
+            self.max_us = value_us
+
+    def reset(self):
+        """Clear every count in place"""
+        self.counts = array("Q", bytes(8 * HISTOGRAM_SIZE))
+        self.total = 0
+        self.max_us = 0
+
+    @staticmethod
+    def quantiles(histograms: List["LatencyHistogram"],
+                  quantiles=WATCH_QUANTILES) -> Dict[str, float]:
+        """Merged quantiles (in ms) of several histograms"""
+        total = sum(h.total for h in histograms)
+        result = {f"p{int(q * 100)}_ms": 0.0 for q in quantiles}
+        if total == 0:
+            return result
+        max_us = max(h.max_us for h in histograms)
+        targets = [(q, q * (total - 1)) for q in quantiles]
+        seen = 0
+        for index in range(HISTOGRAM_SIZE):
+            count = sum(h.counts[index] for h in histograms)
+            if not count:
+                continue
+            seen += count
+            while targets and seen > targets[0][1]:
+                q, _ = targets.pop(0)
+                value = min(LatencyHistogram.bucket_value(index), max_us)
+                result[f"p{int(q * 100)}_ms"] = round(value / 1000, 3)
+            if not targets:
+                break
+        return result
+
+
+class RollingLatency:
+    """
+    Latency and loss over a sliding window.
+
+    The window is a fixed ring of slices, each with its own histogram
+    and attempt/loss counters; expired slices are reset and reused, so
+    memory stays constant for any run length.
+    """
+    def __init__(self, window_seconds: float = 60.0, slices: int = 6):
+        self.slice_seconds = window_seconds / slices
+        self.histograms = [LatencyHistogram() for _ in range(slices)]
+        self.attempts = [0] * slices
+        self.losses = [0] * slices
+        self.epochs = [-1] * slices
+
+    def _slot(self, now: float) -> int:
+        """Current slice, recycling it if it holds an expired epoch"""
+        epoch = int(now // self.slice_seconds)
+        slot = epoch % len(self.histograms)
+        if self.epochs[slot] != epoch:
+            self.histograms[slot].reset()
+            self.attempts[slot] = 0
+            self.losses[slot] = 0
+            self.epochs[slot] = epoch
+        return slot
+
+    def record(self, latency_us: Optional[int],
+               now: Optional[float] = None):
+        """Record one probe; None latency counts as a loss"""
+        slot = self._slot(time.monotonic() if now is None else now)
+        self.attempts[slot] += 1
+        if latency_us is None:
+            self.losses[slot] += 1
+        else:
+            self.histograms[slot].record(latency_us)
+
+    def summary(self, now: Optional[float] = None) -> Dict[str, Any]:
+        """Rolling p50/p95/p99/max, sample counts and loss rate"""
+        epoch = int((time.monotonic() if now is None else now)
+                    // self.slice_seconds)
+        live = [slot for slot, slot_epoch in enumerate(self.epochs)
+                if epoch - len(self.epochs) < slot_epoch <= epoch]
+        histograms = [self.histograms[slot] for slot in live]
+        attempts = sum(self.attempts[slot] for slot in live)
+        losses = sum(self.losses[slot] for slot in live)
+        summary = LatencyHistogram.quantiles(histograms)
+        summary["max_ms"] = round(
+            max((h.max_us for h in histograms), default=0) / 1000, 3)
+        summary["samples"] = attempts
+        summary["loss_rate"] = round(losses / attempts, 4) \
+            if attempts else 0.0
+        return summary
+
 
 class AIOSPeerSyncDiagnostic:
     """
@@ -33,7 +428,8 @@ class AIOSPeerSyncDiagnostic:
     - Peer discovery and network topology validation
 
     Attributes:
-        desktop_cell (str): URL of the desktop AIOS cell endpoint
+        desktop_cell (str): URL of the desktop AIOS cell endpoint, from
+            the hosts.yaml primary host when a registry is given
         bridge_endpoint (str): URL of the local bridge service endpoint
         discovery_endpoint (str): URL of the local discovery service endpoint
         results (dict): Dictionary containing all diagnostic results
@@ -43,90 +439,309 @@ class AIOSPeerSyncDiagnostic:
         >>> await diagnostic.run_diagnostics()
         >>> diagnostic.print_report()
     """
-    def __init__(self):
-        self.desktop_cell = "http://192.168.1.128:8000"
+    def __init__(self, connection_mode: str = "cold",
+                 registry: Optional[HostRegistry] = None):
+        if connection_mode not in CONNECTION_MODES:
+            raise ValueError(f"connection_mode must be one of "
+                             f"{CONNECTION_MODES}, not {connection_mode!r}")
+        self.desktop_cell = (registry and registry.desktop_cell()) \
+            or DEFAULT_DESKTOP_CELL
         self.bridge_endpoint = "http://localhost:3001"
         self.discovery_endpoint = "http://localhost:8001"
+        self.connection_mode = connection_mode
         self.results = {}
+        # Optional DiagnosticHistory that watch reports are appended to
+        self.history: Optional[DiagnosticHistory] = None
 
-    async def test_connectivity(self, url: str, timeout: int = 5) \
-            -> Dict[str, Any]:
-        """Test connectivity to a service endpoint"""
+    def _session(self) -> aiohttp.ClientSession:
+        """
+        Traced client session for the configured connection mode
+
+        Cold sessions close every connection after its response and
+        skip the DNS cache, so each probe pays the full setup cost;
+        warm sessions keep connections alive for reuse.
+        """
+        if self.connection_mode == "cold":
+            connector = aiohttp.TCPConnector(force_close=True,
+                                             use_dns_cache=False)
+        else:
+            connector = aiohttp.TCPConnector()
+        return aiohttp.ClientSession(connector=connector,
+                                     trace_configs=[probe_trace_config()])
+
+    async def _probe(self, session: aiohttp.ClientSession, url: str,
+                     timeout: int = 5, capture_body: bool = False) \
+            -> Tuple[Dict[str, Any], Any]:
+        """
+        Probe one endpoint on a shared session
+
+        Returns:
+            Tuple of (connectivity result, parsed JSON body or None).
+            The body is only parsed when capture_body is set and the
+            endpoint answered 200; a body that fails to parse is
+            reported as the result's "body_error". On a session from
+            _session() the result also carries per-phase "phases".
+        """
+        body = None
+        marks: Dict[str, int] = {}
         try:
             timeout_config = aiohttp.ClientTimeout(total=timeout)
-            async with aiohttp.ClientSession(timeout=timeout_config) \
-                    as session:
-                start_time = datetime.now()
-                async with session.get(url) as response:
-                    end_time = datetime.now()
-                    response_time = ((end_time - start_time).total_seconds()
-                                     * 1000)
-                    return {
-                        "status": "reachable",
-                        "http_status": response.status,
-                        "response_time_ms": round(response_time, 2),
-                        "url": url
-                    }
+            start_ns = time.perf_counter_ns()
+            async with session.get(url, timeout=timeout_config,
+                                   trace_request_ctx=marks) as response:
+                elapsed_ns = time.perf_counter_ns() - start_ns
+                result = {
+                    "status": "reachable",
+                    "http_status": response.status,
+                    "response_time_ms": round(elapsed_ns / 1e6, 2),
+                    "response_time_us": elapsed_ns // 1000,
+                    "url": url
+                }
+                raw = await response.read()
+                if "start" in marks:
+                    result["phases"] = phase_timings(
+                        marks, time.perf_counter_ns(), url)
+                if capture_body and response.status == 200:
+                    try:
+                        body = json.loads(raw)
+                    except (json.JSONDecodeError, ValueError,
+                            TypeError) as e:
+                        result["body_error"] = str(e)
+                return result, body
         except aiohttp.ClientError as e:
             return {
                 "status": "unreachable",
                 "error": str(e),
                 "url": url
-            }
+            }, None
         except (ValueError, TypeError, OSError, asyncio.TimeoutError) as e:
             return {
                 "status": "error",
-                "error": str(e),
+                # TimeoutError carries no message
+                "error": str(e) or type(e).__name__,
                 "url": url
-            }
+            }, None
+
+    async def test_connectivity(
+            self, url: str, timeout: int = 5,
+            session: Optional[aiohttp.ClientSession] = None) \
+            -> Dict[str, Any]:
+        """Test connectivity to a service endpoint"""
+        if session is not None:
+            result, _ = await self._probe(session, url, timeout)
+            return result
+        async with self._session() as own_session:
+            result, _ = await self._probe(own_session, url, timeout)
+            return result
 
     async def run_diagnostics(self) -> Dict[str, Any]:
-        """Run complete diagnostic suite"""
+        """
+        Run complete diagnostic suite
+
+        Every probe shares one pooled session and runs concurrently,
+        so a run takes as long as the slowest probe rather than the sum
+        of all timeouts. Bridge status and peers come from the bodies
+        of the probes themselves instead of second requests. In warm
+        mode the same probes run once first to fill the connection
+        pool, so the measured round reuses keep-alive connections.
+        """
         print("Running AIOS Peer Synchronization Diagnostics...")
         print("=" * 60)
-        # Test local services
-        print("Testing local services...")
-        bridge_health = await self.test_connectivity(
-            f"{self.bridge_endpoint}/health")
-        discovery_health = await self.test_connectivity(
-            f"{self.discovery_endpoint}/health")
+        print("Testing local services, desktop connectivity and peers "
+              f"({self.connection_mode} connections)...")
+
+        def probe_round(session):
+            return asyncio.gather(
+                self._probe(session, f"{self.bridge_endpoint}/health",
+                            capture_body=True),
+                self._probe(session, f"{self.discovery_endpoint}/health"),
+                self._probe(session, f"{self.desktop_cell}/health",
+                            timeout=10),
+                self._probe(session, f"{self.discovery_endpoint}/peers",
+                            capture_body=True))
+
+        async with self._session() as session:
+            if self.connection_mode == "warm":
+                await probe_round(session)
+            probes = await probe_round(session)
+        (bridge_health, bridge_status), (discovery_health, _), \
+            (desktop_health, _), (peers_probe, peers) = probes
+
+        self.results["connection_mode"] = self.connection_mode
         self.results["local_services"] = {
             "bridge": bridge_health,
             "discovery": discovery_health
         }
-        # Test desktop connectivity
-        print("Testing desktop connectivity...")
-        desktop_health = await self.test_connectivity(
-            f"{self.desktop_cell}/health", timeout=10)
         self.results["desktop_connectivity"] = {
             "desktop_cell": desktop_health
         }
-        # Get detailed status if available
-        if bridge_health["status"] == "reachable":
-            try:
-                async with aiohttp.ClientSession() as session:
-                    async with session.get(
-                            f"{self.bridge_endpoint}/health") as response:
-                        if response.status == 200:
-                            bridge_status = await response.json()
-                            self.results["bridge_status"] = bridge_status
-            except (aiohttp.ClientError, json.JSONDecodeError,
-                    ValueError, TypeError) as e:
-                self.results["bridge_status_error"] = str(e)
-        # Get peer information
+        # Detailed status from the health probe's own body
+        if bridge_status is not None:
+            self.results["bridge_status"] = bridge_status
+        elif "body_error" in bridge_health:
+            self.results["bridge_status_error"] = \
+                bridge_health.pop("body_error")
+        # Peer information, if discovery is up
         if discovery_health["status"] == "reachable":
-            try:
-                async with aiohttp.ClientSession() as session:
-                    async with session.get(
-                            f"{self.discovery_endpoint}/peers") as response:
-                        if response.status == 200:
-                            peers = await response.json()
-                            self.results["discovered_peers"] = peers
-            except (aiohttp.ClientError, json.JSONDecodeError,
-                    ValueError, TypeError) as e:
-                self.results["peers_error"] = str(e)
+            if peers is not None:
+                self.results["discovered_peers"] = peers
+            elif "body_error" in peers_probe:
+                self.results["peers_error"] = peers_probe["body_error"]
+            elif "error" in peers_probe:
+                # /peers failed on its own (transport error or timeout)
+                self.results["peers_error"] = peers_probe["error"]
         return self.results
 
+    def probe_targets(self) -> Dict[str, Tuple[str, int]]:
+        """Endpoint name -> (health URL, timeout) for every probe"""
+        return {
+            "bridge": (f"{self.bridge_endpoint}/health", 5),
+            "discovery": (f"{self.discovery_endpoint}/health", 5),
+            "desktop_cell": (f"{self.desktop_cell}/health", 10),
+        }
+
+    async def watch(self, rate: float = 1.0, window: float = 60.0,
+                    report_interval: float = 5.0, duration: float = 0.0,
+                    export_path: Optional[str] = None) \
+            -> Dict[str, Dict[str, Any]]:
+        """
+        Probe every endpoint at a fixed rate and report rolling latency
+
+        Probes are launched on a fixed monotonic schedule whether or not
+        earlier probes have finished, so a stalled endpoint shows up as
+        latency and loss instead of silently lowering the sample rate.
+
+        Args:
+            rate: Probes per second per endpoint
+            window: Rolling window in seconds for percentiles and loss
+            report_interval: Seconds between printed reports
+            duration: Seconds to run (0 = until interrupted)
+            export_path: JSON file rewritten with every report
+
+        Returns:
+            Final rolling summary per endpoint
+        """
+        targets = self.probe_targets()
+        stats = {name: RollingLatency(window) for name in targets}
+        in_flight = set()
+
+        async def probe(session, name, url, timeout):
+            result, _ = await self._probe(session, url, timeout)
+            reachable = result["status"] == "reachable" and \
+                result["http_status"] < 500
+            stats[name].record(
+                result["response_time_us"] if reachable else None)
+
+        print(f"Watching {len(targets)} endpoints at {rate:g} probe/s "
+              f"({window:g}s rolling window) - Ctrl+C to stop")
+        period = 1.0 / rate
+        started = time.monotonic()
+        next_probe = started
+        next_report = started + report_interval
+        async with self._session() as session:
+            try:
+                while not duration or time.monotonic() - started < duration:
+                    now = time.monotonic()
+                    if now >= next_probe:
+                        for name, (url, timeout) in targets.items():
+                            task = asyncio.create_task(
+                                probe(session, name, url, timeout))
+                            in_flight.add(task)
+                            task.add_done_callback(in_flight.discard)
+                        next_probe += period
+                    if now >= next_report:
+                        self._report_watch(stats, export_path)
+                        next_report += report_interval
+                    await asyncio.sleep(
+                        max(0.0, min(next_probe, next_report)
+                            - time.monotonic()))
+            finally:
+                for task in in_flight:
+                    task.cancel()
+        return self._report_watch(stats, export_path)
+
+    def _report_watch(self, stats: Dict[str, RollingLatency],
+                      export_path: Optional[str]) \
+            -> Dict[str, Dict[str, Any]]:
+        """Print (and optionally export) one rolling summary"""
+        summaries = {name: rolling.summary()
+                     for name, rolling in stats.items()}
+        stamp = datetime.now().strftime("%H:%M:%S")
+        for name, summary in summaries.items():
+            print(f"[{stamp}] {name:<13} p50={summary['p50_ms']:>8.2f}ms "
+                  f"p95={summary['p95_ms']:>8.2f}ms "
+                  f"p99={summary['p99_ms']:>8.2f}ms "
+                  f"max={summary['max_ms']:>8.2f}ms "
+                  f"loss={summary['loss_rate'] * 100:5.1f}% "
+                  f"n={summary['samples']}")
+        self.results["watch"] = summaries
+        if self.history is not None:
+            self.history.append({"watch": summaries}, mode="watch")
+        if export_path:
+            export = Path(export_path)
+            tmp = export.with_suffix(export.suffix + ".tmp")
+            tmp.write_text(json.dumps({
+                "timestamp": datetime.now().isoformat(),
+                "endpoints": summaries
+            }, indent=2), encoding="utf-8")
+            os.replace(tmp, export)
+        return summaries
+
+    async def run_sweep(self, registry: HostRegistry,
+                        include_subnet: bool = False,
+                        concurrency: int = SWEEP_CONCURRENCY,
+                        timeout: float = SWEEP_CONNECT_TIMEOUT,
+                        declared_timeout: Optional[float] = None) \
+            -> Dict[str, Any]:
+        """
+        Sweep the declared topology (and optionally the subnet)
+
+        Args:
+            registry: Loaded hosts.yaml
+            include_subnet: Also probe every subnet address on the
+                discovery ports
+            concurrency: Maximum connects in flight
+            timeout: Per-connect timeout in seconds
+            declared_timeout: Per-connect timeout for services declared
+                in hosts.yaml (default: timeout)
+
+        Returns:
+            Sweep results, also stored under results["sweep"]
+        """
+        targets = registry.sweep_targets(include_subnet)
+        declared = timeout if declared_timeout is None else declared_timeout
+        print(f"Sweeping {len(targets)} endpoints "
+              f"({concurrency} concurrent, {timeout:g}s timeout, "
+              f"{declared:g}s for declared services)...")
+        self.results["sweep"] = await sweep(registry, targets,
+                                            concurrency, timeout,
+                                            declared_timeout)
+        return self.results["sweep"]
+
+    def print_sweep_report(self):
+        """Print sweep results against the declared topology"""
+        result = self.results.get("sweep", {})
+        print("\n[SWEEP REPORT]")
+        print("=" * 60)
+        print(f"Probed {result.get('probed', 0)} endpoints in "
+              f"{result.get('elapsed_s', 0)}s, "
+              f"{result.get('open', 0)} open")
+        print("\nDECLARED SERVICES:")
+        for entry in result.get("up", []):
+            print(f"  [OK] {entry['host']}/{entry['service']}: "
+                  f"{entry['ip']}:{entry['port']} "
+                  f"({entry['connect_ms']}ms)")
+        for entry in result.get("missing", []):
+            print(f"  [FAIL] {entry['host']}/{entry['service']}: "
+                  f"{entry['ip']}:{entry['port']} not reachable")
+        unexpected = result.get("unexpected", [])
+        if unexpected:
+            print(f"\nUNDECLARED ENDPOINTS: {len(unexpected)}")
+            for entry in unexpected:
+                owner = entry["host"] or "unknown host"
+                print(f"  - {entry['ip']}:{entry['port']} ({owner})")
+        print("\nGenerated:", datetime.now().strftime("%Y-%m-%d %H:%M:%S"))
+
     def print_report(self):
         """Print formatted diagnostic report"""
         print("\n[DIAGNOSTIC REPORT]")
@@ -151,6 +766,7 @@ def _print_local_services(self):
                 response_time = status['response_time_ms']
                 print(f"  {status_icon} {service}: {http_status} "
                       f"({response_time}ms)")
+                self._print_phases(status)
             else:
                 status_msg = status['status']
                 error_msg = status.get('error', 'Unknown error')
@@ -165,11 +781,23 @@ def _print_desktop_connectivity(self):
             http_status = desktop['http_status']
             response_time = desktop['response_time_ms']
             print(f"  [OK] Desktop Cell: {http_status} ({response_time}ms)")
+            self._print_phases(desktop)
         else:
             status_val = desktop.get('status', 'unknown')
             error_val = desktop.get('error', 'Connection failed')
             print(f"  [FAIL] Desktop Cell: {status_val} - {error_val}")
 
+    def _print_phases(self, status: Dict[str, Any]):
+        """Print one probe's connection-phase breakdown"""
+        phases = status.get("phases")
+        if not phases:
+            return
+        breakdown = " | ".join(f"{name} {phases[f'{name}_ms']}ms"
+                               for name in PHASE_NAMES)
+        tls_note = ", tls in connect" if "tls_ms" in phases else ""
+        print(f"      {breakdown} ({phases['connection']} "
+              f"connection{tls_note})")
+
     def _print_bridge_status(self):
         """Print bridge status details section"""
         if "bridge_status" in self.results:
@@ -210,12 +838,17 @@ def _print_recommendations(self):
         discovery_service = local_services.get("discovery", {})
         if discovery_service.get("status") != "reachable":
             issues.append("Start the discovery service")
+        elif "peers_error" in self.results:
+            issues.append("Discovery /peers endpoint unreachable or "
+                          f"invalid: {self.results['peers_error']}")
         desktop_connectivity = self.results.get("desktop_connectivity", {})
         desktop_cell = desktop_connectivity.get("desktop_cell", {})
         if desktop_cell.get("status") != "reachable":
+            desktop = urlparse(self.desktop_cell)
             issues.append("Resolve network connectivity to desktop "
-                          "(192.168.1.128)")
-            issues.append("Ensure desktop AIOS cell is running on port 8000")
+                          f"({desktop.hostname})")
+            issues.append("Ensure desktop AIOS cell is running on port "
+                          f"{desktop.port or 80}")
             issues.append("Check firewall settings on desktop PC")
         if issues:
             for issue in issues:
@@ -225,19 +858,131 @@ def _print_recommendations(self):
             print(f"  [SUCCESS] {msg}")
 
 
+def parse_args() -> argparse.Namespace:
+    """Parse command line arguments"""
+    parser = argparse.ArgumentParser(
+        description="AIOS peer synchronization diagnostic")
+    parser.add_argument("--watch", action="store_true",
+                        help="Probe continuously and report rolling "
+                             "latency percentiles and loss")
+    parser.add_argument("--rate", type=float, default=1.0,
+                        help="Watch mode probes per second per endpoint")
+    parser.add_argument("--window", type=float, default=60.0,
+                        help="Watch mode rolling window in seconds")
+    parser.add_argument("--report-interval", type=float, default=5.0,
+                        help="Seconds between watch mode reports")
+    parser.add_argument("--duration", type=float, default=0.0,
+                        help="Seconds to watch (0 = until interrupted)")
+    parser.add_argument("--export",
+                        help="JSON file rewritten with each watch report")
+    parser.add_argument("--sweep", action="store_true",
+                        help="Probe every service declared in hosts.yaml "
+                             "and diff against the declared topology")
+    parser.add_argument("--subnet", action="store_true",
+                        help="With --sweep, also probe every subnet "
+                             "address on the discovery ports")
+    parser.add_argument("--hosts-config",
+                        help="hosts.yaml path (default: config/hosts.yaml), "
+                             "which also sets the desktop cell endpoint")
+    parser.add_argument("--concurrency", type=int,
+                        default=SWEEP_CONCURRENCY,
+                        help="Sweep connects in flight")
+    parser.add_argument("--connect-timeout", type=float,
+                        help="Sweep per-connect timeout in seconds "
+                             f"(default: {SWEEP_CONNECT_TIMEOUT:g} for "
+                             "subnet addresses, discovery."
+                             "connection_timeout from hosts.yaml for "
+                             "declared services)")
+    parser.add_argument("--history", default=str(DEFAULT_HISTORY_PATH),
+                        help="SQLite history store runs are appended to")
+    parser.add_argument("--retention-days", type=float,
+                        default=DEFAULT_RETENTION_DAYS,
+                        help="Days of history kept before rotation")
+    parser.add_argument("--trend", metavar="ENDPOINT",
+                        help="Print the daily p95 of an endpoint from the "
+                             "history (e.g. desktop_cell) and exit")
+    parser.add_argument("--days", type=float, default=7.0,
+                        help="Days covered by --trend")
+    parser.add_argument("--first-failure", metavar="ENDPOINT",
+                        help="Print the first failure after the last "
+                             "success of an endpoint and exit")
+    parser.add_argument("--connections", choices=CONNECTION_MODES,
+                        default="cold",
+                        help="Measure new connections per probe (cold) or "
+                             "reused keep-alive connections (warm)")
+    return parser.parse_args()
+
+
+def print_history_queries(history: DiagnosticHistory,
+                          args: argparse.Namespace):
+    """Print the history queries requested on the command line"""
+    if args.trend:
+        print(f"{args.trend} p95 over the last {args.days:g} days:")
+        for day in history.latency_trend(args.trend, days=args.days):
+            print(f"  {day['day']}: p95={day['p95_ms']}ms "
+                  f"samples={day['samples']} failures={day['failures']}")
+    if args.first_failure:
+        outage = history.first_failure_after_last_success(
+            args.first_failure)
+        if outage is None:
+            print(f"{args.first_failure}: no failure since last success")
+        else:
+            print(f"{args.first_failure}: failing since "
+                  f"{outage['first_failure']} (run {outage['run_id']}), "
+                  f"last success {outage['last_success'] or 'never'}")
+
+
 async def main():
     """Main diagnostic function"""
-    diagnostic = AIOSPeerSyncDiagnostic()
-    await diagnostic.run_diagnostics()
-    diagnostic.print_report()
-    # Save results to file in the health diagnostics directory
-    diagnostics_base = "c:/dev/aios-win/aios-core/tachyonic/reports/health"
-    diagnostics_dir = Path(diagnostics_base)
-    diagnostics_dir.mkdir(parents=True, exist_ok=True)
-    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-    filename = diagnostics_dir / f"aios_sync_diagnostic_{timestamp}.json"
-    with open(filename, 'w', encoding='utf-8') as f:
-        json.dump(diagnostic.results, f, indent=2, default=str)
-    print(f"\n[SAVE] Results saved to: {filename}")
+    args = parse_args()
+    with DiagnosticHistory(args.history, args.retention_days) as history:
+        if args.trend or args.first_failure:
+            print_history_queries(history, args)
+            return
+        await run(args, history)
+
+
+async def run(args: argparse.Namespace, history: DiagnosticHistory):
+    """Run the selected diagnostic mode and record it in the history"""
+    registry = None
+    try:
+        registry = HostRegistry.load(args.hosts_config)
+    except (OSError, ImportError) as e:
+        # The sweep and an explicit config need hosts.yaml; plain
+        # diagnostics fall back to the default desktop cell
+        if args.sweep or args.hosts_config:
+            raise
+        print(f"[WARN] hosts.yaml not loaded ({e}); "
+              f"using {DEFAULT_DESKTOP_CELL}")
+    diagnostic = AIOSPeerSyncDiagnostic(connection_mode=args.connections,
+                                        registry=registry)
+    diagnostic.history = history
+    if args.watch:
+        try:
+            await diagnostic.watch(rate=args.rate, window=args.window,
+                                   report_interval=args.report_interval,
+                                   duration=args.duration,
+                                   export_path=args.export)
+        except asyncio.CancelledError:
+            pass
+        return
+    if args.sweep:
+        timeout = declared_timeout = args.connect_timeout
+        if timeout is None:
+            timeout = SWEEP_CONNECT_TIMEOUT
+            declared_timeout = registry.connection_timeout
+        await diagnostic.run_sweep(registry, include_subnet=args.subnet,
+                                   concurrency=args.concurrency,
+                                   timeout=timeout,
+                                   declared_timeout=declared_timeout)
+        diagnostic.print_sweep_report()
+    else:
+        await diagnostic.run_diagnostics()
+        diagnostic.print_report()
+    run_id = history.append(diagnostic.results,
+                            mode="sweep" if args.sweep else "diagnostic")
+    print(f"\n[SAVE] Run {run_id} appended to: {history.path}")
+
+
 if __name__ == "__main__":
     asyncio.run(main())